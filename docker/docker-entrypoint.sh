@@ -20,6 +20,8 @@ WISHLIST_FILE=${WISHLIST_FILE:-${DOWNLOAD_DIR}/.perlentaucher_wishlist.json}
 WISHLIST_WEB_ENABLED=${WISHLIST_WEB_ENABLED:-0}
 WISHLIST_WEB_PORT=${WISHLIST_WEB_PORT:-8765}
 WISHLIST_WEB_HOST=${WISHLIST_WEB_HOST:-0.0.0.0}
+# 1 = ein langlebiger Prozess (--daemon), 0 = bisherige Schleife mit Neustart je Zyklus
+DAEMON_MODE=${DAEMON_MODE:-1}
 # 127.0.0.1/localhost: Server nur im Container-Loopback — Docker-Portmapping vom Host aus greift dann nicht
 case "${WISHLIST_WEB_HOST}" in
   127.0.0.1|localhost|::1)
@@ -132,6 +134,54 @@ else
     echo ""
 fi
 
+# Gemeinsame Argumente für Daemon und Schleife
+NOTIFY_ARGS=""
+if [ -n "${NOTIFY}" ]; then
+    NOTIFY_ARGS="--notify ${NOTIFY}"
+fi
+
+TMDB_API_KEY_ARGS=""
+if [ -n "${TMDB_API_KEY}" ]; then
+    TMDB_API_KEY_ARGS="--tmdb-api-key ${TMDB_API_KEY}"
+fi
+
+OMDB_API_KEY_ARGS=""
+if [ -n "${OMDB_API_KEY}" ]; then
+    OMDB_API_KEY_ARGS="--omdb-api-key ${OMDB_API_KEY}"
+fi
+
+SERIEN_DOWNLOAD_ARGS="--serien-download ${SERIEN_DOWNLOAD}"
+SERIEN_DIR_ARGS=""
+if [ "${SERIEN_DIR}" != "${DOWNLOAD_DIR}" ]; then
+    SERIEN_DIR_ARGS="--serien-dir ${SERIEN_DIR}"
+fi
+
+# Daemon-Modus (Standard): ein Python-Prozess mit Scheduler für RSS-Lauf, Wishlist und Cache-Auffrischung;
+# das Web-UI läuft darin mit und teilt Caches/Status. exec: SIGTERM von „docker stop“ erreicht Python direkt.
+if [ "${DAEMON_MODE}" = "1" ] || [ "$(echo ${DAEMON_MODE} | tr '[:upper:]' '[:lower:]')" = "true" ]; then
+    WEB_ARGS="--no-wishlist-web"
+    if [ "${WISHLIST_WEB_ENABLED}" = "1" ] || [ "$(echo ${WISHLIST_WEB_ENABLED} | tr '[:upper:]' '[:lower:]')" = "true" ]; then
+        WEB_ARGS="--wishlist-web --wishlist-web-host ${WISHLIST_WEB_HOST} --wishlist-web-port ${WISHLIST_WEB_PORT}"
+    fi
+    echo "$(date '+%Y-%m-%d %H:%M:%S') - Starte Daemon (Intervall: ${INTERVAL_HOURS} Stunden)..."
+    exec python src/perlentaucher.py \
+        --daemon \
+        --interval-hours "${INTERVAL_HOURS}" \
+        ${WEB_ARGS} \
+        --download-dir "${DOWNLOAD_DIR}" \
+        --wishlist-file "${WISHLIST_FILE}" \
+        --limit "${LIMIT}" \
+        --loglevel "${LOGLEVEL}" \
+        --sprache "${SPRACHE}" \
+        --audiodeskription "${AUDIODESKRIPTION}" \
+        --state-file "${STATE_FILE}" \
+        ${NOTIFY_ARGS} \
+        ${TMDB_API_KEY_ARGS} \
+        ${OMDB_API_KEY_ARGS} \
+        ${SERIEN_DOWNLOAD_ARGS} \
+        ${SERIEN_DIR_ARGS}
+fi
+
 # Optional: Wishlist-Web-UI im Hintergrund (einmal beim Start; blockiert nicht die RSS-Schleife)
 if [ "${WISHLIST_WEB_ENABLED}" = "1" ] || [ "$(echo ${WISHLIST_WEB_ENABLED} | tr '[:upper:]' '[:lower:]')" = "true" ]; then
     echo "$(date '+%Y-%m-%d %H:%M:%S') - Starte Wishlist-Web-UI im Hintergrund (${WISHLIST_WEB_HOST}:${WISHLIST_WEB_PORT})..."
@@ -164,28 +214,6 @@ fi
 while true; do
     echo "$(date '+%Y-%m-%d %H:%M:%S') - Starte Download-Zyklus..."
     
-    # Führe das Script aus
-    NOTIFY_ARGS=""
-    if [ -n "${NOTIFY}" ]; then
-        NOTIFY_ARGS="--notify ${NOTIFY}"
-    fi
-    
-    TMDB_API_KEY_ARGS=""
-    if [ -n "${TMDB_API_KEY}" ]; then
-        TMDB_API_KEY_ARGS="--tmdb-api-key ${TMDB_API_KEY}"
-    fi
-    
-    OMDB_API_KEY_ARGS=""
-    if [ -n "${OMDB_API_KEY}" ]; then
-        OMDB_API_KEY_ARGS="--omdb-api-key ${OMDB_API_KEY}"
-    fi
-    
-    SERIEN_DOWNLOAD_ARGS="--serien-download ${SERIEN_DOWNLOAD}"
-    SERIEN_DIR_ARGS=""
-    if [ "${SERIEN_DIR}" != "${DOWNLOAD_DIR}" ]; then
-        SERIEN_DIR_ARGS="--serien-dir ${SERIEN_DIR}"
-    fi
-    
     # --no-wishlist-web: WISHLIST_WEB_ENABLED gilt sonst für jeden Aufruf — die UI läuft bereits im Hintergrund
     python src/perlentaucher.py \
         --no-wishlist-web \
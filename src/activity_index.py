@@ -0,0 +1,278 @@
+"""
+Abfrage-Index für den Aktivitätslog (SQLite, abgeleitet aus der JSONL-Datei und ihren Segmenten).
+
+Die JSONL-Datei bleibt die Quelle; der Index ``<log>.index.sqlite3`` wird vor jeder Abfrage
+inkrementell nachgezogen (neue Segmente, neue Zeilen ab dem letzten Byte-Offset) und kann
+jederzeit gelöscht werden. Sekundärindizes auf Stufe/Art/Quelle/Zeit, Volltext über FTS5
+(Trigramm, damit Teilstrings wie bisher treffen) und Keyset-Paginierung per ``next_cursor``.
+"""
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src import wishlist_activity as activity
+
+INDEX_SUFFIX = ".index.sqlite3"
+BUSY_TIMEOUT_MS = 10000
+# Kürzere Suchbegriffe kann der Trigramm-Index nicht beantworten → Teilstring-Scan
+FTS_MIN_QUERY = 3
+
+_FIELDS = ("ts", "action", "label", "detail", "level", "source")
+
+
+def index_path_for(log_path: str) -> str:
+    return os.path.splitext(log_path)[0] + INDEX_SUFFIX
+
+
+def event_id(entry: Dict[str, Any], raw: bytes) -> str:
+    """Eindeutige ID: vom Schreiber vergeben, bei alten Zeilen aus dem Zeileninhalt abgeleitet."""
+    eid = entry.get("id")
+    if eid:
+        return str(eid)
+    return "h" + hashlib.sha1(raw.strip()).hexdigest()[:24]
+
+
+def encode_cursor(ts: str, seq: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([ts, seq]).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Gegenstück zu ``encode_cursor``; ungültige Cursor lösen ValueError aus."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts, seq = json.loads(raw)
+        return str(ts), int(seq)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Ungültiger Cursor: {cursor!r}") from e
+
+
+def _fold(value: Optional[str]) -> str:
+    return (value or "").casefold()
+
+
+class ActivityIndex:
+    """Index zu einer Aktivitätsdatei; Verbindungen werden pro Operation geöffnet."""
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+        self.path = index_path_for(log_path)
+        self.has_fts = False
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "id INTEGER PRIMARY KEY, eid TEXT NOT NULL UNIQUE, ts TEXT NOT NULL, action TEXT, "
+                "label TEXT, detail TEXT, level TEXT, source TEXT)"
+            )
+            # Reihenfolge: Zeitstempel (Sekunden), bei Gleichstand Einfügereihenfolge (= Dateireihenfolge)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts, id)")
+            for col in ("level", "action", "source"):
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_events_{col} ON events({col}, ts, id)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+                    "label, detail, action, source, content='events', content_rowid='id', tokenize='trigram')"
+                )
+                conn.execute(
+                    "CREATE TRIGGER IF NOT EXISTS events_ai AFTER INSERT ON events BEGIN "
+                    "INSERT INTO events_fts(rowid, label, detail, action, source) "
+                    "VALUES (new.id, new.label, new.detail, new.action, new.source); END"
+                )
+                self.has_fts = True
+            except sqlite3.OperationalError as e:
+                logging.debug(f"Aktivitäts-Index ohne FTS5-Trigramm ({e}) — Textsuche per Scan")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000)
+        try:
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.create_function("pt_fold", 1, _fold, deterministic=True)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # --- Nachziehen aus der JSONL-Datei ---------------------------------------------------
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, lines: List[bytes]) -> int:
+        rows = []
+        for raw in lines:
+            entry = activity._decode(raw) if raw.strip() else None
+            if entry is None:
+                continue
+            rows.append((event_id(entry, raw),) + tuple(str(entry.get(k) or "") for k in _FIELDS))
+        if not rows:
+            return 0
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO events(eid, ts, action, label, detail, level, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return conn.total_changes - before
+
+    def _file_state(self) -> Tuple[List[str], str]:
+        """Segmentnamen und Stat-Kennung (Inode, Größe, mtime) der aktiven Datei — ohne zu lesen."""
+        segments = [os.path.basename(seg) for seg in activity._segments(self.log_path)]
+        try:
+            st = os.stat(self.log_path)
+        except OSError:
+            return segments, ""
+        return segments, f"{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+    def sync(self) -> int:
+        """Übernimmt neue Segmente und neue Zeilen der aktiven Datei; liefert die Anzahl neuer Einträge."""
+        added = 0
+        with self._connect() as conn:
+            # Vorabprüfung ohne Schreibtransaktion: unverändert → keine Sperre, kein Lesen
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            segments, stat = self._file_state()
+            if (
+                "active_stat" in meta
+                and meta["active_stat"] == stat
+                and set(segments) <= set(json.loads(meta.get("segments") or "[]"))
+            ):
+                return 0
+            conn.execute("BEGIN IMMEDIATE")
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            _segs, stat = self._file_state()
+            done = set(json.loads(meta.get("segments") or "[]"))
+            for seg in activity._segments(self.log_path):
+                name = os.path.basename(seg)
+                if name in done:
+                    continue
+                try:
+                    with gzip.open(seg, "rb") as f:
+                        added += self._insert(conn, f.read().split(b"\n"))
+                except (OSError, EOFError) as e:
+                    logging.warning(f"Aktivitäts-Segment nicht lesbar ({seg}): {e}")
+                    continue
+                done.add(name)
+            # Identität der aktiven Datei: Inode plus Hash der ersten Zeile (Inodes werden wiederverwendet)
+            ident, offset = meta.get("active_ident"), int(meta.get("active_offset") or 0)
+            try:
+                f = open(self.log_path, "rb")
+            except OSError:
+                ident, offset = None, 0
+            else:
+                with f:
+                    st = os.fstat(f.fileno())
+                    current = f"{st.st_ino}:{hashlib.sha1(f.readline()).hexdigest()[:16]}"
+                    if current != ident or st.st_size < offset:
+                        # Rotiert oder geleert: Inhalt steckt (dedupliziert per ID) im Segment
+                        offset = 0
+                    f.seek(offset)
+                    chunk = f.read()
+                    end = chunk.rfind(b"\n") + 1
+                    added += self._insert(conn, chunk[:end].split(b"\n"))
+                    ident, offset = current, offset + end
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+                [
+                    ("segments", json.dumps(sorted(done))),
+                    ("active_ident", ident or ""),
+                    ("active_offset", str(offset)),
+                    ("active_stat", stat),
+                ],
+            )
+        if added:
+            logging.debug(f"Aktivitäts-Index: {added} Einträge übernommen ({self.path})")
+        return added
+
+    # --- Abfragen -------------------------------------------------------------------------
+
+    def query(
+        self,
+        *,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        level: Optional[str] = None,
+        action: Optional[str] = None,
+        source: Optional[str] = None,
+        q: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        with_total: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Neueste zuerst. Mit ``cursor`` (aus ``next_cursor``) wird per Keyset weitergeblättert,
+        ohne ``cursor`` gilt ``offset``. ``since``/``until``: ISO-Zeitstempel (inklusive/exklusive).
+        """
+        where: List[str] = []
+        params: List[Any] = []
+        lev = (level or "").strip().lower()
+        if lev:
+            where.append("level = ?")
+            params.append(lev)
+        for col, value in (("action", action), ("source", source)):
+            value = (value or "").strip()
+            if value:
+                where.append(f"{col} = ?")
+                params.append(value)
+        if since:
+            where.append("ts >= ?")
+            params.append(since)
+        if until:
+            where.append("ts < ?")
+            params.append(until)
+        needle = (q or "").strip()
+        if needle:
+            if self.has_fts and len(needle) >= FTS_MIN_QUERY:
+                where.append("id IN (SELECT rowid FROM events_fts WHERE events_fts MATCH ?)")
+                params.append('"' + needle.replace('"', '""') + '"')
+            else:
+                where.append("instr(pt_fold(label || ' ' || detail || ' ' || action || ' ' || source), ?) > 0")
+                params.append(_fold(needle))
+
+        lim = max(1, min(int(limit), 200))
+        page_where, page_params = list(where), list(params)
+        if cursor:
+            ts, seq = decode_cursor(cursor)
+            page_where.append("(ts < ? OR (ts = ? AND id < ?))")
+            page_params += [ts, ts, seq]
+        clause = (" WHERE " + " AND ".join(page_where)) if page_where else ""
+        sql = f"SELECT id, eid, {', '.join(_FIELDS)} FROM events{clause} ORDER BY ts DESC, id DESC LIMIT ?"
+        page_params.append(lim + 1)
+        if not cursor and offset:
+            sql += " OFFSET ?"
+            page_params.append(max(0, int(offset)))
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, page_params).fetchall()
+            total = None
+            if with_total:
+                count_clause = (" WHERE " + " AND ".join(where)) if where else ""
+                total = conn.execute(f"SELECT COUNT(*) FROM events{count_clause}", params).fetchone()[0]
+        entries = [dict(zip(("id",) + _FIELDS, row[1:])) for row in rows[:lim]]
+        next_cursor = None
+        if len(rows) > lim:
+            last = rows[lim - 1]
+            next_cursor = encode_cursor(last[2], last[0])
+        return {"entries": entries, "next_cursor": next_cursor, "total": total}
+
+
+_indexes: Dict[str, ActivityIndex] = {}
+
+
+def get_activity_index(log_path: str) -> ActivityIndex:
+    """Index zu ``log_path`` (pro Pfad wiederverwendet), vor der Rückgabe nachgezogen."""
+    key = os.path.abspath(log_path)
+    index = _indexes.get(key)
+    if index is None or not os.path.exists(index.path):
+        index = ActivityIndex(log_path)
+        _indexes[key] = index
+    index.sync()
+    return index
@@ -0,0 +1,49 @@
+"""
+Atomares Schreiben: Inhalt in eine temporäre Datei im Zielordner, danach ``os.replace`` — Leser
+sehen nie eine halb geschriebene Datei, bei einem Fehler bleibt das Ziel unverändert.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Any, Callable, Optional, TextIO
+
+
+def write_atomic(
+    path: str,
+    write: Callable[[TextIO], None],
+    prefix: str = ".tmp-",
+    fsync: bool = False,
+) -> None:
+    """Ruft ``write(f)`` für eine Temp-Datei auf und ersetzt ``path`` erst danach (``fsync``: vorher auf Platte)."""
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_text_atomic(path: str, text: str, prefix: str = ".tmp-", fsync: bool = False) -> None:
+    write_atomic(path, lambda f: f.write(text), prefix=prefix, fsync=fsync)
+
+
+def write_json_atomic(
+    path: str,
+    data: Any,
+    indent: Optional[int] = 2,
+    prefix: str = ".tmp-",
+    fsync: bool = False,
+) -> None:
+    write_atomic(path, lambda f: json.dump(data, f, ensure_ascii=False, indent=indent), prefix=prefix, fsync=fsync)
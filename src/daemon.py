@@ -0,0 +1,266 @@
+"""
+Daemon-Betrieb (``--daemon``): ein langlebiger Prozess statt Shell-Schleife mit Kaltstart pro Zyklus.
+
+Ein Scheduler führt RSS-Lauf, Wishlist-Verarbeitung und optional die Cache-Auffrischung
+(Verfügbarkeitsprüfung der fälligen Wishlist-Einträge) in eigenen Intervallen aus; jeder Abstand
+erhält einen Zufallsversatz von ±``DAEMON_JITTER``, damit die Läufe nicht im Gleichtakt auf die APIs
+treffen. Die Aufgaben des Schedulers laufen nacheinander im Haupt-Thread; Jobs des Web-UI laufen
+parallel dazu in eigenen Threads, jeder Thread mit eigener HTTP-Session.
+Nach jedem RSS-Lauf wird der Status bei Bedarf kompaktiert (wie beim Start).
+
+Zwischen den Läufen bleiben Importe, HTTP-Verbindungen (``use_shared_http_session``, eine Session pro Thread), die
+Status-Sitzung und die Zwischenspeicher erhalten. Optional läuft das Wishlist-Web-UI im selben
+Prozess (``start_server_thread``) und nutzt dieselben Speicher.
+
+SIGTERM/SIGINT beenden geordnet: der RSS-Lauf stoppt vor dem nächsten Eintrag, die Wishlist an der
+nächsten Prüfstelle; danach werden Status geschrieben und der Webserver gestoppt. Ein zweites Signal
+beendet sofort.
+"""
+from __future__ import annotations
+
+import copy
+import logging
+import random
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from src.env_settings import env_float
+
+DAEMON_INTERVAL_HOURS = 12.0
+DAEMON_JITTER = 0.1
+# Verfügbarkeitsprüfung zwischen den Wishlist-Läufen (Minuten, 0 = aus)
+CACHE_REFRESH_MINUTES = 0.0
+
+
+@dataclass
+class ScheduledTask:
+    """Wiederkehrende Aufgabe; ``interval`` in Sekunden (0 = aus), ``delay`` bis zum ersten Lauf."""
+
+    name: str
+    interval: float
+    run: Callable[[], Any]
+    delay: float = 0.0
+    jitter: float = DAEMON_JITTER
+    next_run: float = 0.0
+    runs: int = 0
+    failures: int = 0
+
+
+class Scheduler:
+    """
+    Führt fällige Aufgaben nacheinander aus und wartet sonst bis zur nächsten (unterbrechbar über
+    ``stop()``). Fehler einer Aufgabe werden geloggt; sie bleibt eingeplant.
+    """
+
+    def __init__(
+        self,
+        tasks: List[ScheduledTask],
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+        stop_event: Optional[threading.Event] = None,
+        after_run: Optional[Callable[[ScheduledTask], None]] = None,
+    ):
+        self.tasks = [t for t in tasks if t.interval > 0]
+        self.after_run = after_run
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._stop = stop_event or threading.Event()
+        now = clock()
+        for t in self.tasks:
+            t.next_run = now + max(0.0, t.delay)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stopping(self) -> bool:
+        """Beenden angefordert (passt als ``cancel_check``)."""
+        return self._stop.is_set()
+
+    def _reschedule(self, task: ScheduledTask, now: float) -> None:
+        spread = task.interval * max(0.0, min(task.jitter, 1.0))
+        task.next_run = now + task.interval + self._rng.uniform(-spread, spread)
+
+    def seconds_until_next(self) -> Optional[float]:
+        if not self.tasks:
+            return None
+        return max(0.0, min(t.next_run for t in self.tasks) - self._clock())
+
+    def run_pending(self) -> Optional[ScheduledTask]:
+        """Führt die am längsten fällige Aufgabe aus; None, wenn keine fällig ist."""
+        if self.stopping() or not self.tasks:
+            return None
+        task = min(self.tasks, key=lambda t: t.next_run)
+        if task.next_run > self._clock():
+            return None
+        started = self._clock()
+        logging.info(f"Daemon: starte {task.name}")
+        try:
+            task.run()
+        except Exception as e:
+            task.failures += 1
+            logging.error(f"Daemon: {task.name} fehlgeschlagen: {e}", exc_info=True)
+        task.runs += 1
+        finished = self._clock()
+        self._reschedule(task, finished)
+        logging.info(
+            f"Daemon: {task.name} beendet nach {finished - started:.0f} s, "
+            f"nächster Lauf in {(task.next_run - finished) / 60:.0f} min"
+        )
+        if self.after_run is not None:
+            self.after_run(task)
+        return task
+
+    def run_forever(self) -> None:
+        while not self.stopping():
+            if self.run_pending() is not None:
+                continue
+            wait = self.seconds_until_next()
+            if wait is None:
+                self._stop.wait()
+            else:
+                self._stop.wait(wait)
+
+
+def install_stop_signals(scheduler: Scheduler) -> None:
+    """SIGTERM/SIGINT: erst geordnet beenden, beim zweiten Signal sofort. Nur im Haupt-Thread."""
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    def _handler(sig, frame):
+        if scheduler.stopping():
+            raise SystemExit(128 + sig)
+        logging.info("Daemon: Beenden angefordert — laufende Aufgabe wird an der nächsten Prüfstelle beendet")
+        scheduler.stop()
+
+    for name in ("SIGTERM", "SIGINT"):
+        signum = getattr(signal, name, None)
+        if signum is None:
+            continue
+        try:
+            signal.signal(signum, _handler)
+        except (ValueError, OSError):
+            pass
+
+
+def build_tasks(
+    args: Any,
+    state_file: Optional[str],
+    cancel_check: Callable[[], bool],
+    run_state_session: Any = None,
+) -> List[ScheduledTask]:
+    """RSS-Lauf, Wishlist-Verarbeitung und Cache-Auffrischung mit den Intervallen aus ``args``/Umgebung."""
+    from src import perlentaucher as core
+    from src.wishlist_core import check_wishlist_availability, wishlist_workers_from_args
+
+    def _args() -> Any:
+        # Eigene Kopie je Lauf: cancel_check/Zähler nicht mit dem Web-UI teilen
+        a = copy.copy(args)
+        a.cancel_check = cancel_check
+        return a
+
+    def feed() -> None:
+        a = _args()
+        core.run_feed_cycle(a, state_file, run_state_session)
+        if run_state_session is not None:
+            run_state_session.checkpoint()
+        if state_file:
+            # Beim Start wird nur einmal kompaktiert; der Daemon läuft aber unbegrenzt
+            core.maybe_compact_run_state(a, state_file)
+
+    def wishlist() -> None:
+        core.run_wishlist_cycle(_args())
+
+    def refresh() -> None:
+        a = _args()
+        available, total = check_wishlist_availability(
+            a.wishlist_path,
+            sprache=a.sprache,
+            audiodeskription=a.audiodeskription,
+            serien_download=a.serien_download,
+            tmdb_api_key=a.tmdb_api_key,
+            omdb_api_key=a.omdb_api_key,
+            qualitaet=a.qualitaet,
+            serien_qualitaet=a.serien_qualitaet,
+            workers=wishlist_workers_from_args(a),
+            cancel_check=cancel_check,
+            use_cache=True,
+        )
+        logging.info(f"Daemon: Verfügbarkeit aufgefrischt — {len(available)} von {total} Einträgen auffindbar")
+
+    feed_hours = args.interval_hours if args.interval_hours is not None else env_float(
+        "INTERVAL_HOURS", DAEMON_INTERVAL_HOURS
+    )
+    wishlist_hours = args.wishlist_interval_hours if args.wishlist_interval_hours is not None else env_float(
+        "WISHLIST_INTERVAL_HOURS", feed_hours
+    )
+    # Standard aus: die Wishlist-Verarbeitung sucht selbst; jede Auffrischung kostet Suchen je Eintrag
+    refresh_minutes = env_float("CACHE_REFRESH_MINUTES", CACHE_REFRESH_MINUTES)
+    jitter = env_float("DAEMON_JITTER", DAEMON_JITTER)
+    refresh_seconds = refresh_minutes * 60
+    return [
+        ScheduledTask("RSS-Lauf", feed_hours * 3600, feed, jitter=jitter),
+        ScheduledTask("Wishlist-Verarbeitung", wishlist_hours * 3600, wishlist, jitter=jitter),
+        # Erst nach einem Intervall: die Verarbeitung beim Start hat gerade gesucht
+        ScheduledTask("Cache-Auffrischung", refresh_seconds, refresh, delay=refresh_seconds, jitter=jitter),
+    ]
+
+
+def run_daemon(
+    args: Any,
+    state_file: Optional[str],
+    run_state_session: Any = None,
+    web: Optional[dict] = None,
+) -> int:
+    """
+    Hauptschleife für ``--daemon``. ``run_state_session`` bleibt über alle Läufe offen (bekannte
+    Einträge werden nicht je Zyklus neu gelesen). ``web`` (host, port, token) startet das
+    Wishlist-Web-UI im selben Prozess. Kehrt nach SIGTERM/SIGINT zurück, wenn alles gesichert ist;
+    liefert den Exit-Code.
+    """
+    from src import perlentaucher as core
+    from src.state_store import flush_all_sessions
+
+    stop = threading.Event()
+    metrics_file = getattr(args, "metrics_file", None)
+
+    def after_run(task: ScheduledTask) -> None:
+        # Textfile nach jedem Lauf aktualisieren, nicht erst beim Beenden
+        if metrics_file:
+            core._write_metrics_file(metrics_file)
+
+    scheduler = Scheduler(
+        build_tasks(args, state_file, stop.is_set, run_state_session), stop_event=stop, after_run=after_run
+    )
+    if not scheduler.tasks and not web:
+        logging.error("Daemon: keine Aufgabe aktiv (alle Intervalle 0) und kein Web-UI")
+        return 1
+    install_stop_signals(scheduler)
+    core.use_shared_http_session(True)
+    stop_web: Optional[Callable[[], None]] = None
+    if web:
+        from src.wishlist_web import start_server_thread
+
+        web_args = copy.copy(args)
+        web_args.activity_source = "web"
+        stop_web = start_server_thread(
+            host=web["host"],
+            port=web["port"],
+            wishlist_path=args.wishlist_path,
+            download_dir=args.download_dir,
+            token=web.get("token"),
+            cli_args=web_args,
+        )
+    for t in scheduler.tasks:
+        logging.info(f"Daemon: {t.name} alle {t.interval / 3600:g} h (±{t.jitter:.0%})")
+    try:
+        scheduler.run_forever()
+    finally:
+        logging.info("Daemon: beende …")
+        if stop_web is not None:
+            stop_web()
+        flush_all_sessions()
+        core.use_shared_http_session(False)
+    return 0
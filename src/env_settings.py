@@ -0,0 +1,30 @@
+"""
+Zahlen aus Umgebungsvariablen: leer → Standard, ungültig → Warnung und Standard, negativ → 0.
+"""
+from __future__ import annotations
+
+import logging
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logging.warning(f"{name} ungültig: '{raw}' — Standard {default} wird verwendet")
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Wie ``env_int``; Dezimalkomma ist erlaubt."""
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw.replace(",", ".")))
+    except ValueError:
+        logging.warning(f"{name} ungültig: '{raw}' — Standard {default} wird verwendet")
+        return default
@@ -27,6 +27,9 @@ class ConfigManager:
         "omdb_api_key": "",
         "serien_download": "erste",
         "serien_dir": "",
+        # Qualitäts-Policy: "" (url_video wie bisher), "hd", "sd", "low" oder "max-size=<GB>"
+        "qualitaet": "",
+        "serien_qualitaet": "",
         "rss_feed_url": "https://nexxtpress.de/author/mediathekperlen/feed/",  # GUI-spezifisch
         "resolve_sender_link_fetch": False,
         "debug_no_download": False,
@@ -37,6 +40,10 @@ class ConfigManager:
         "gui_window_height": 800,
         # Leer = ffmpeg über PATH bzw. FFMPEG_PATH (HLS/.m3u8)
         "ffmpeg_path": "",
+        # 0 = beste HLS-Variante; sonst maximale Bildhöhe (z. B. 1080)
+        "hls_max_height": 0,
+        # Wishlist „Verarbeiten“: parallele Suchen (1 = nacheinander); Downloads bleiben seriell
+        "wishlist_workers": 1,
         # Hinweis: "limit" wurde entfernt - es werden automatisch die letzten 30 Tage geladen
     }
     
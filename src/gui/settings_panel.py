@@ -105,6 +105,26 @@ class SettingsPanel(QWidget):
         self.ffmpeg_path_edit.setPlaceholderText("Leer = ffmpeg aus PATH oder Umgebungsvariable FFMPEG_PATH (HLS/.m3u8)")
         self.ffmpeg_path_edit.setMinimumHeight(MIN_FIELD_HEIGHT)
         download_layout.addRow("Pfad zu ffmpeg (optional):", self.ffmpeg_path_edit)
+
+        self.hls_max_height_spin = QSpinBox()
+        self.hls_max_height_spin.setRange(0, 4320)
+        self.hls_max_height_spin.setSingleStep(360)
+        self.hls_max_height_spin.setSuffix(" px")
+        self.hls_max_height_spin.setSpecialValueText("Beste Variante")
+        self.hls_max_height_spin.setToolTip(
+            "HLS (.m3u8): höchstens diese Bildhöhe laden (z. B. 1080 statt UHD). 0 = beste Variante."
+        )
+        self.hls_max_height_spin.setMinimumHeight(MIN_FIELD_HEIGHT)
+        download_layout.addRow("HLS max. Bildhöhe:", self.hls_max_height_spin)
+
+        self.wishlist_workers_spin = QSpinBox()
+        self.wishlist_workers_spin.setRange(1, 16)
+        self.wishlist_workers_spin.setToolTip(
+            "Wishlist „Verarbeiten“: so viele Einträge werden gleichzeitig gesucht. "
+            "Downloads laufen weiterhin nacheinander."
+        )
+        self.wishlist_workers_spin.setMinimumHeight(MIN_FIELD_HEIGHT)
+        download_layout.addRow("Wishlist parallele Suchen:", self.wishlist_workers_spin)
         
         download_group.setLayout(download_layout)
         layout.addWidget(download_group)
@@ -129,6 +149,24 @@ class SettingsPanel(QWidget):
         self.serien_download_combo.addItems(["erste", "staffel", "keine"])
         self.serien_download_combo.setMinimumHeight(MIN_FIELD_HEIGHT)
         preferences_layout.addRow("Serien-Download:", self.serien_download_combo)
+
+        quality_tooltip = (
+            "hd, sd, low oder max-size=<GB> (z. B. max-size=2). "
+            "Leer = Standard-URL der Mediathek wie bisher."
+        )
+        self.qualitaet_combo = QComboBox()
+        self.qualitaet_combo.setEditable(True)
+        self.qualitaet_combo.addItems(["", "hd", "sd", "low", "max-size=2"])
+        self.qualitaet_combo.setToolTip(quality_tooltip)
+        self.qualitaet_combo.setMinimumHeight(MIN_FIELD_HEIGHT)
+        preferences_layout.addRow("Qualität (Filme):", self.qualitaet_combo)
+
+        self.serien_qualitaet_combo = QComboBox()
+        self.serien_qualitaet_combo.setEditable(True)
+        self.serien_qualitaet_combo.addItems(["", "hd", "sd", "low", "max-size=1"])
+        self.serien_qualitaet_combo.setToolTip(quality_tooltip + " Leer bei Serien = wie Filme.")
+        self.serien_qualitaet_combo.setMinimumHeight(MIN_FIELD_HEIGHT)
+        preferences_layout.addRow("Qualität (Serien):", self.serien_qualitaet_combo)
         
         self.serien_dir_edit = QLineEdit()
         self.serien_dir_edit.setReadOnly(True)
@@ -325,6 +363,8 @@ class SettingsPanel(QWidget):
         index = self.serien_download_combo.findText(serien_download)
         if index >= 0:
             self.serien_download_combo.setCurrentIndex(index)
+        self.qualitaet_combo.setCurrentText(config.get('qualitaet', '') or '')
+        self.serien_qualitaet_combo.setCurrentText(config.get('serien_qualitaet', '') or '')
         
         # serien_dir: Wenn leer oder gleich download_dir, zeige leer (wird beim Speichern auf download_dir gesetzt)
         serien_dir = config.get('serien_dir', '')
@@ -343,6 +383,8 @@ class SettingsPanel(QWidget):
         
         self.rss_feed_edit.setText(config.get('rss_feed_url', 'https://nexxtpress.de/author/mediathekperlen/feed/'))
         self.ffmpeg_path_edit.setText(config.get("ffmpeg_path", ""))
+        self.hls_max_height_spin.setValue(int(config.get("hls_max_height") or 0))
+        self.wishlist_workers_spin.setValue(int(config.get("wishlist_workers") or 1))
         
         # no_state Option
         no_state = config.get('no_state', False)
@@ -366,6 +408,8 @@ class SettingsPanel(QWidget):
             'sprache': self.sprache_combo.currentText(),
             'audiodeskription': self.audiodeskription_combo.currentText(),
             'serien_download': self.serien_download_combo.currentText(),
+            'qualitaet': self.qualitaet_combo.currentText().strip().lower(),
+            'serien_qualitaet': self.serien_qualitaet_combo.currentText().strip().lower(),
             'serien_dir': serien_dir,
             'tmdb_api_key': self.tmdb_api_key_edit.text(),
             'omdb_api_key': self.omdb_api_key_edit.text(),
@@ -373,12 +417,24 @@ class SettingsPanel(QWidget):
             'loglevel': self.loglevel_combo.currentText(),
             'rss_feed_url': self.rss_feed_edit.text(),
             'ffmpeg_path': self.ffmpeg_path_edit.text().strip(),
+            'hls_max_height': self.hls_max_height_spin.value(),
+            'wishlist_workers': self.wishlist_workers_spin.value(),
         }
         
         # Validierung
         if not config['download_dir']:
             QMessageBox.warning(self, "Fehler", "Download-Verzeichnis muss angegeben werden!")
             return
+        try:
+            from src import perlentaucher as core
+        except ImportError:
+            import perlentaucher as core
+        for key in ('qualitaet', 'serien_qualitaet'):
+            try:
+                core.parse_quality_policy(config[key])
+            except ValueError as e:
+                QMessageBox.warning(self, "Fehler", str(e))
+                return
         
         # Akzeptiere sowohl relative als auch absolute Pfade (wie Quickstart-Scripts)
         # Relative Pfade werden relativ zum Projekt-Root interpretiert
@@ -420,6 +476,8 @@ class SettingsPanel(QWidget):
             'sprache': self.sprache_combo.currentText(),
             'audiodeskription': self.audiodeskription_combo.currentText(),
             'serien_download': self.serien_download_combo.currentText(),
+            'qualitaet': self.qualitaet_combo.currentText().strip().lower(),
+            'serien_qualitaet': self.serien_qualitaet_combo.currentText().strip().lower(),
             'serien_dir': serien_dir,
             'tmdb_api_key': self.tmdb_api_key_edit.text(),
             'omdb_api_key': self.omdb_api_key_edit.text(),
@@ -427,4 +485,6 @@ class SettingsPanel(QWidget):
             'loglevel': self.loglevel_combo.currentText(),
             'rss_feed_url': self.rss_feed_edit.text(),
             'ffmpeg_path': self.ffmpeg_path_edit.text().strip(),
+            'hls_max_height': self.hls_max_height_spin.value(),
+            'wishlist_workers': self.wishlist_workers_spin.value(),
         }
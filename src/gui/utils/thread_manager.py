@@ -49,6 +49,19 @@ class DownloadThread(QThread):
         """
         return (None, None)
 
+    def _quality_policy(self, is_series: bool) -> Optional[str]:
+        """Qualitäts-Policy aus der Config; Serien fallen auf die Film-Einstellung zurück."""
+        film = (self.config.get("qualitaet") or "").strip() or None
+        if is_series:
+            return (self.config.get("serien_qualitaet") or "").strip() or film
+        return film
+
+    def _state_file(self) -> Optional[str]:
+        """Pfad der Status-Datei oder None, wenn no_state aktiv ist."""
+        if self.config.get('no_state', False):
+            return None
+        return self.config.get('state_file', '.perlentaucher_state.json') or None
+
     def cancel(self):
         """Bricht den Download ab."""
         self.is_cancelled = True
@@ -100,6 +113,7 @@ class DownloadThread(QThread):
                         metadata=metadata,
                         debug=self.debug_no_download,
                         sender_reference_url=sender_mediathek_url,
+                        quality=self._quality_policy(is_series=True),
                     )
                     
                     if result and not self.is_cancelled:
@@ -150,6 +164,7 @@ class DownloadThread(QThread):
                     metadata=metadata,
                     debug=self.debug_no_download,
                     sender_reference_url=sender_mediathek_url,
+                    quality=self._quality_policy(is_series=False),
                 )
                 
                 if result and not self.is_cancelled:
@@ -192,6 +207,7 @@ class DownloadThread(QThread):
         blog_link = (self.entry_data.get("entry_link") or "").strip() or None
         cfg_ff = (self.config.get("ffmpeg_path") or "").strip()
         ffmpeg_path_kw = cfg_ff if cfg_ff else None
+        hls_max_height = int(self.config.get("hls_max_height") or 0) or None
 
         def progress_cb(pct: int, msg: str) -> None:
             if not self.is_cancelled:
@@ -214,6 +230,7 @@ class DownloadThread(QThread):
                 notify_source=None,
                 entry_link=blog_link,
                 ffmpeg_path=ffmpeg_path_kw,
+                hls_max_height=hls_max_height,
                 progress_callback=progress_cb,
                 cancel_check=cancel_cb,
             )
@@ -275,6 +292,7 @@ class DownloadThread(QThread):
                 metadata=metadata,
                 debug=self.debug_no_download,
                 sender_reference_url=sender_mediathek_url,
+                quality=self._quality_policy(is_series=True),
             )
             
             if not episodes:
@@ -326,43 +344,45 @@ class DownloadThread(QThread):
             downloaded_count = 0
             failed_count = 0
             
-            # Lade Episoden sequenziell
-            for idx, (season, episode_num, episode_data) in enumerate(episodes_with_info, 1):
-                if self.is_cancelled:
-                    self.download_finished.emit(False, series_title, "", "Download abgebrochen")
-                    return
+            # Episoden-Status gebündelt schreiben (Write-Behind, Flush spätestens beim Verlassen)
+            with core.state_session(self._state_file()):
+                # Lade Episoden sequenziell
+                for idx, (season, episode_num, episode_data) in enumerate(episodes_with_info, 1):
+                    if self.is_cancelled:
+                        self.download_finished.emit(False, series_title, "", "Download abgebrochen")
+                        return
                 
-                # Update Progress: Zeige aktuellen Fortschritt (Episode X von Y)
-                episode_title = episode_data.get('title', f'S{season or 0:02d}E{episode_num or 0:02d}')
-                progress_percent = int((idx - 1) / total_episodes * 100)
-                self.progress_updated.emit(
-                    progress_percent,
-                    f"Episode {idx}/{total_episodes}: {episode_title}"
-                )
+                    # Update Progress: Zeige aktuellen Fortschritt (Episode X von Y)
+                    episode_title = episode_data.get('title', f'S{season or 0:02d}E{episode_num or 0:02d}')
+                    progress_percent = int((idx - 1) / total_episodes * 100)
+                    self.progress_updated.emit(
+                        progress_percent,
+                        f"Episode {idx}/{total_episodes}: {episode_title}"
+                    )
                 
-                # Download Episode
-                success, title, filepath = self._download_with_progress(
-                    episode_data,
-                    series_title,
-                    metadata,
-                    is_series=True,
-                    series_base_dir=series_base_dir,
-                    season=season,
-                    episode=episode_num
-                )
+                    # Download Episode
+                    success, title, filepath = self._download_with_progress(
+                        episode_data,
+                        series_title,
+                        metadata,
+                        is_series=True,
+                        series_base_dir=series_base_dir,
+                        season=season,
+                        episode=episode_num
+                    )
                 
-                if success:
-                    downloaded_count += 1
-                    logging.info(f"Episode S{season:02d}E{episode_num:02d} erfolgreich heruntergeladen: {filepath}")
+                    if success:
+                        downloaded_count += 1
+                        logging.info(f"Episode S{season:02d}E{episode_num:02d} erfolgreich heruntergeladen: {filepath}")
                     
-                    # State-Datei für diese Episode aktualisieren
-                    self._update_episode_state(series_title, season, episode_num, 'download_success', filepath)
-                else:
-                    failed_count += 1
-                    logging.error(f"Episode S{season:02d}E{episode_num:02d} fehlgeschlagen: {title}")
+                        # State-Datei für diese Episode aktualisieren
+                        self._update_episode_state(series_title, season, episode_num, 'download_success', filepath)
+                    else:
+                        failed_count += 1
+                        logging.error(f"Episode S{season:02d}E{episode_num:02d} fehlgeschlagen: {title}")
                     
-                    # State-Datei für diese Episode aktualisieren
-                    self._update_episode_state(series_title, season, episode_num, 'download_failed', None)
+                        # State-Datei für diese Episode aktualisieren
+                        self._update_episode_state(series_title, season, episode_num, 'download_failed', None)
             
             # Finale Progress-Update
             final_progress = 100 if total_episodes > 0 else 0
@@ -81,6 +81,9 @@ class WishlistCheckThread(QThread):
             serien_download=self.config.get("serien_download", "erste"),
             tmdb_api_key=self.config.get("tmdb_api_key") or None,
             omdb_api_key=self.config.get("omdb_api_key") or None,
+            qualitaet=(self.config.get("qualitaet") or "").strip() or None,
+            serien_qualitaet=(self.config.get("serien_qualitaet") or "").strip() or None,
+            force_all=True,
         )
         self.items_ready.emit([x.to_dict() for x in avail])
 
@@ -106,6 +109,8 @@ class WishlistProbeAfterAddThread(QThread):
                 serien_download=self._config.get("serien_download", "erste"),
                 tmdb_api_key=self._config.get("tmdb_api_key") or None,
                 omdb_api_key=self._config.get("omdb_api_key") or None,
+                qualitaet=(self._config.get("qualitaet") or "").strip() or None,
+                serien_qualitaet=(self._config.get("serien_qualitaet") or "").strip() or None,
             )
         except Exception as ex:
             logging.warning("Wishlist-Probe nach Hinzufügen fehlgeschlagen: %s", ex, exc_info=True)
@@ -485,6 +490,10 @@ class WishlistPanel(QWidget):
         a.serien_dir = cfg.get("serien_dir") or None
         a.no_state = cfg.get("no_state", False)
         a.state_file = cfg.get("state_file", ".perlentaucher_state.json")
+        a.hls_max_height = int(cfg.get("hls_max_height") or 0) or None
+        a.qualitaet = (cfg.get("qualitaet") or "").strip() or None
+        a.serien_qualitaet = (cfg.get("serien_qualitaet") or "").strip() or None
+        a.wishlist_workers = max(1, int(cfg.get("wishlist_workers") or 1))
         a.activity_source = "gui"
         return a
 
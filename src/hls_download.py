@@ -0,0 +1,597 @@
+"""
+Eingebaute HLS-Engine: Master-/Media-Playlists parsen und Segmente parallel in einen
+lokalen Spool laden. ffmpeg wird danach nur noch für den Remux (``-c copy``) der lokalen
+Playlist benötigt — kein sequenzielles Nachladen über das Netz mehr.
+
+AES-128: Schlüssel werden einmalig geladen und im Spool abgelegt; die lokale Playlist
+verweist darauf, ffmpeg entschlüsselt beim Remux (crypto-Protokoll). Dadurch ist keine
+zusätzliche Krypto-Bibliothek nötig.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HLS_SEGMENT_WORKERS = 4
+HLS_SEGMENT_RETRIES = 3
+# Wie oft ``cancel_check`` während einer Wartepause zwischen Wiederholungen abgefragt wird
+HLS_CANCEL_POLL_SECONDS = 0.2
+HLS_USER_AGENT = "Mozilla/5.0 (compatible; Perlentaucher/1.0; +https://codeberg.org/elpatron/Perlentaucher)"
+
+SPOOL_SUFFIX = ".hls-spool"
+LOCAL_PLAYLIST_NAME = "local.m3u8"
+_SPOOL_MANIFEST_NAME = "source.json"
+
+_ATTR_RE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+class HlsUnsupportedError(Exception):
+    """Playlist kann von der eingebauten Engine nicht verarbeitet werden (Fallback: ffmpeg direkt)."""
+
+
+@dataclass
+class HlsKey:
+    method: str
+    uri: Optional[str] = None
+    iv: Optional[str] = None
+
+
+@dataclass
+class HlsSegment:
+    uri: str
+    duration: float
+    sequence: int
+    key: Optional[HlsKey] = None
+
+
+@dataclass
+class HlsVariant:
+    uri: str
+    bandwidth: int = 0
+    resolution: Optional[Tuple[int, int]] = None
+    codecs: str = ""
+    audio_group: Optional[str] = None
+
+
+@dataclass
+class HlsMediaPlaylist:
+    url: str
+    segments: List[HlsSegment] = field(default_factory=list)
+    target_duration: int = 0
+    media_sequence: int = 0
+    endlist: bool = False
+    init_uri: Optional[str] = None
+    has_byterange: bool = False
+
+    @property
+    def total_duration(self) -> float:
+        return sum(s.duration for s in self.segments)
+
+
+@dataclass
+class HlsMasterPlaylist:
+    url: str
+    variants: List[HlsVariant] = field(default_factory=list)
+    # GROUP-ID -> True wenn mindestens eine Rendition eine eigene URI hat (separate Audio-Playlist)
+    audio_groups_with_uri: Dict[str, bool] = field(default_factory=dict)
+
+
+def parse_attribute_list(text: str) -> Dict[str, str]:
+    """Zerlegt eine HLS-Attributliste (``KEY=VALUE,KEY="VALUE"``) in ein Dict."""
+    out: Dict[str, str] = {}
+    for m in _ATTR_RE.finditer(text or ""):
+        val = m.group(2)
+        if len(val) >= 2 and val[0] == '"' and val[-1] == '"':
+            val = val[1:-1]
+        out[m.group(1)] = val
+    return out
+
+
+def is_master_playlist(text: str) -> bool:
+    return "#EXT-X-STREAM-INF" in (text or "")
+
+
+def parse_master_playlist(text: str, base_url: str) -> HlsMasterPlaylist:
+    """Parst eine Master-Playlist (Varianten mit BANDWIDTH/RESOLUTION)."""
+    master = HlsMasterPlaylist(url=base_url)
+    pending: Optional[Dict[str, str]] = None
+    for raw in (text or "").splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("#EXT-X-STREAM-INF:"):
+            pending = parse_attribute_list(line.split(":", 1)[1])
+            continue
+        if line.startswith("#EXT-X-MEDIA:"):
+            attrs = parse_attribute_list(line.split(":", 1)[1])
+            if attrs.get("TYPE") == "AUDIO" and attrs.get("GROUP-ID"):
+                gid = attrs["GROUP-ID"]
+                master.audio_groups_with_uri[gid] = master.audio_groups_with_uri.get(gid, False) or bool(
+                    attrs.get("URI")
+                )
+            continue
+        if line.startswith("#"):
+            continue
+        if pending is not None:
+            resolution = None
+            res = pending.get("RESOLUTION", "")
+            if "x" in res:
+                try:
+                    w, h = res.lower().split("x", 1)
+                    resolution = (int(w), int(h))
+                except ValueError:
+                    resolution = None
+            try:
+                bandwidth = int(pending.get("BANDWIDTH") or 0)
+            except ValueError:
+                bandwidth = 0
+            master.variants.append(
+                HlsVariant(
+                    uri=urljoin(base_url, line),
+                    bandwidth=bandwidth,
+                    resolution=resolution,
+                    codecs=pending.get("CODECS", ""),
+                    audio_group=pending.get("AUDIO"),
+                )
+            )
+            pending = None
+    return master
+
+
+def parse_media_playlist(text: str, base_url: str) -> HlsMediaPlaylist:
+    """Parst eine Media-Playlist (Segmente, Schlüssel, Init-Segment)."""
+    pl = HlsMediaPlaylist(url=base_url)
+    current_key: Optional[HlsKey] = None
+    pending_duration: Optional[float] = None
+    seq: Optional[int] = None
+    for raw in (text or "").splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("#EXT-X-TARGETDURATION:"):
+            try:
+                pl.target_duration = int(float(line.split(":", 1)[1]))
+            except ValueError:
+                pass
+        elif line.startswith("#EXT-X-MEDIA-SEQUENCE:"):
+            try:
+                pl.media_sequence = int(line.split(":", 1)[1])
+            except ValueError:
+                pass
+        elif line.startswith("#EXT-X-KEY:"):
+            attrs = parse_attribute_list(line.split(":", 1)[1])
+            method = (attrs.get("METHOD") or "NONE").upper()
+            if method == "NONE":
+                current_key = None
+            else:
+                uri = attrs.get("URI")
+                current_key = HlsKey(
+                    method=method,
+                    uri=urljoin(base_url, uri) if uri else None,
+                    iv=attrs.get("IV"),
+                )
+        elif line.startswith("#EXT-X-MAP:"):
+            attrs = parse_attribute_list(line.split(":", 1)[1])
+            if attrs.get("URI"):
+                pl.init_uri = urljoin(base_url, attrs["URI"])
+        elif line.startswith("#EXT-X-BYTERANGE"):
+            pl.has_byterange = True
+        elif line.startswith("#EXTINF:"):
+            dur = line.split(":", 1)[1].split(",", 1)[0]
+            try:
+                pending_duration = float(dur)
+            except ValueError:
+                pending_duration = 0.0
+        elif line.startswith("#EXT-X-ENDLIST"):
+            pl.endlist = True
+        elif line.startswith("#"):
+            continue
+        else:
+            if seq is None:
+                seq = pl.media_sequence
+            pl.segments.append(
+                HlsSegment(
+                    uri=urljoin(base_url, line),
+                    duration=pending_duration or 0.0,
+                    sequence=seq,
+                    key=current_key,
+                )
+            )
+            seq += 1
+            pending_duration = None
+    return pl
+
+
+def _variant_height(v: HlsVariant) -> int:
+    return (v.resolution or (0, 0))[1]
+
+
+def select_variant(master: HlsMasterPlaylist, max_height: Optional[int] = None) -> HlsVariant:
+    """
+    Wählt die Variante mit der höchsten Bandbreite (entspricht der bisherigen ffmpeg-Auswahl).
+
+    Mit ``max_height`` (z. B. 1080) kommen nur Varianten bis zu dieser Bildhöhe in Frage;
+    Varianten ohne ``RESOLUTION`` gelten als passend. Liegt keine Variante darunter, wird die
+    kleinste genommen.
+    """
+    if not master.variants:
+        raise HlsUnsupportedError("Master-Playlist ohne Varianten")
+    candidates = master.variants
+    if max_height and max_height > 0:
+        fitting = [v for v in candidates if v.resolution is None or v.resolution[1] <= max_height]
+        if not fitting:
+            fitting = [min(candidates, key=lambda v: (_variant_height(v), v.bandwidth))]
+        candidates = fitting
+    return max(candidates, key=lambda v: (v.bandwidth, _variant_height(v)))
+
+
+def _new_session(workers: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(2, workers))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = HLS_USER_AGENT
+    return session
+
+
+def _fetch_text(session: requests.Session, url: str) -> str:
+    resp = session.get(url, timeout=(10, 30))
+    resp.raise_for_status()
+    return resp.text
+
+
+def resolve_media_playlist(
+    url: str,
+    session: Optional[requests.Session] = None,
+    max_height: Optional[int] = None,
+) -> HlsMediaPlaylist:
+    """
+    Lädt ``url``; bei Master-Playlist wird eine Variante gewählt (siehe ``select_variant``)
+    und nur deren Media-Playlist geladen.
+
+    Raises:
+        HlsUnsupportedError: Live-Playlist, separate Audio-Renditions, Byte-Ranges oder SAMPLE-AES.
+    """
+    session = session or _new_session(1)
+    text = _fetch_text(session, url)
+    if "#EXTM3U" not in text:
+        raise HlsUnsupportedError("keine gültige M3U8-Playlist")
+    if is_master_playlist(text):
+        master = parse_master_playlist(text, url)
+        variant = select_variant(master, max_height)
+        if variant.audio_group and master.audio_groups_with_uri.get(variant.audio_group):
+            raise HlsUnsupportedError("separate Audio-Rendition in der Master-Playlist")
+        logging.debug(
+            f"HLS: Variante gewählt ({variant.bandwidth} bit/s"
+            + (f", {variant.resolution[0]}x{variant.resolution[1]}" if variant.resolution else "")
+            + f"): {variant.uri}"
+        )
+        text = _fetch_text(session, variant.uri)
+        if is_master_playlist(text):
+            raise HlsUnsupportedError("verschachtelte Master-Playlist")
+        media = parse_media_playlist(text, variant.uri)
+    else:
+        media = parse_media_playlist(text, url)
+
+    if not media.segments:
+        raise HlsUnsupportedError("Media-Playlist ohne Segmente")
+    if not media.endlist:
+        raise HlsUnsupportedError("Live-Playlist ohne #EXT-X-ENDLIST")
+    if media.has_byterange:
+        raise HlsUnsupportedError("Byte-Range-Segmente")
+    for seg in media.segments:
+        if seg.key is not None and (seg.key.method != "AES-128" or not seg.key.uri):
+            raise HlsUnsupportedError(f"Verschlüsselung {seg.key.method} nicht unterstützt")
+    return media
+
+
+def master_program_index(url: str, max_height: Optional[int] = None) -> Optional[int]:
+    """
+    Index der mit ``max_height`` gewählten Variante (siehe ``select_variant``) in der
+    Master-Playlist; ffmpeg legt je Variante ein Programm mit dieser ID an (``-map 0:p:<n>``).
+    None, wenn ``url`` keine Master-Playlist ist.
+
+    Raises:
+        requests.RequestException, HlsUnsupportedError: Playlist nicht ladbar bzw. ohne Varianten.
+    """
+    session = _new_session(1)
+    try:
+        text = _fetch_text(session, url)
+    finally:
+        session.close()
+    if not is_master_playlist(text):
+        return None
+    master = parse_master_playlist(text, url)
+    return master.variants.index(select_variant(master, max_height))
+
+
+def playlist_duration(url: str, max_height: Optional[int] = None) -> Optional[float]:
+    """
+    Gesamtdauer (Sekunden) einer VOD-Playlist für die Fortschrittsanzeige, auch wenn die
+    eingebaute Engine sie nicht laden kann; None bei Live-Playlists oder Fehlern.
+    """
+    session = _new_session(1)
+    try:
+        text = _fetch_text(session, url)
+        media_url = url
+        if is_master_playlist(text):
+            media_url = select_variant(parse_master_playlist(text, url), max_height).uri
+            text = _fetch_text(session, media_url)
+        media = parse_media_playlist(text, media_url)
+        return media.total_duration if media.endlist and media.total_duration > 0 else None
+    except (requests.RequestException, HlsUnsupportedError, ValueError) as e:
+        logging.debug(f"HLS: Dauer nicht ermittelbar ({e})")
+        return None
+    finally:
+        session.close()
+
+
+def spool_dir_for(output_path: str) -> str:
+    """Spool-Verzeichnis neben der Zieldatei (bleibt bei Abbruch für die Wiederaufnahme erhalten)."""
+    return os.path.abspath(output_path) + SPOOL_SUFFIX
+
+
+def _segment_filename(index: int, uri: str) -> str:
+    ext = os.path.splitext(urlparse(uri).path)[1].lower()
+    if not ext or len(ext) > 5:
+        ext = ".ts"
+    return f"seg_{index:05d}{ext}"
+
+
+def _init_filename(uri: str) -> str:
+    return "init_" + _segment_filename(0, uri)[len("seg_"):]
+
+
+def _interrupted(stop: threading.Event, cancel_check: Optional[Callable[[], bool]]) -> bool:
+    """Abbruch angefordert? Ein positiver ``cancel_check`` setzt ``stop`` auch für die übrigen Worker."""
+    if not stop.is_set() and cancel_check is not None and cancel_check():
+        stop.set()
+    return stop.is_set()
+
+
+def _download_to_file(
+    session: requests.Session,
+    url: str,
+    dest: str,
+    retries: int,
+    stop: threading.Event,
+    cancel_check: Optional[Callable[[], bool]] = None,
+) -> int:
+    """
+    Lädt ``url`` atomar nach ``dest`` (``.part`` + rename). Liefert die Bytezahl.
+
+    ``stop``/``cancel_check`` werden vor jedem Versuch, pro Datenblock und während der Wartepause
+    zwischen Wiederholungen geprüft — ein Abbruch wartet nicht auf das Ende des Segments.
+    """
+    last_exc: Optional[Exception] = None
+    for attempt in range(retries + 1):
+        if _interrupted(stop, cancel_check):
+            raise InterruptedError("Download abgebrochen")
+        tmp = dest + ".part"
+        try:
+            with session.get(url, stream=True, timeout=(10, 60)) as r:
+                r.raise_for_status()
+                size = 0
+                with open(tmp, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=64 * 1024):
+                        if _interrupted(stop, cancel_check):
+                            raise InterruptedError("Download abgebrochen")
+                        if chunk:
+                            f.write(chunk)
+                            size += len(chunk)
+            os.replace(tmp, dest)
+            return size
+        except InterruptedError:
+            raise
+        except (requests.RequestException, OSError) as e:
+            last_exc = e
+            logging.debug(f"HLS: Segment-Fehler (Versuch {attempt + 1}/{retries + 1}) {url}: {e}")
+            if attempt < retries:
+                deadline = time.monotonic() + min(8.0, 0.5 * (2 ** attempt))
+                while not _interrupted(stop, cancel_check):
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        break
+                    stop.wait(min(left, HLS_CANCEL_POLL_SECONDS))
+        finally:
+            if os.path.exists(tmp):
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+    raise RuntimeError(f"HLS-Segment konnte nicht geladen werden: {url} ({last_exc})")
+
+
+def _prepare_spool(spool_dir: str, media: HlsMediaPlaylist) -> None:
+    """Legt den Spool an; verwirft ihn, wenn er zu einer anderen Playlist gehört."""
+    manifest = {
+        "playlist": media.url,
+        "segments": len(media.segments),
+        "first": media.segments[0].uri if media.segments else "",
+    }
+    manifest_path = os.path.join(spool_dir, _SPOOL_MANIFEST_NAME)
+    if os.path.isdir(spool_dir):
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+        except (OSError, ValueError):
+            existing = None
+        if existing != manifest:
+            logging.info("HLS: vorhandener Spool passt nicht zur Playlist — wird verworfen")
+            shutil.rmtree(spool_dir, ignore_errors=True)
+    os.makedirs(spool_dir, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def _iv_for(seg: HlsSegment) -> str:
+    if seg.key and seg.key.iv:
+        return seg.key.iv
+    # Ohne IV-Attribut gilt laut RFC 8216 die Media-Sequence-Nummer als IV
+    return "0x" + format(seg.sequence, "032x")
+
+
+def write_local_playlist(spool_dir: str, media: HlsMediaPlaylist, key_files: Dict[str, str]) -> str:
+    """Schreibt die Playlist mit lokalen Segment- und Schlüssel-Pfaden für den ffmpeg-Remux."""
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{max(1, media.target_duration)}",
+        f"#EXT-X-MEDIA-SEQUENCE:{media.segments[0].sequence if media.segments else 0}",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+    ]
+    if media.init_uri:
+        lines.append(f'#EXT-X-MAP:URI="{_init_filename(media.init_uri)}"')
+    last_key: Optional[Tuple[str, str]] = None
+    for idx, seg in enumerate(media.segments):
+        if seg.key is not None:
+            this_key = (key_files[seg.key.uri], _iv_for(seg))
+            if this_key != last_key:
+                lines.append(f'#EXT-X-KEY:METHOD=AES-128,URI="{this_key[0]}",IV={this_key[1]}')
+                last_key = this_key
+        elif last_key is not None:
+            lines.append("#EXT-X-KEY:METHOD=NONE")
+            last_key = None
+        lines.append(f"#EXTINF:{seg.duration:.3f},")
+        lines.append(_segment_filename(idx, seg.uri))
+    lines.append("#EXT-X-ENDLIST")
+    path = os.path.join(spool_dir, LOCAL_PLAYLIST_NAME)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+def _fmt_mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.1f} MB"
+
+
+def fetch_hls_to_spool(
+    url: str,
+    spool_dir: str,
+    *,
+    workers: int = HLS_SEGMENT_WORKERS,
+    retries: int = HLS_SEGMENT_RETRIES,
+    progress_callback: Optional[Callable[[int, str], None]] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    progress_range: Tuple[int, int] = (5, 90),
+    max_height: Optional[int] = None,
+    bytes_callback: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[str, HlsMediaPlaylist]:
+    """
+    Lädt alle Segmente (und ggf. Init-Segment/Schlüssel) parallel nach ``spool_dir``.
+
+    Bereits vollständig vorhandene Segmente werden übersprungen (Wiederaufnahme nach Abbruch).
+    Fortschritt wird pro Segment innerhalb von ``progress_range`` gemeldet, ``bytes_callback``
+    erhält ``(bytes_geladen, 0)`` (Gesamtgröße vorab unbekannt). ``max_height`` begrenzt die
+    Variantenauswahl einer Master-Playlist.
+
+    Returns:
+        (Pfad der lokalen Playlist, geparste Media-Playlist)
+
+    Raises:
+        HlsUnsupportedError: Playlist nicht für die eingebaute Engine geeignet.
+        InterruptedError: ``cancel_check`` hat abgebrochen.
+        RuntimeError: Segment nach allen Wiederholungen nicht ladbar.
+    """
+    workers = max(1, int(workers))
+    session = _new_session(workers)
+    try:
+        media = resolve_media_playlist(url, session, max_height=max_height)
+        _prepare_spool(spool_dir, media)
+
+        stop = threading.Event()
+        key_files: Dict[str, str] = {}
+        for seg in media.segments:
+            if seg.key is not None and seg.key.uri not in key_files:
+                name = f"key_{len(key_files):03d}.key"
+                _download_to_file(session, seg.key.uri, os.path.join(spool_dir, name), retries, stop, cancel_check)
+                key_files[seg.key.uri] = name
+        if media.init_uri:
+            init_path = os.path.join(spool_dir, _init_filename(media.init_uri))
+            if not os.path.exists(init_path):
+                _download_to_file(session, media.init_uri, init_path, retries, stop, cancel_check)
+
+        total = len(media.segments)
+        todo: List[Tuple[int, HlsSegment]] = []
+        done = 0
+        bytes_done = 0
+        for idx, seg in enumerate(media.segments):
+            dest = os.path.join(spool_dir, _segment_filename(idx, seg.uri))
+            if os.path.exists(dest):
+                done += 1
+                bytes_done += os.path.getsize(dest)
+            else:
+                todo.append((idx, seg))
+        if done:
+            logging.info(f"HLS: {done}/{total} Segmente bereits im Spool — setze Download fort")
+
+        lo, hi = progress_range
+        started = time.monotonic()
+        fetched_bytes = 0
+
+        def report() -> None:
+            if bytes_callback:
+                bytes_callback(bytes_done, 0)
+            if not progress_callback:
+                return
+            pct = lo + int((hi - lo) * done / total) if total else hi
+            elapsed = max(1e-6, time.monotonic() - started)
+            rate = fetched_bytes / elapsed
+            progress_callback(
+                pct,
+                f"HLS: Segment {done}/{total} · {_fmt_mb(bytes_done)} · {rate / (1024 * 1024):.1f} MB/s",
+            )
+
+        report()
+        if todo:
+            logging.info(f"HLS: lade {len(todo)} Segmente mit {workers} parallelen Verbindungen")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hls-seg") as pool:
+                futures = {
+                    pool.submit(
+                        _download_to_file,
+                        session,
+                        seg.uri,
+                        os.path.join(spool_dir, _segment_filename(idx, seg.uri)),
+                        retries,
+                        stop,
+                        cancel_check,
+                    ): idx
+                    for idx, seg in todo
+                }
+                try:
+                    for fut in as_completed(futures):
+                        if cancel_check and cancel_check():
+                            raise InterruptedError("Download abgebrochen")
+                        size = fut.result()
+                        done += 1
+                        bytes_done += size
+                        fetched_bytes += size
+                        report()
+                except BaseException:
+                    stop.set()
+                    for f in futures:
+                        f.cancel()
+                    raise
+        if cancel_check and cancel_check():
+            raise InterruptedError("Download abgebrochen")
+
+        playlist_path = write_local_playlist(spool_dir, media, key_files)
+        return playlist_path, media
+    finally:
+        session.close()
+
+
+def remove_spool(spool_dir: str) -> None:
+    shutil.rmtree(spool_dir, ignore_errors=True)
@@ -0,0 +1,42 @@
+"""
+Verzögerte Importe für schwere Abhängigkeiten.
+
+Kurze CLI-Befehle (``--wishlist-list``, ``--wishlist-add`` …) brauchen weder ``requests`` noch
+``urllib3``; ``LazyModule`` importiert das Modul erst beim ersten Attributzugriff.
+"""
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule:
+    """
+    Platzhalter für ein Modul, das beim ersten Zugriff geladen wird. Setzen und Löschen von
+    Attributen (z. B. ``mock.patch.object``) wirken auf das echte Modul.
+    """
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self) -> ModuleType:
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)
+            object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "geladen" if self._module is not None else "nicht geladen"
+        return f"<LazyModule {self._name!r} ({state})>"
@@ -0,0 +1,340 @@
+"""
+Prozessweite Metriken (Zähler und Histogramme) im Prometheus-Textformat.
+
+Die Kernlogik meldet Latenzen und Ergebnisse an ``REGISTRY``; die Wishlist-Web-UI liefert sie unter
+``/metrics`` aus, CLI-Läufe schreiben sie mit ``--metrics-file`` (bzw. ``METRICS_FILE``) am Ende in
+eine Textdatei für den node-exporter (Textfile-Collector). Ohne externe Abhängigkeit; alle
+Operationen sind threadsicher und so billig, dass sie immer aktiv sind.
+"""
+from __future__ import annotations
+
+import functools
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from src import profiling
+from src.atomic_file import write_text_atomic
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LONG_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0, 7200.0)
+# Bytes/s: 128 KiB/s … 128 MiB/s
+THROUGHPUT_BUCKETS = tuple(float(128 * 1024 * 4 ** i) for i in range(6))
+COUNT_BUCKETS = (1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: Labels {sorted(labels)} statt {list(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra is not None:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_values(items))
+        return lines
+
+    @abstractmethod
+    def _render_values(self, items: List[Tuple[Tuple[str, ...], Any]]) -> List[str]:
+        ...
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _render_values(self, items: List[Tuple[Tuple[str, ...], Any]]) -> List[str]:
+        return [f"{self.name}{self._labels(k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            hit = self._values.get(self._key(labels))
+            return sum(hit[0]) if hit else 0
+
+    def _render_values(self, items: List[Tuple[Tuple[str, ...], Any]]) -> List[str]:
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{self._labels(key, ('le', _fmt(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Sammlung benannter Metriken; ``counter``/``histogram`` liefern bestehende gleichen Namens."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls: type, name: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metrik {name} existiert bereits als {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Prometheus-Textformat (Version 0.0.4)."""
+        with self._lock:
+            metrics = [self._metrics[n] for n in sorted(self._metrics)]
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Schreibt atomar (Temp-Datei + ``os.replace``), damit der Collector nie halbe Dateien liest."""
+        write_text_atomic(path, self.render(), prefix=".metrics-")
+
+    def clear(self) -> None:
+        """Setzt alle Werte zurück (Metriken bleiben registriert)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_DURATION = REGISTRY.histogram(
+    "perlentaucher_http_request_duration_seconds",
+    "Dauer externer HTTP-Anfragen (MediathekViewWeb, TMDB, OMDb)",
+    ("service", "host"),
+)
+HTTP_ERRORS = REGISTRY.counter(
+    "perlentaucher_http_request_errors_total",
+    "Fehlgeschlagene externe HTTP-Anfragen",
+    ("service", "host", "error"),
+)
+SEARCHES = REGISTRY.counter(
+    "perlentaucher_searches_total",
+    "Mediathek-Suchen nach Ergebnis",
+    ("kind", "outcome"),
+)
+SEARCH_VARIANTS = REGISTRY.histogram(
+    "perlentaucher_search_variants",
+    "Abgefragte Suchvarianten pro Mediathek-Suche",
+    ("kind",),
+    buckets=COUNT_BUCKETS,
+)
+DOWNLOADS = REGISTRY.counter(
+    "perlentaucher_downloads_total",
+    "Downloads nach Verfahren und Ergebnis",
+    ("method", "outcome"),
+)
+DOWNLOAD_BYTES = REGISTRY.counter(
+    "perlentaucher_download_bytes_total",
+    "Heruntergeladene Bytes (erfolgreiche Downloads)",
+    ("method",),
+)
+DOWNLOAD_DURATION = REGISTRY.histogram(
+    "perlentaucher_download_duration_seconds",
+    "Dauer von Downloads",
+    ("method", "outcome"),
+    buckets=LONG_BUCKETS,
+)
+DOWNLOAD_THROUGHPUT = REGISTRY.histogram(
+    "perlentaucher_download_throughput_bytes_per_second",
+    "Durchsatz erfolgreicher Downloads",
+    ("method",),
+    buckets=THROUGHPUT_BUCKETS,
+)
+FFMPEG_DURATION = REGISTRY.histogram(
+    "perlentaucher_ffmpeg_duration_seconds",
+    "Laufzeit von ffmpeg (remux = lokaler Spool, direct = Netz-URL)",
+    ("mode", "outcome"),
+    buckets=LONG_BUCKETS,
+)
+STORE_WRITE_DURATION = REGISTRY.histogram(
+    "perlentaucher_store_write_duration_seconds",
+    "Schreiblatenz der Speicher (state, activity, wishlist)",
+    ("store",),
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "perlentaucher_cache_requests_total",
+    "Zugriffe auf prozessinterne Caches nach Treffer/Fehlschlag",
+    ("cache", "result"),
+)
+
+
+def _host(url: str) -> str:
+    try:
+        return urlparse(url).hostname or "unknown"
+    except ValueError:
+        return "unknown"
+
+
+@contextmanager
+def track_request(service: str, url: str) -> Iterator[None]:
+    """Misst die Dauer des Blocks; Ausnahmen zählen als Fehler (Typname) und werden weitergereicht."""
+    host = _host(url)
+    started = time.perf_counter()
+    try:
+        with profiling.stage(f"http.{service}", host=host):
+            yield
+    except Exception as e:
+        HTTP_ERRORS.inc(service=service, host=host, error=type(e).__name__)
+        counts = getattr(_thread_errors, "counts", None)
+        if counts is None:
+            counts = _thread_errors.counts = {}
+        counts[service] = counts.get(service, 0) + 1
+        raise
+    finally:
+        HTTP_DURATION.observe(time.perf_counter() - started, service=service, host=host)
+
+
+_thread_errors = threading.local()
+
+
+def thread_request_errors(service: str) -> int:
+    """
+    Fehlgeschlagene Anfragen an ``service`` im aktuellen Thread (fortlaufend). Aufrufer vergleichen
+    den Wert vor und nach einer Suche, um „nicht gefunden“ von „nicht erreichbar“ zu unterscheiden.
+    """
+    return getattr(_thread_errors, "counts", {}).get(service, 0)
+
+
+_search_ctx = threading.local()
+
+
+def search_variant_tried() -> None:
+    """Innerhalb einer mit ``instrument_search`` dekorierten Suche: eine weitere Suchvariante."""
+    if getattr(_search_ctx, "variants", None) is not None:
+        _search_ctx.variants += 1
+
+
+def instrument_search(kind: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Dekorator: zählt Suchen nach Ergebnis (found/not_found/error) und die probierten Varianten."""
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            outer = getattr(_search_ctx, "variants", None)
+            _search_ctx.variants = 0
+            outcome = "error"
+            title = args[0] if args and isinstance(args[0], str) else None
+            try:
+                with profiling.stage(f"search.{kind}", title=title):
+                    result = fn(*args, **kwargs)
+                outcome = "found" if result else "not_found"
+                return result
+            finally:
+                SEARCHES.inc(kind=kind, outcome=outcome)
+                SEARCH_VARIANTS.observe(_search_ctx.variants, kind=kind)
+                _search_ctx.variants = outer
+
+        return wrapper
+
+    return decorate
+
+
+def record_download(method: str, outcome: str, seconds: float, size: int = 0) -> None:
+    DOWNLOADS.inc(method=method, outcome=outcome)
+    DOWNLOAD_DURATION.observe(seconds, method=method, outcome=outcome)
+    if outcome == "success" and size > 0:
+        DOWNLOAD_BYTES.inc(size, method=method)
+        if seconds > 0:
+            DOWNLOAD_THROUGHPUT.observe(size / seconds, method=method)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
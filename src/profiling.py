@@ -0,0 +1,229 @@
+"""
+Laufzeitprofil eines Laufs nach Pipeline-Stufen (``--profile`` bzw. ``PERLENTAUCHER_PROFILE``).
+
+Die Kernlogik umschließt ihre Stufen mit ``stage(name, **details)``: RSS-Abruf, Sender-Link-Auflösung,
+Metadaten, jede HTTP-Anfrage (``http.<dienst>``), Suchen, Bewertung, Download, ffmpeg,
+Status-/Wishlist-Schreibzugriffe und Benachrichtigungen. Ohne aktives Profil kostet ``stage`` nur
+einen Funktionsaufruf. Am Ende liefert ``Profiler.summary()`` Summen je Stufe und die langsamsten
+Einzelschritte; ``format_table`` macht daraus eine Tabelle fürs Log, ``write_trace`` eine Datei im
+Chrome-Trace-Event-Format (``chrome://tracing``, Perfetto). Stufen dürfen sich verschachteln
+(z. B. ``http.tmdb`` in ``metadata``); die Zeiten sind jeweils inklusive.
+"""
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+
+from src.atomic_file import write_json_atomic
+
+# Einzelschritte für Trace und „langsamste“-Liste; Summen je Stufe zählen darüber hinaus weiter
+PROFILE_MAX_SPANS = 200_000
+PROFILE_SLOWEST = 15
+
+_NULL = nullcontext()
+
+
+class _Span:
+    __slots__ = ("_profiler", "name", "details", "start")
+
+    def __init__(self, profiler: "Profiler", name: str, details: Dict[str, Any]):
+        self._profiler = profiler
+        self.name = name
+        self.details = details
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.details["error"] = exc_type.__name__
+        self._profiler._record(self.name, self.start, end - self.start, self.details)
+
+
+class Profiler:
+    """Sammelt Zeitspannen je Stufe (threadsicher)."""
+
+    def __init__(self, max_spans: int = PROFILE_MAX_SPANS):
+        self.max_spans = max_spans
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._spans: List[tuple] = []
+        self._totals: Dict[str, List[float]] = {}  # Name → [Anzahl, Summe, Maximum]
+        self.dropped = 0
+
+    def span(self, name: str, details: Optional[Dict[str, Any]] = None) -> _Span:
+        return _Span(self, name, details or {})
+
+    def _record(self, name: str, start: float, duration: float, details: Dict[str, Any]) -> None:
+        tid = threading.get_ident()
+        with self._lock:
+            total = self._totals.get(name)
+            if total is None:
+                self._totals[name] = [1, duration, duration]
+            else:
+                total[0] += 1
+                total[1] += duration
+                if duration > total[2]:
+                    total[2] = duration
+            if len(self._spans) < self.max_spans:
+                self._spans.append((name, start, duration, tid, details))
+            else:
+                self.dropped += 1
+
+    def summary(self, slowest: int = PROFILE_SLOWEST) -> Dict[str, Any]:
+        """Summen je Stufe (absteigend nach Gesamtzeit) und die langsamsten Einzelschritte."""
+        wall = time.perf_counter() - self.started
+        with self._lock:
+            totals = {k: list(v) for k, v in self._totals.items()}
+            spans = list(self._spans)
+        stages = [
+            {
+                "stage": name,
+                "count": int(count),
+                "total_seconds": round(total, 6),
+                "mean_ms": round(total / count * 1000, 3),
+                "max_ms": round(peak * 1000, 3),
+                "share": round(total / wall, 4) if wall > 0 else 0.0,
+            }
+            for name, (count, total, peak) in sorted(totals.items(), key=lambda kv: -kv[1][1])
+        ]
+        top = sorted(spans, key=lambda s: -s[2])[:slowest]
+        return {
+            "wall_seconds": round(wall, 6),
+            "stages": stages,
+            "slowest": [
+                {
+                    "stage": name,
+                    "seconds": round(duration, 6),
+                    "offset_seconds": round(start - self.started, 6),
+                    **{k: _jsonable(v) for k, v in details.items()},
+                }
+                for name, start, duration, _tid, details in top
+            ],
+            "dropped_spans": self.dropped,
+        }
+
+    def trace_events(self) -> List[Dict[str, Any]]:
+        """Einzelschritte als Chrome-Trace-Events (``ph: X``, Zeiten in Mikrosekunden)."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+        return [
+            {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": round((start - self.started) * 1e6, 1),
+                "dur": round(duration * 1e6, 1),
+                "pid": pid,
+                "tid": tid,
+                "args": {k: _jsonable(v) for k, v in details.items()},
+            }
+            for name, start, duration, tid, details in spans
+        ]
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def format_table(summary: Dict[str, Any]) -> str:
+    """Menschenlesbare Tabelle zu ``Profiler.summary()``."""
+    lines = [
+        f"Laufzeitprofil: {summary['wall_seconds']:.1f} s gesamt (Stufen inklusive verschachtelter Schritte)",
+        f"{'Stufe':<22} {'Anzahl':>7} {'Summe s':>10} {'Mittel ms':>10} {'Max ms':>10} {'Anteil':>7}",
+    ]
+    for row in summary["stages"]:
+        lines.append(
+            f"{row['stage']:<22} {row['count']:>7} {row['total_seconds']:>10.2f} "
+            f"{row['mean_ms']:>10.1f} {row['max_ms']:>10.1f} {row['share']:>7.1%}"
+        )
+    if summary["slowest"]:
+        lines.append("Langsamste Einzelschritte:")
+        for row in summary["slowest"]:
+            extra = ", ".join(
+                f"{k}={v}" for k, v in row.items() if k not in ("stage", "seconds", "offset_seconds")
+            )
+            lines.append(
+                f"  {row['seconds']:>9.2f} s  {row['stage']:<18} bei +{row['offset_seconds']:.1f} s"
+                + (f"  ({extra})" if extra else "")
+            )
+    return "\n".join(lines)
+
+
+def write_summary(profiler: Profiler, path: str) -> Dict[str, Any]:
+    summary = profiler.summary()
+    write_json_atomic(path, summary, indent=1, prefix=".profile-")
+    return summary
+
+
+def write_trace(profiler: Profiler, path: str) -> int:
+    """Schreibt die Trace-Datei; liefert die Anzahl Events."""
+    events = profiler.trace_events()
+    write_json_atomic(path, {"traceEvents": events, "displayTimeUnit": "ms"}, indent=1, prefix=".profile-")
+    return len(events)
+
+
+_profiler: Optional[Profiler] = None
+
+
+def enable(max_spans: int = PROFILE_MAX_SPANS) -> Profiler:
+    """Aktiviert das prozessweite Profil (idempotent)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(max_spans=max_spans)
+    return _profiler
+
+
+def disable() -> Optional[Profiler]:
+    """Beendet die Aufzeichnung; liefert das bisherige Profil."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def active() -> Optional[Profiler]:
+    return _profiler
+
+
+def stage(name: str, **details: Any) -> ContextManager[Any]:
+    """Misst den Block als Stufe ``name``; ohne aktives Profil ein No-op."""
+    profiler = _profiler
+    if profiler is None:
+        return _NULL
+    return profiler.span(name, details)
+
+
+def profiled(
+    name: str, details: Optional[Callable[..., Dict[str, Any]]] = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Dekorator-Variante von ``stage`` für ganze Funktionen. ``details`` erhält dieselben Argumente
+    wie die Funktion und liefert die Angaben zum Schritt (z. B. den Titel).
+    """
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _profiler
+            if profiler is None:
+                return fn(*args, **kwargs)
+            try:
+                info = details(*args, **kwargs) if details is not None else {}
+            except Exception:
+                info = {}
+            with profiler.span(name, info):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
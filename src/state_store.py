@@ -0,0 +1,724 @@
+"""
+Speicher für den Verarbeitungsstatus (RSS-Einträge, Episoden, Wishlist): austauschbare Backends.
+
+- ``JsonStateBackend``: bisherige ``.perlentaucher_state.json`` (Standard).
+- ``SqliteStateBackend``: SQLite-Datenbank, indiziert nach Eintrags-ID, transaktional und für
+  gleichzeitige Nutzung durch CLI, GUI und Web geeignet (WAL, Busy-Timeout).
+
+Das Backend ergibt sich aus der Dateiendung (``.db``/``.sqlite``/``.sqlite3`` → SQLite). Beim
+ersten Öffnen einer SQLite-Datei wird eine gleichnamige ``.json`` einmalig übernommen.
+
+``StateSession`` puffert Schreibvorgänge eines Laufs (Write-behind) und schreibt gebündelt:
+periodisch, bei Checkpoints, beim Schließen sowie bei Prozessende/SIGTERM.
+
+``compact_state`` hält den Stand klein: Episoden-Einträge (``<id>_S01E05``) werden in den
+Serien-Eintrag gefaltet, Einträge außerhalb des Aufbewahrungszeitraums in ein komprimiertes
+Archiv (``<state>.archive.jsonl.gz``) verschoben.
+"""
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import re
+import signal
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from src import metrics, profiling
+from src.atomic_file import write_json_atomic
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+STATE_BACKENDS = ("json", "sqlite")
+
+# Write-behind: spätestens nach so vielen Sekunden bzw. offenen Einträgen wird geschrieben
+FLUSH_INTERVAL_SECONDS = 5.0
+FLUSH_MAX_PENDING = 200
+
+# Kompaktierung: Aufbewahrung in Tagen und automatische Schwelle (Anzahl Einträge, 0 = aus)
+STATE_RETENTION_DAYS = 365
+STATE_COMPACT_THRESHOLD = 5000
+ARCHIVE_SUFFIX = ".archive.jsonl.gz"
+EPISODE_ID_RE = re.compile(r"^(?P<parent>.+)_(?P<code>S\d{2,}E\d{2,})$")
+
+_backends: Dict[str, "StateBackend"] = {}
+_backends_lock = threading.Lock()
+_sessions: Dict[str, "StateSession"] = {}
+_sessions_lock = threading.Lock()
+
+
+class StateBackend(ABC):
+    """Schnittstelle eines State-Backends; Einträge sind Dicts mit mindestens ``status``/``timestamp``."""
+
+    name = "abstract"
+
+    def __init__(self, path: str):
+        self.path = path
+        # Schreiber im Prozess (Sitzungen, direkte Aufrufe, Kompaktierung) nacheinander
+        self._write_lock = threading.RLock()
+
+    @abstractmethod
+    def entry_ids(self) -> Set[str]:
+        ...
+
+    @abstractmethod
+    def load(self) -> Dict[str, Any]:
+        """Gesamter Stand im JSON-Format: ``{'entries': {...}, 'last_updated': ...}``."""
+
+    @abstractmethod
+    def put_entries(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Schreibt/ersetzt mehrere Einträge in einem Schritt."""
+
+    def put_entry(self, entry_id: str, entry_data: Dict[str, Any]) -> None:
+        self.put_entries({entry_id: entry_data})
+
+    @abstractmethod
+    def replace_entries(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Ersetzt den kompletten Stand."""
+
+    @abstractmethod
+    def rewrite_entries(
+        self, transform: Callable[[Dict[str, Dict[str, Any]]], Optional[Dict[str, Dict[str, Any]]]]
+    ) -> bool:
+        """
+        Liest alle Einträge und ersetzt sie durch ``transform(entries)`` — ohne dass ein anderer
+        Schreiber dazwischen kommt (Kompaktierung). ``transform`` liefert None, wenn sich nichts
+        ändert; Rückgabe: ob neu geschrieben wurde.
+        """
+
+    def size_bytes(self) -> int:
+        """Belegter Speicher auf der Platte (inkl. Nebendateien des Backends)."""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def export_json(self, target_path: str) -> int:
+        """Exportiert den Stand im JSON-Format der State-Datei; liefert die Anzahl der Einträge."""
+        data = self.load()
+        entries = data.get("entries", {})
+        out = {
+            "entries": entries,
+            "last_updated": data.get("last_updated") or datetime.now().isoformat(),
+            "processed_entries": list(entries.keys()),
+        }
+        with open(target_path, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=2, ensure_ascii=False)
+        return len(entries)
+
+
+class JsonStateBackend(StateBackend):
+    """Bisheriges Format: eine JSON-Datei, bei jedem Schreiben komplett neu geschrieben."""
+
+    name = "json"
+
+    def entry_ids(self) -> Set[str]:
+        if not os.path.exists(self.path):
+            return set()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Neue Struktur mit 'entries' Dictionary
+            if "entries" in data:
+                return set(data["entries"].keys())
+            # Alte Struktur mit 'processed_entries' Liste (Rückwärtskompatibilität)
+            return set(data.get("processed_entries", []))
+        except Exception as e:
+            logging.warning(f"Fehler beim Laden der Status-Datei: {e}")
+            return set()
+
+    def load(self) -> Dict[str, Any]:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # Konvertiere alte Struktur zu neuer
+                if "entries" not in data and "processed_entries" in data:
+                    entries = {}
+                    for entry_id in data.get("processed_entries", []):
+                        entries[entry_id] = {
+                            "status": "unknown",
+                            "timestamp": data.get("last_updated", datetime.now().isoformat()),
+                        }
+                    data["entries"] = entries
+                return data
+            except Exception as e:
+                logging.warning(f"Fehler beim Laden der Status-Datei: {e}")
+        return {"entries": {}, "last_updated": datetime.now().isoformat()}
+
+    def put_entries(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        with self._write_lock:
+            data = self.load()
+            if "entries" not in data:
+                data["entries"] = {}
+            current = data["entries"]
+            for entry_id, entry in entries.items():
+                current[entry_id] = _keep_episode_status(entry, current.get(entry_id))
+            data["last_updated"] = datetime.now().isoformat()
+            # Für Rückwärtskompatibilität: processed_entries Liste beibehalten
+            data["processed_entries"] = list(current.keys())
+            try:
+                write_json_atomic(self.path, data, prefix=".state-", fsync=True)
+            except Exception as e:
+                logging.error(f"Fehler beim Speichern der Status-Datei: {e}")
+
+    def replace_entries(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        with self._write_lock:
+            write_json_atomic(
+                self.path,
+                {
+                    "entries": entries,
+                    "last_updated": datetime.now().isoformat(),
+                    "processed_entries": list(entries.keys()),
+                },
+                prefix=".state-",
+                fsync=True,
+            )
+
+    def rewrite_entries(
+        self, transform: Callable[[Dict[str, Dict[str, Any]]], Optional[Dict[str, Dict[str, Any]]]]
+    ) -> bool:
+        with self._write_lock:
+            new = transform(self.load().get("entries", {}))
+            if new is None:
+                return False
+            self.replace_entries(new)
+            return True
+
+
+def _keep_episode_status(entry: Dict[str, Any], existing: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Erneutes Speichern eines Serien-Eintrags behält die bei der Kompaktierung eingefalteten Episoden."""
+    if existing and "episode_status" in existing and "episode_status" not in entry:
+        return {**entry, "episode_status": existing["episode_status"]}
+    return entry
+
+
+class SqliteStateBackend(StateBackend):
+    """
+    SQLite-Backend: eine Zeile pro Eintrag (Primärschlüssel = Eintrags-ID), Schreiben per Transaktion.
+
+    Verbindungen werden pro Operation geöffnet; WAL und ``busy_timeout`` erlauben parallele
+    Leser und serialisieren Schreiber prozessübergreifend (CLI, GUI, Web).
+    """
+
+    name = "sqlite"
+    BUSY_TIMEOUT_MS = 10000
+
+    def __init__(self, path: str, migrate_from: Optional[str] = None):
+        super().__init__(path)
+        parent = os.path.dirname(os.path.abspath(path))
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        is_new = not os.path.exists(path)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "entry_id TEXT PRIMARY KEY, status TEXT NOT NULL, timestamp TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries(timestamp)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        if is_new and migrate_from and os.path.exists(migrate_from):
+            self.import_json(migrate_from)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT_MS / 1000)
+        try:
+            conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def import_json(self, json_path: str) -> int:
+        """Übernimmt eine JSON-State-Datei (auch altes Format mit ``processed_entries``)."""
+        data = JsonStateBackend(json_path).load()
+        entries = data.get("entries", {})
+        self.put_entries(entries, last_updated=data.get("last_updated"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('migrated_from', ?)",
+                (os.path.abspath(json_path),),
+            )
+        logging.info(f"State: {len(entries)} Einträge aus {json_path} nach {self.path} übernommen")
+        return len(entries)
+
+    def entry_ids(self) -> Set[str]:
+        try:
+            with self._connect() as conn:
+                return {row[0] for row in conn.execute("SELECT entry_id FROM entries")}
+        except sqlite3.Error as e:
+            logging.warning(f"Fehler beim Laden der Status-Datenbank: {e}")
+            return set()
+
+    def load(self) -> Dict[str, Any]:
+        entries: Dict[str, Dict[str, Any]] = {}
+        last_updated = None
+        try:
+            with self._connect() as conn:
+                for entry_id, raw in conn.execute("SELECT entry_id, data FROM entries ORDER BY rowid"):
+                    try:
+                        entries[entry_id] = json.loads(raw)
+                    except ValueError:
+                        entries[entry_id] = {"status": "unknown"}
+                row = conn.execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+                last_updated = row[0] if row else None
+        except sqlite3.Error as e:
+            logging.warning(f"Fehler beim Laden der Status-Datenbank: {e}")
+        return {"entries": entries, "last_updated": last_updated or datetime.now().isoformat()}
+
+    def get_entry(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM entries WHERE entry_id = ?", (entry_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, entries: Dict[str, Dict[str, Any]], last_updated: Optional[str]) -> None:
+        rows = [
+            (
+                entry_id,
+                str(entry.get("status") or "unknown"),
+                str(entry.get("timestamp") or datetime.now().isoformat()),
+                json.dumps(entry, ensure_ascii=False),
+            )
+            for entry_id, entry in entries.items()
+        ]
+        # episode_status eines vorhandenen Eintrags bleibt erhalten (wie ``_keep_episode_status``)
+        conn.executemany(
+            "INSERT INTO entries(entry_id, status, timestamp, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(entry_id) DO UPDATE SET "
+            "status = excluded.status, timestamp = excluded.timestamp, data = CASE "
+            "WHEN json_type(entries.data, '$.episode_status') IS NOT NULL "
+            "AND json_type(excluded.data, '$.episode_status') IS NULL "
+            "THEN json_set(excluded.data, '$.episode_status', json_extract(entries.data, '$.episode_status')) "
+            "ELSE excluded.data END",
+            rows,
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO meta(key, value) VALUES ('last_updated', ?)",
+            (last_updated or datetime.now().isoformat(),),
+        )
+
+    def put_entries(self, entries: Dict[str, Dict[str, Any]], last_updated: Optional[str] = None) -> None:
+        if not entries:
+            return
+        try:
+            with self._write_lock, self._connect() as conn:
+                self._upsert(conn, entries, last_updated)
+        except sqlite3.Error as e:
+            logging.error(f"Fehler beim Speichern der Status-Datenbank: {e}")
+
+    def replace_entries(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        # Löschen und Neuschreiben in einer Transaktion
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+            self._upsert(conn, entries, None)
+        self._vacuum()
+
+    def rewrite_entries(
+        self, transform: Callable[[Dict[str, Dict[str, Any]]], Optional[Dict[str, Dict[str, Any]]]]
+    ) -> bool:
+        # Lesen und Neuschreiben in einer Schreibtransaktion: andere Prozesse warten (busy_timeout)
+        with self._write_lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            entries: Dict[str, Dict[str, Any]] = {}
+            for entry_id, raw in conn.execute("SELECT entry_id, data FROM entries ORDER BY rowid"):
+                try:
+                    entries[entry_id] = json.loads(raw)
+                except ValueError:
+                    entries[entry_id] = {"status": "unknown"}
+            new = transform(entries)
+            if new is None:
+                return False
+            conn.execute("DELETE FROM entries")
+            self._upsert(conn, new, None)
+        self._vacuum()
+        return True
+
+    def _vacuum(self) -> None:
+        # Freigegebene Seiten zurückgeben, sonst schrumpft die Datei nicht
+        conn = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT_MS / 1000)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+
+    def size_bytes(self) -> int:
+        total = 0
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                total += os.path.getsize(self.path + suffix)
+            except OSError:
+                pass
+        return total
+
+
+def backend_name_for_path(state_file: str) -> str:
+    """``sqlite`` für ``.db``/``.sqlite``/``.sqlite3``, sonst ``json``."""
+    return "sqlite" if state_file.lower().endswith(SQLITE_SUFFIXES) else "json"
+
+
+def state_path_for_backend(state_file: str, backend: Optional[str]) -> str:
+    """
+    Passt den Pfad an das gewünschte Backend an, z. B. ``.perlentaucher_state.json`` →
+    ``.perlentaucher_state.sqlite3`` für ``sqlite``. Ohne Backend bleibt der Pfad unverändert.
+    """
+    if not backend or backend_name_for_path(state_file) == backend:
+        return state_file
+    if backend not in STATE_BACKENDS:
+        raise ValueError(f"Unbekanntes State-Backend '{backend}' (erlaubt: {', '.join(STATE_BACKENDS)})")
+    stem, _ext = os.path.splitext(state_file)
+    return stem + (".sqlite3" if backend == "sqlite" else ".json")
+
+
+def get_state_backend(state_file: str) -> StateBackend:
+    """Backend für ``state_file`` (pro Pfad wiederverwendet); SQLite migriert eine gleichnamige JSON."""
+    key = os.path.abspath(state_file)
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is not None and (backend.name == "json" or os.path.exists(state_file)):
+            return backend
+        if backend_name_for_path(state_file) == "sqlite":
+            legacy = os.path.splitext(state_file)[0] + ".json"
+            backend = SqliteStateBackend(state_file, migrate_from=legacy)
+        else:
+            backend = JsonStateBackend(state_file)
+        _backends[key] = backend
+        return backend
+
+
+class StateSession:
+    """
+    Write-behind-Sitzung für eine State-Datei: In-Memory-Sicht plus gebündelte Schreibvorgänge.
+
+    Solange eine Sitzung für einen Pfad offen ist, leiten ``save_processed_entry``,
+    ``load_processed_entries`` und ``load_state_file`` darüber. Geschrieben wird gesammelt
+    nach ``flush_interval`` Sekunden (Timer-Thread), ab ``max_pending`` offenen Einträgen,
+    bei ``checkpoint()``/``close()`` sowie bei Prozessende (atexit) und SIGTERM.
+    """
+
+    def __init__(
+        self,
+        state_file: str,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        max_pending: int = FLUSH_MAX_PENDING,
+    ):
+        self.state_file = state_file
+        self.backend = get_state_backend(state_file)
+        self.flush_interval = flush_interval
+        self.max_pending = max(1, max_pending)
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._ids: Optional[Set[str]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._refs = 0
+        self.flush_count = 0
+
+    def entry_ids(self) -> Set[str]:
+        with self._lock:
+            if self._ids is None:
+                self._ids = set(self.backend.entry_ids())
+            return set(self._ids) | set(self._pending)
+
+    def load(self) -> Dict[str, Any]:
+        data = self.backend.load()
+        with self._lock:
+            if self._pending:
+                data.setdefault("entries", {}).update(self._pending)
+                data["last_updated"] = datetime.now().isoformat()
+        return data
+
+    def record(self, entry_id: str, entry_data: Dict[str, Any]) -> None:
+        flush_now = False
+        with self._lock:
+            self._pending[entry_id] = entry_data
+            if self._ids is not None:
+                self._ids.add(entry_id)
+            if len(self._pending) >= self.max_pending:
+                flush_now = True
+            elif self._timer is None and self.flush_interval > 0:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Schreibt alle offenen Einträge in einem Schritt; liefert deren Anzahl."""
+        with self._flush_lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        """Rumpf von ``flush``; der Aufrufer hält ``_flush_lock``."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        started = time.monotonic()
+        try:
+            with metrics.STORE_WRITE_DURATION.time(store="state"), profiling.stage("store.state"):
+                self.backend.put_entries(batch)
+        except Exception:
+            with self._lock:
+                # Neuere Werte aus der Zwischenzeit nicht überschreiben
+                for k, v in batch.items():
+                    self._pending.setdefault(k, v)
+            raise
+        self.flush_count += 1
+        logging.debug(
+            f"State: {len(batch)} Einträge geschrieben ({self.state_file}, "
+            f"{(time.monotonic() - started) * 1000:.0f} ms)"
+        )
+        return len(batch)
+
+    def checkpoint(self) -> int:
+        """Expliziter Sicherungspunkt (z. B. nach einem abgeschlossenen Download)."""
+        return self.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+
+def open_state_session(state_file: str, **kwargs: Any) -> StateSession:
+    """Öffnet (oder teilt) die Sitzung für ``state_file``; mit ``release_state_session`` schließen."""
+    key = os.path.abspath(state_file)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = StateSession(state_file, **kwargs)
+            _sessions[key] = session
+        session._refs += 1
+        return session
+
+
+def release_state_session(session: StateSession) -> None:
+    """Schreibt offene Einträge; die letzte Freigabe entfernt die Sitzung."""
+    key = os.path.abspath(session.state_file)
+    with _sessions_lock:
+        session._refs -= 1
+        if session._refs <= 0 and _sessions.get(key) is session:
+            del _sessions[key]
+    session.flush()
+
+
+@contextmanager
+def state_session(state_file: Optional[str], **kwargs: Any) -> Iterator[Optional[StateSession]]:
+    """Kontextmanager um ``open_state_session``; ohne ``state_file`` ein No-op."""
+    if not state_file:
+        yield None
+        return
+    session = open_state_session(state_file, **kwargs)
+    try:
+        yield session
+    finally:
+        release_state_session(session)
+
+
+def active_state_session(state_file: str) -> Optional[StateSession]:
+    if not _sessions:
+        return None
+    with _sessions_lock:
+        return _sessions.get(os.path.abspath(state_file))
+
+
+def flush_all_sessions() -> None:
+    """Schreibt alle offenen Sitzungen (atexit/Signal); Fehler werden nur geloggt."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+    for session in sessions:
+        try:
+            session.flush()
+        except Exception as e:
+            logging.error(f"State konnte beim Beenden nicht geschrieben werden ({session.state_file}): {e}")
+
+
+atexit.register(flush_all_sessions)
+
+
+def install_signal_flush() -> None:
+    """
+    SIGTERM (und SIGHUP) schreiben offene Sitzungen, bevor der vorherige Handler läuft bzw. der
+    Prozess endet. Nur im Haupt-Thread möglich; sonst ohne Wirkung. Ignorierte Signale (``SIG_IGN``,
+    z. B. SIGHUP unter ``nohup``) bleiben ignoriert.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for name in ("SIGTERM", "SIGHUP"):
+        signum = getattr(signal, name, None)
+        if signum is None:
+            continue
+        previous = signal.getsignal(signum)
+        if previous == signal.SIG_IGN:
+            continue
+
+        def _handler(sig, frame, _previous=previous):
+            flush_all_sessions()
+            if callable(_previous):
+                _previous(sig, frame)
+            else:
+                raise SystemExit(128 + sig)
+
+        try:
+            signal.signal(signum, _handler)
+        except (ValueError, OSError):
+            pass
+
+
+@dataclass
+class CompactionReport:
+    """Ergebnis von ``compact_state``."""
+
+    entries_before: int = 0
+    entries_after: int = 0
+    episodes_collapsed: int = 0
+    archived: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    archive_path: Optional[str] = None
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.bytes_before - self.bytes_after)
+
+    def summary(self) -> str:
+        return (
+            f"{self.entries_before} → {self.entries_after} Einträge "
+            f"({self.episodes_collapsed} Episoden zusammengefasst, {self.archived} archiviert), "
+            f"{self.bytes_before / 1024:.1f} KB → {self.bytes_after / 1024:.1f} KB "
+            f"({self.bytes_saved / 1024:.1f} KB gespart)"
+        )
+
+
+def _entry_time(entry: Dict[str, Any]) -> Optional[datetime]:
+    try:
+        ts = datetime.fromisoformat(str(entry.get("timestamp") or ""))
+    except ValueError:
+        return None
+    # Vergleich mit naiver Ortszeit wie bei ``datetime.now()`` in save_processed_entry
+    return ts.replace(tzinfo=None) if ts.tzinfo else ts
+
+
+def _append_archive(path: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """Hängt Einträge als JSON-Zeilen an das gzip-Archiv an (ein gzip-Member pro Kompaktierung)."""
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        for entry_id, entry in entries.items():
+            f.write(json.dumps({"entry_id": entry_id, **entry}, ensure_ascii=False) + "\n")
+
+
+def read_state_archive(state_file: str) -> List[Dict[str, Any]]:
+    """Liest alle archivierten Einträge (älteste zuerst)."""
+    path = os.path.splitext(state_file)[0] + ARCHIVE_SUFFIX
+    if not os.path.exists(path):
+        return []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compact_state(
+    state_file: str,
+    retention_days: Optional[int] = STATE_RETENTION_DAYS,
+    archive: bool = True,
+    now: Optional[datetime] = None,
+) -> CompactionReport:
+    """
+    Kompaktiert den Stand von ``state_file``.
+
+    - Episoden-Einträge ``<id>_SxxEyy`` mit vorhandenem Serien-Eintrag wandern als
+      ``episode_status`` in diesen (Status, Dateiname, Zeitpunkt).
+    - Einträge, deren Zeitstempel älter als ``retention_days`` ist, können nicht mehr im
+      RSS-Fenster auftauchen und werden archiviert (bzw. mit ``archive=False`` verworfen).
+      Einträge ohne lesbaren Zeitstempel bleiben erhalten. ``retention_days`` None/0 = unbegrenzt.
+
+    Eine offene ``StateSession`` wird vorher geschrieben und kann bis zum Ende nicht erneut schreiben;
+    ``record`` sammelt in der Zwischenzeit weiter.
+    """
+    session = active_state_session(state_file)
+    if session is None:
+        return _compact_backend(state_file, retention_days, archive, now)
+    with session._flush_lock:
+        session._flush_locked()
+        report = _compact_backend(state_file, retention_days, archive, now)
+        if report.episodes_collapsed or report.archived:
+            with session._lock:
+                session._ids = None
+    return report
+
+
+def _compact_backend(
+    state_file: str,
+    retention_days: Optional[int],
+    archive: bool,
+    now: Optional[datetime],
+) -> CompactionReport:
+    backend = get_state_backend(state_file)
+    report = CompactionReport(bytes_before=backend.size_bytes())
+
+    def transform(entries: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Dict[str, Any]]]:
+        report.entries_before = len(entries)
+        compacted: Dict[str, Dict[str, Any]] = {}
+        episodes: List[tuple] = []
+        for entry_id, entry in entries.items():
+            m = EPISODE_ID_RE.match(entry_id)
+            if m and m.group("parent") in entries:
+                episodes.append((m.group("parent"), m.group("code"), entry))
+            else:
+                compacted[entry_id] = dict(entry)
+        for parent, code, entry in episodes:
+            status_map = compacted[parent].setdefault("episode_status", {})
+            status_map[code] = {
+                k: entry[k] for k in ("status", "filename", "timestamp") if entry.get(k) is not None
+            }
+            report.episodes_collapsed += 1
+
+        expired: Dict[str, Dict[str, Any]] = {}
+        if retention_days:
+            cutoff = (now or datetime.now()) - timedelta(days=retention_days)
+            for entry_id in list(compacted):
+                ts = _entry_time(compacted[entry_id])
+                if ts is not None and ts < cutoff:
+                    expired[entry_id] = compacted.pop(entry_id)
+        if expired and archive:
+            report.archive_path = os.path.splitext(state_file)[0] + ARCHIVE_SUFFIX
+            _append_archive(report.archive_path, expired)
+        report.archived = len(expired)
+        report.entries_after = len(compacted)
+        return compacted if report.episodes_collapsed or report.archived else None
+
+    # Unter der Schreibsperre des Backends: gleichzeitige Schreiber gehen nicht verloren
+    backend.rewrite_entries(transform)
+    report.bytes_after = backend.size_bytes()
+    return report
+
+
+def maybe_compact_state(
+    state_file: str,
+    threshold: Optional[int] = STATE_COMPACT_THRESHOLD,
+    retention_days: Optional[int] = STATE_RETENTION_DAYS,
+) -> Optional[CompactionReport]:
+    """Kompaktiert automatisch, sobald mehr als ``threshold`` Einträge vorliegen (None/0 = nie)."""
+    if not threshold or not os.path.exists(state_file):
+        return None
+    if len(get_state_backend(state_file).entry_ids()) <= threshold:
+        return None
+    report = compact_state(state_file, retention_days=retention_days)
+    logging.info(f"State automatisch kompaktiert ({state_file}): {report.summary()}")
+    return report
@@ -1,22 +1,70 @@
 """
-Gemeinsamer Aktivitäts-/Verlauf (CLI, GUI, Wishlist-Web): JSON im Download-Ordner.
+Gemeinsamer Aktivitäts-/Verlauf (CLI, GUI, Wishlist-Web): JSON Lines im Download-Ordner.
+
+Jedes Ereignis ist eine Zeile in ``.perlentaucher_activity.jsonl`` (älteste zuerst); Schreiben ist
+ein reines Anhängen. Wird die Datei zu groß oder zu alt, wandert sie als gzip-Segment
+``<datei>.000001.gz`` … daneben. Gelesen wird neueste zuerst: rückwärts ab Dateiende, danach die
+Segmente absteigend. Alte JSON-Dateien (``.perlentaucher_activity.json``) werden übernommen.
+
+``log_activity_event``/``submit_activity`` schreiben nicht selbst, sondern reihen das Ereignis in
+eine begrenzte Warteschlange ein; ein Hintergrund-Thread schreibt gebündelt. Leser sehen noch
+nicht geschriebene Ereignisse trotzdem; bei Prozessende wird die Warteschlange geleert.
 """
 from __future__ import annotations
 
+import asyncio
+import atexit
+import glob
+import gzip
 import json
 import logging
 import os
-import shutil
+import queue
+import re
 import threading
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Literal, Optional, Tuple
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Literal, Optional, Set, Tuple
+
+from src import metrics, profiling
+from src.atomic_file import write_text_atomic
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
 
 _lock = threading.Lock()
-MAX_ENTRIES = 400
 
-ACTIVITY_FILENAME = ".perlentaucher_activity.json"
+ACTIVITY_FILENAME = ".perlentaucher_activity.jsonl"
+LEGACY_ACTIVITY_FILENAME = ".perlentaucher_activity.json"
 LEGACY_WISHLIST_ACTIVITY = ".perlentaucher_wishlist_activity.json"
 
+# Rotation der aktiven Datei in ein komprimiertes Segment
+ROTATE_MAX_BYTES = 1024 * 1024
+ROTATE_MAX_AGE_DAYS = 30
+_READ_BLOCK = 64 * 1024
+_SEGMENT_RE = re.compile(r"\.(\d{6,})\.gz$")
+
+# Bereits geprüfte Dateien (Legacy-Format) und Beginn des aktiven Segments je Datei (Inode, Zeit)
+_checked: Set[str] = set()
+_segment_started: Dict[str, Tuple[int, Optional[datetime]]] = {}
+
+# Asynchroner Schreiber: Warteschlangengröße, Bündelung und Verhalten bei voller Warteschlange
+# ("drop-oldest": ältestes Ereignis verwerfen; "drop": neues verwerfen; "block": bis
+# ACTIVITY_BLOCK_SECONDS warten, dann verwerfen — nur außerhalb eines laufenden asyncio-Loops)
+ACTIVITY_QUEUE_MAX = 10000
+ACTIVITY_FLUSH_SECONDS = 0.5
+ACTIVITY_BATCH_MAX = 500
+ACTIVITY_BLOCK_SECONDS = 0.5
+ACTIVITY_QUEUE_POLICY = "drop-oldest"
+
 Level = Literal["info", "success", "warning", "error"]
 
 
@@ -28,40 +76,182 @@ def default_activity_path(download_dir: Optional[str] = None) -> str:
 
 def resolve_activity_path(download_dir: Optional[str] = None) -> str:
     """
-    Pfad zur Aktivitätsdatei. Migriert einmalig von .perlentaucher_wishlist_activity.json
-    falls die neue Datei noch nicht existiert.
+    Pfad zur Aktivitätsdatei. Übernimmt einmalig .perlentaucher_activity.json bzw.
+    .perlentaucher_wishlist_activity.json, falls die JSONL-Datei noch nicht existiert.
     """
     base = download_dir or os.getcwd()
     new_p = os.path.join(base, ACTIVITY_FILENAME)
-    old_p = os.path.join(base, LEGACY_WISHLIST_ACTIVITY)
-    if not os.path.exists(new_p) and os.path.exists(old_p):
+    if not os.path.exists(new_p):
+        for legacy in (LEGACY_ACTIVITY_FILENAME, LEGACY_WISHLIST_ACTIVITY):
+            old_p = os.path.join(base, legacy)
+            if os.path.exists(old_p):
+                try:
+                    with _file_lock(new_p):
+                        _write_jsonl(new_p, list(reversed(_load_legacy(old_p) or [])))
+                except OSError as e:
+                    logging.debug(f"Aktivitäts-Legacy-Migration übersprungen: {e}")
+                break
+    return new_p
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """
+    Sperrt die Aktivitätsdatei für Anhängen, Rotation und Leeren: ``_lock`` im Prozess und
+    eine Sperre auf ``<datei>.lock`` über Prozesse hinweg (CLI, GUI und Wishlist-Web teilen die
+    Datei). Ohne sperrbare Lock-Datei bleibt es bei ``_lock``.
+    """
+    with _lock:
         try:
-            shutil.copy2(old_p, new_p)
+            fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
         except OSError as e:
-            logging.debug(f"Aktivitäts-Legacy-Migration übersprungen: {e}")
-    return new_p
+            logging.debug(f"Aktivitäts-Lock-Datei nicht nutzbar: {e}")
+            yield
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            elif msvcrt is not None:
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue  # LK_LOCK gibt nach ~10 s auf
+            yield
+        finally:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+            os.close(fd)
 
 
-def _load(path: str) -> Dict[str, Any]:
-    if not os.path.exists(path):
-        return {"version": 2, "entries": []}
+def _load_legacy(path: str) -> Optional[List[Dict[str, Any]]]:
+    """Einträge einer alten JSON-Datei (neueste zuerst) oder None, wenn es keine ist."""
     try:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
-        if "entries" not in data:
-            data = {"version": 2, "entries": []}
-        return data
-    except (json.JSONDecodeError, OSError) as e:
-        logging.warning(f"Aktivitätslog konnte nicht gelesen werden ({path}): {e}")
-        return {"version": 2, "entries": []}
+    except (ValueError, OSError):
+        return None
+    if isinstance(data, dict) and isinstance(data.get("entries"), list) and "ts" not in data:
+        return [e for e in data["entries"] if isinstance(e, dict)]
+    return None
+
+
+def _write_jsonl(path: str, entries: List[Dict[str, Any]]) -> None:
+    """Schreibt ``entries`` (älteste zuerst) atomar als JSON Lines."""
+    write_text_atomic(
+        path, "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries), prefix=".activity-"
+    )
+
+
+def _ensure_jsonl(path: str) -> None:
+    """
+    Einmal pro Datei und Prozess: altes JSON-Dokument am selben Pfad in JSON Lines umwandeln.
+    Aufruf unter ``_file_lock``.
+    """
+    key = os.path.abspath(path)
+    if key in _checked:
+        return
+    try:
+        with open(path, "rb") as f:
+            head = f.readline()
+    except OSError:
+        return
+    try:
+        first = json.loads(head)
+    except ValueError:
+        first = None
+    if not (isinstance(first, dict) and "ts" in first):
+        legacy = _load_legacy(path)
+        if legacy is not None:
+            _write_jsonl(path, list(reversed(legacy)))
+            logging.info(f"Aktivitätslog nach JSON Lines übernommen: {path} ({len(legacy)} Einträge)")
+    _checked.add(key)
+
+
+def _segments(path: str) -> List[str]:
+    """Rotierte Segmente, älteste zuerst."""
+    found = []
+    for seg in glob.glob(glob.escape(path) + ".*.gz"):
+        m = _SEGMENT_RE.search(seg)
+        if m:
+            found.append((int(m.group(1)), seg))
+    return [seg for _n, seg in sorted(found)]
+
+
+def _first_ts(path: str) -> Optional[datetime]:
+    try:
+        with open(path, "rb") as f:
+            return _parse_ts(json.loads(f.readline()).get("ts"))
+    except (OSError, ValueError, AttributeError):
+        return None
+
 
+def _parse_ts(value: Any) -> Optional[datetime]:
+    try:
+        ts = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
 
-def _save(path: str, data: Dict[str, Any]) -> None:
-    parent = os.path.dirname(os.path.abspath(path))
-    if parent:
-        os.makedirs(parent, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def _rotate(path: str) -> Optional[str]:
+    """
+    Verschiebt die aktive Datei komprimiert in das nächste Segment. Aufruf unter ``_file_lock``;
+    Zwischendateien tragen einen eindeutigen Namen, falls ein Prozess ohne Sperre mitläuft.
+    """
+    segs = _segments(path)
+    nxt = (int(_SEGMENT_RE.search(segs[-1]).group(1)) + 1) if segs else 1
+    target = f"{path}.{nxt:06d}.gz"
+    token = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    staging = f"{path}.{token}.rotating"
+    tmp = f"{target}.{token}.tmp"
+    try:
+        os.replace(path, staging)
+    except OSError:
+        return None  # schon rotiert oder geleert
+    try:
+        with open(staging, "rb") as src, gzip.open(tmp, "wb") as dst:
+            while True:
+                chunk = src.read(_READ_BLOCK)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        os.replace(tmp, target)
+    except BaseException:
+        # Inhalt nicht verlieren: Zwischenstand zurück an die aktive Datei hängen
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        with open(staging, "rb") as src, open(path, "ab") as dst:
+            dst.write(src.read())
+        os.remove(staging)
+        raise
+    os.remove(staging)
+    _segment_started.pop(os.path.abspath(path), None)
+    logging.debug(f"Aktivitätslog rotiert: {target}")
+    return target
+
+
+def _maybe_rotate(path: str, size: int, ino: int, now: datetime) -> None:
+    key = os.path.abspath(path)
+    if size >= ROTATE_MAX_BYTES:
+        _rotate(path)
+        return
+    cached = _segment_started.get(key)
+    if cached is None or cached[0] != ino:
+        cached = (ino, _first_ts(path))
+        _segment_started[key] = cached
+    started = cached[1]
+    if started is not None and now - started >= timedelta(days=ROTATE_MAX_AGE_DAYS):
+        _rotate(path)
 
 
 def append_activity(
@@ -72,8 +262,13 @@ def append_activity(
     level: Level = "info",
     source: str = "cli",
 ) -> None:
-    """Fügt einen Eintrag am Anfang ein (neueste zuerst beim Lesen)."""
-    entry = {
+    """Hängt einen Eintrag synchron als Zeile an (neueste zuerst beim Lesen)."""
+    _write_entries(path, [_make_entry(action, label, detail, level, source)])
+
+
+def _make_entry(action: str, label: str, detail: str, level: str, source: str) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4().hex,
         "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
         "action": action,
         "label": (label or "")[:500],
@@ -81,13 +276,243 @@ def append_activity(
         "level": level,
         "source": (source or "cli")[:32],
     }
+
+
+def _write_entries(path: str, entries: List[Dict[str, Any]]) -> None:
+    """Schreibt Einträge (älteste zuerst) mit einem einzigen ``write``; danach ggf. Rotation."""
+    line = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries).encode("utf-8")
+    now = datetime.now(timezone.utc)
+    with _file_lock(path), metrics.STORE_WRITE_DURATION.time(store="activity"), profiling.stage("store.activity"):
+        parent = os.path.dirname(os.path.abspath(path))
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        _ensure_jsonl(path)
+        # O_APPEND: ein write() pro Aufruf; die Prozess-Sperre hält Rotation und Anhängen auseinander
+        with open(path, "a+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size:
+                # Abgerissene letzte Zeile (z. B. nach Absturz) nicht mit dieser verschmelzen
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            st = os.fstat(f.fileno())
+        _maybe_rotate(path, st.st_size, st.st_ino, now)
+
+
+def _reverse_lines(path: str) -> Iterator[bytes]:
+    """Zeilen einer Datei vom Ende her, ohne sie komplett zu laden."""
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        rest = b""
+        while pos > 0:
+            step = min(_READ_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            parts = (f.read(step) + rest).split(b"\n")
+            rest = parts[0]
+            for line in reversed(parts[1:]):
+                if line.strip():
+                    yield line
+        if rest.strip():
+            yield rest
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        obj = json.loads(line)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) and "ts" in obj else None
+
+
+def iter_activity(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Alle Einträge neueste zuerst: noch nicht geschriebene aus der Warteschlange, dann die aktive
+    Datei rückwärts, dann die Segmente absteigend.
+    """
+    pending = _writer.pending(path)
     with _lock:
-        data = _load(path)
-        entries: List[Dict[str, Any]] = data.get("entries", [])
-        entries.insert(0, entry)
-        data["entries"] = entries[:MAX_ENTRIES]
-        data["version"] = 2
-        _save(path, data)
+        _ensure_jsonl(path)
+        segs = _segments(path)
+    queued = {e["id"] for e in pending}
+    for e in reversed(pending):
+        yield e
+    for line in _reverse_lines(path):
+        e = _decode(line)
+        # Zwischen pending() und dem Lesen geschriebene Einträge nicht doppelt liefern
+        if e is not None and not (queued and e.get("id") in queued):
+            yield e
+    for seg in reversed(segs):
+        try:
+            with gzip.open(seg, "rb") as f:
+                lines = f.read().split(b"\n")
+        except (OSError, EOFError) as e:
+            logging.warning(f"Aktivitäts-Segment nicht lesbar ({seg}): {e}")
+            continue
+        for line in reversed(lines):
+            e = _decode(line) if line.strip() else None
+            if e is not None:
+                yield e
+
+
+def _in_event_loop() -> bool:
+    """True in einem Thread mit laufendem asyncio-Loop (z. B. FastAPI-Handler) — dort nie blockieren."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class _ActivityWriter:
+    """Hintergrund-Thread, der eingereihte Ereignisse gebündelt je Datei schreibt."""
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue(maxsize=ACTIVITY_QUEUE_MAX)
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.dropped = 0
+
+    def submit(self, path: str, entry: Dict[str, Any]) -> bool:
+        key = os.path.abspath(path)
+        with self._pending_lock:
+            self._pending.setdefault(key, []).append(entry)
+        try:
+            if ACTIVITY_QUEUE_POLICY == "block" and not _in_event_loop():
+                self._queue.put((path, entry), timeout=ACTIVITY_BLOCK_SECONDS)
+            elif ACTIVITY_QUEUE_POLICY == "drop":
+                self._queue.put_nowait((path, entry))
+            else:
+                self._put_dropping_oldest(path, entry)
+        except queue.Full:
+            self._discard(path, entry)
+            return False
+        self._wakeup.set()
+        self._ensure_thread()
+        return True
+
+    def _put_dropping_oldest(self, path: str, entry: Dict[str, Any]) -> None:
+        while True:
+            try:
+                self._queue.put_nowait((path, entry))
+                return
+            except queue.Full:
+                try:
+                    old_path, old_entry = self._queue.get_nowait()
+                except queue.Empty:
+                    continue  # Schreiber hat inzwischen geleert
+                self._discard(old_path, old_entry)
+
+    def _discard(self, path: str, entry: Dict[str, Any]) -> None:
+        with self._pending_lock:
+            waiting = self._pending.get(os.path.abspath(path), [])
+            if entry in waiting:
+                waiting.remove(entry)
+        self.dropped += 1
+        if self.dropped == 1 or self.dropped % 100 == 0:
+            logging.warning(f"Aktivitätslog: Warteschlange voll, {self.dropped} Ereignis(se) verworfen")
+
+    def pending(self, path: str) -> List[Dict[str, Any]]:
+        with self._pending_lock:
+            return list(self._pending.get(os.path.abspath(path), ()))
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            # Kurz sammeln, damit Schübe (z. B. Stapel-Verarbeitung) als ein write() landen.
+            # Ereignisse bleiben bis zum Schreiben in der Warteschlange, flush() sieht also alles.
+            time.sleep(ACTIVITY_FLUSH_SECONDS)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logging.debug(f"Aktivitätslog: Schreib-Thread-Fehler: {e}")
+
+    def _drain(self) -> int:
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        with self._flush_lock:
+            while len(batch) < ACTIVITY_BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            by_path: Dict[str, List[Dict[str, Any]]] = {}
+            for path, entry in batch:
+                by_path.setdefault(path, []).append(entry)
+            for path, entries in by_path.items():
+                try:
+                    _write_entries(path, entries)
+                except OSError as e:
+                    logging.warning(
+                        f"Aktivitätslog konnte nicht geschrieben werden, {len(entries)} Ereignisse verworfen: {e}"
+                    )
+                key = os.path.abspath(path)
+                with self._pending_lock:
+                    done = {id(e) for e in entries}
+                    rest = [e for e in self._pending.get(key, ()) if id(e) not in done]
+                    if rest:
+                        self._pending[key] = rest
+                    else:
+                        self._pending.pop(key, None)
+            return len(batch)
+
+    def flush(self) -> int:
+        """Schreibt alles Eingereihte im aufrufenden Thread; liefert die Anzahl der Ereignisse."""
+        total = 0
+        while True:
+            n = self._drain()
+            total += n
+            if n == 0:
+                return total
+
+
+_writer = _ActivityWriter()
+_resolved: Dict[str, str] = {}
+
+
+def submit_activity(
+    path: str,
+    action: str,
+    label: str,
+    detail: str = "",
+    level: Level = "info",
+    source: str = "cli",
+) -> bool:
+    """
+    Reiht einen Eintrag ohne Datei-I/O ein (Hintergrund-Thread schreibt). Liefert False, wenn
+    die Warteschlange voll war und das Ereignis verworfen wurde.
+    """
+    return _writer.submit(path, _make_entry(action, label, detail, level, source))
+
+
+def flush_activity() -> int:
+    """Schreibt alle eingereihten Ereignisse sofort (z. B. vor dem Beenden)."""
+    return _writer.flush()
+
+
+def dropped_activity_events() -> int:
+    return _writer.dropped
+
+
+atexit.register(flush_activity)
 
 
 def log_activity_event(
@@ -98,13 +523,13 @@ def log_activity_event(
     level: Level = "info",
     source: str = "cli",
 ) -> None:
-    """Schreibt ein Ereignis in den gemeinsamen Log unter ``download_dir``."""
+    """Reiht ein Ereignis für den gemeinsamen Log unter ``download_dir`` ein (nicht blockierend)."""
     if not download_dir:
         return
-    try:
-        append_activity(resolve_activity_path(download_dir), action, label, detail, level, source)
-    except OSError as e:
-        logging.debug(f"Aktivitätslog konnte nicht geschrieben werden: {e}")
+    path = _resolved.get(download_dir)
+    if path is None:
+        path = _resolved[download_dir] = resolve_activity_path(download_dir)
+    submit_activity(path, action, label, detail, level, source)
 
 
 def log_wishlist_item_result(
@@ -139,12 +564,14 @@ def log_wishlist_item_result(
 
 
 def list_activity(path: str, limit: int = 50) -> List[Dict[str, Any]]:
-    """Liefert die neuesten Einträge zuerst."""
+    """Liefert die neuesten Einträge zuerst (liest nur so weit wie nötig)."""
     lim = max(1, min(int(limit), 200))
-    with _lock:
-        data = _load(path)
-    entries = data.get("entries", [])
-    return entries[:lim]
+    out: List[Dict[str, Any]] = []
+    for e in iter_activity(path):
+        out.append(e)
+        if len(out) >= lim:
+            break
+    return out
 
 
 def query_activity(
@@ -161,45 +588,87 @@ def query_activity(
 
     ``level`` / ``action``: exakter Vergleich; leer oder None = kein Filter.
     ``q``: Teilstring in label, detail, action, source (Groß/Kleinschreibung egal).
+    Für große Verläufe ``query_activity_page`` mit Cursor verwenden.
     """
-    lim = max(1, min(int(limit), 200))
-    off = max(0, int(offset))
+    page = query_activity_page(path, limit=limit, offset=offset, level=level, action=action, q=q)
+    return page["entries"], page["total"]
+
+
+def query_activity_page(
+    path: str,
+    *,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    level: Optional[str] = None,
+    action: Optional[str] = None,
+    source: Optional[str] = None,
+    q: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Abfrage über den SQLite-Index (``activity_index``): ``{'entries', 'next_cursor', 'total'}``.
 
-    lev = (level or "").strip().lower()
-    act = (action or "").strip()
-    needle = (q or "").strip().lower()
+    Weiterblättern mit ``cursor=next_cursor`` (Keyset, unabhängig von der Verlaufsgröße);
+    ``next_cursor`` ist None auf der letzten Seite. Ungültige Cursor lösen ValueError aus.
+    """
+    from src.activity_index import get_activity_index
 
+    # Der Index braucht alle Ereignisse für Gesamtzahl und Cursor: Eingereihtes zuerst schreiben
+    if _writer.pending(path):
+        _writer.flush()
     with _lock:
-        data = _load(path)
-    raw: List[Dict[str, Any]] = list(data.get("entries", []))
+        _ensure_jsonl(path)
+    return get_activity_index(path).query(
+        limit=limit,
+        cursor=cursor,
+        offset=offset,
+        level=level,
+        action=action,
+        source=source,
+        q=q,
+        since=since,
+        until=until,
+    )
 
-    def _match(e: Dict[str, Any]) -> bool:
-        if lev and (e.get("level") or "").lower() != lev:
-            return False
-        if act and (e.get("action") or "") != act:
-            return False
-        if needle:
-            hay = " ".join(
-                [
-                    str(e.get("label") or ""),
-                    str(e.get("detail") or ""),
-                    str(e.get("action") or ""),
-                    str(e.get("source") or ""),
-                ]
-            ).lower()
-            if needle not in hay:
-                return False
-        return True
 
-    filtered = [e for e in raw if _match(e)]
-    total = len(filtered)
-    page = filtered[off : off + lim]
-    return page, total
+def activity_signature(path: str) -> tuple:
+    """
+    Änderungskennung des Verlaufs für Lese-Caches: mtime/Größe/Inode der aktiven Datei und aller
+    Segmente. Eingereihte Ereignisse werden vorher geschrieben (wie bei ``query_activity_page``).
+    """
+    if _writer.pending(path):
+        _writer.flush()
+    out = []
+    for p in [path] + _segments(path):
+        try:
+            st = os.stat(p)
+            out.append((p, st.st_mtime_ns, st.st_size, st.st_ino))
+        except OSError:
+            out.append((p, None))
+    return tuple(out)
 
 
 def clear_activity(path: str) -> None:
-    with _lock:
-        _save(path, {"version": 2, "entries": []})
+    """Leert den Verlauf inklusive aller rotierten Segmente."""
+    _writer.flush()
+    with _file_lock(path):
+        for seg in _segments(path):
+            try:
+                os.remove(seg)
+            except OSError:
+                pass
+        _write_jsonl(path, [])
+        _segment_started.pop(os.path.abspath(path), None)
+        _checked.add(os.path.abspath(path))
+    from src.activity_index import index_path_for
+
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(index_path_for(path) + suffix)
+        except OSError:
+            pass
 
 
 def summarize_probe_for_log(probe: Dict[str, Any]) -> tuple[str, Level]:
@@ -0,0 +1,132 @@
+"""
+Kurzlebige Zwischenspeicher für Wishlist-Suchergebnisse (prozessweit, threadsicher).
+
+Die Verfügbarkeitsprüfung legt pro Eintrag das Suchergebnis ab (bester Treffer, Score, URL,
+Zeitpunkt); eine anschließende Verarbeitung innerhalb der TTL lädt direkt, statt erneut zu suchen.
+Ebenso hält die Probe nach dem Hinzufügen ihre Kandidatenliste für den Einzel-Download bereit.
+Schlüssel sind Tupel, deren erstes Element die Wishlist-ID ist (``invalidate`` entfernt alle
+Einträge einer ID).
+
+``SignatureCache`` hält dagegen Lesezugriffe des Web-UI (Wishlist, Verlauf), solange sich die
+Änderungskennung der zugrunde liegenden Dateien nicht ändert.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from src import metrics
+from src.env_settings import env_int
+
+AVAILABILITY_TTL_SECONDS = 900
+PROBE_TTL_SECONDS = 600
+CACHE_MAX_ENTRIES = 2048
+
+
+class TtlCache:
+    """LRU-begrenzter Speicher mit Ablaufzeit; ``ttl_seconds=0`` schaltet ihn ab."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+        name: Optional[str] = None,
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        with self._lock:
+            value = self._get(key)
+        if self.name:
+            metrics.record_cache(self.name, value is not None)
+        return value
+
+    def _get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        hit = self._data.get(key)
+        if hit is None:
+            return None
+        stored_at, value = hit
+        if self._clock() - stored_at >= self.ttl_seconds:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._clock(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate(self, item_id: str) -> int:
+        """Entfernt alle Einträge zu ``item_id``; liefert deren Anzahl."""
+        with self._lock:
+            keys = [k for k in self._data if k and k[0] == item_id]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class SignatureCache:
+    """
+    Read-through-Speicher: ein Wert gilt, solange ``signature`` (z. B. mtime/Größe der Datei)
+    gleich bleibt. ``loader(vorheriger_wert)`` erzeugt ihn sonst neu; Fehler werden nicht gespeichert.
+    """
+
+    def __init__(self, max_entries: int = 256, name: Optional[str] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[Any, Any]]" = OrderedDict()
+
+    def get_or_load(self, key: Hashable, signature: Any, loader: Callable[[Optional[Any]], Any]) -> Any:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None and hit[0] == signature:
+                self._data.move_to_end(key)
+                if self.name:
+                    metrics.record_cache(self.name, True)
+                return hit[1]
+        if self.name:
+            metrics.record_cache(self.name, False)
+        value = loader(hit[1] if hit is not None else None)
+        with self._lock:
+            self._data[key] = (signature, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+# Suchergebnisse der Verfügbarkeitsprüfung, von der Verarbeitung wiederverwendet
+availability_cache = TtlCache(env_int("WISHLIST_CHECK_TTL", AVAILABILITY_TTL_SECONDS), name="availability")
+
+# Kandidaten der Probe nach dem Hinzufügen, vom Einzel-Download (candidate_index) wiederverwendet
+probe_cache = TtlCache(env_int("WISHLIST_PROBE_TTL", PROBE_TTL_SECONDS), name="probe")
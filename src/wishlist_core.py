@@ -3,23 +3,36 @@ Wishlist: persistente Merkliste für Filme/Serien; Verarbeitung über MediathekV
 """
 from __future__ import annotations
 
-import json
 import logging
 import os
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple
 
 # Kernlogik aus perlentaucher (lazy würde Zyklen erzeugen — direkter Import)
+from src import metrics
 from src import perlentaucher as core
 from src.wishlist_activity import Level, log_activity_event, log_wishlist_item_result
+from src.wishlist_cache import availability_cache, probe_cache
+from src.wishlist_schedule import is_due, record_check
+from src.wishlist_store import WISHLIST_BASENAME, get_wishlist_repository, wishlist_path_for_backend
 
 WishlistKind = Literal["movie", "series"]
 
+# Parallele Stapel-Verarbeitung: Suchen (Metadaten + Mediathek) laufen mit bis zu ``wishlist_workers``
+# Threads; Downloads in einer eigenen, kleinen Warteschlange (Bandbreite, Sender-CDNs).
+WISHLIST_WORKERS_DEFAULT = 1
+WISHLIST_DOWNLOAD_WORKERS = 1
+# Verfügbarkeitsprüfung: nur Suchen, daher standardmäßig parallel
+WISHLIST_CHECK_WORKERS = 4
+
 
 def _notify_download_kwargs(args: Any) -> Dict[str, Any]:
-    """Apprise/Ntfy und ffmpeg: Wishlist-Kontext für download_content."""
+    """Apprise/Ntfy, ffmpeg und HLS-Variante: Wishlist-Kontext für download_content."""
     nu = getattr(args, "notify", None)
     out: Dict[str, Any] = {
         "notify_url": nu if nu else None,
@@ -31,9 +44,25 @@ def _notify_download_kwargs(args: Any) -> Dict[str, Any]:
     else:
         env = os.environ.get("FFMPEG_PATH")
         out["ffmpeg_path"] = env.strip() if env and env.strip() else None
+    hmh = getattr(args, "hls_max_height", None)
+    if hmh:
+        out["hls_max_height"] = hmh
+    # Web-Jobs: Download-Fortschritt/Durchsatz melden bzw. abbrechen
+    for key in ("progress_callback", "bytes_callback", "cancel_check"):
+        cb = getattr(args, key, None)
+        if callable(cb):
+            out[key] = cb
     return out
 
 
+def _quality_policy(args: Any, is_series: bool) -> Optional[str]:
+    """Qualitäts-Policy aus args (``qualitaet`` / ``serien_qualitaet``, Serien fallen auf Filme zurück)."""
+    film = getattr(args, "qualitaet", None) or None
+    if is_series:
+        return getattr(args, "serien_qualitaet", None) or film
+    return film
+
+
 @dataclass
 class WishlistItem:
     id: str
@@ -60,35 +89,42 @@ class WishlistItem:
 
 
 def default_wishlist_path(download_dir: Optional[str] = None) -> str:
+    """Standardpfad im Download-Ordner; ``WISHLIST_BACKEND=sqlite`` wählt die SQLite-Datei."""
     base = download_dir or os.getcwd()
-    return os.path.join(base, ".perlentaucher_wishlist.json")
+    path = os.path.join(base, WISHLIST_BASENAME + ".json")
+    backend = (os.environ.get("WISHLIST_BACKEND") or "").strip().lower()
+    try:
+        return wishlist_path_for_backend(path, backend or None)
+    except ValueError as e:
+        logging.warning(f"WISHLIST_BACKEND: {e}")
+        return path
 
 
 def load_wishlist(path: str) -> Dict[str, Any]:
-    if not os.path.exists(path):
-        return {"version": 1, "items": []}
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if "items" not in data:
-            data = {"version": 1, "items": []}
-        return data
-    except (json.JSONDecodeError, OSError) as e:
-        logging.warning(f"Wishlist konnte nicht geladen werden ({path}): {e}")
-        return {"version": 1, "items": []}
+    return get_wishlist_repository(path).load()
 
 
 def save_wishlist(path: str, data: Dict[str, Any]) -> None:
-    parent = os.path.dirname(os.path.abspath(path))
-    if parent:
-        os.makedirs(parent, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """Ersetzt die komplette Wishlist (für Einzeländerungen ``add_item``/``remove_item`` nutzen)."""
+    repo = get_wishlist_repository(path)
+    if repo.name == "json":
+        repo.save(data)
+    else:
+        repo.replace_all(data.get("items", []))
+
+
+def list_items(path: str, kind: Optional[WishlistKind] = None) -> List[WishlistItem]:
+    return [WishlistItem.from_dict(x) for x in get_wishlist_repository(path).list(kind)]
 
 
-def list_items(path: str) -> List[WishlistItem]:
-    data = load_wishlist(path)
-    return [WishlistItem.from_dict(x) for x in data.get("items", [])]
+def wishlist_signature(path: str) -> tuple:
+    """Änderungskennung der Wishlist (ändert sich bei jedem Schreiben, auch aus anderen Prozessen)."""
+    return get_wishlist_repository(path).signature()
+
+
+def get_item(path: str, item_id: str) -> Optional[WishlistItem]:
+    raw = get_wishlist_repository(path).get(item_id)
+    return WishlistItem.from_dict(raw) if raw else None
 
 
 def add_item(
@@ -98,7 +134,6 @@ def add_item(
     kind: WishlistKind,
     note: str = "",
 ) -> WishlistItem:
-    data = load_wishlist(path)
     item = WishlistItem(
         id=str(uuid.uuid4()),
         title=title.strip(),
@@ -106,20 +141,14 @@ def add_item(
         kind=kind,
         note=note.strip(),
     )
-    data.setdefault("items", []).append(item.to_dict())
-    save_wishlist(path, data)
+    get_wishlist_repository(path).add(item.to_dict())
     return item
 
 
 def remove_item(path: str, item_id: str) -> bool:
-    data = load_wishlist(path)
-    items = data.get("items", [])
-    new_items = [x for x in items if x.get("id") != item_id]
-    if len(new_items) == len(items):
-        return False
-    data["items"] = new_items
-    save_wishlist(path, data)
-    return True
+    availability_cache.invalidate(item_id)
+    probe_cache.invalidate(item_id)
+    return get_wishlist_repository(path).remove(item_id)
 
 
 def _synthetic_entry(movie_title: str, kind: WishlistKind) -> Dict[str, Any]:
@@ -192,6 +221,27 @@ def check_item_available(
     return r is not None
 
 
+def _search_args(
+    sprache: str,
+    audiodeskription: str,
+    tmdb_api_key: Optional[str],
+    omdb_api_key: Optional[str],
+    qualitaet: Optional[str],
+    serien_qualitaet: Optional[str],
+) -> Any:
+    """args-Objekt für Suchen ohne Download (Prüfen/Probe); Felder wie bei der Verarbeitung."""
+    return SimpleNamespace(
+        sprache=sprache,
+        audiodeskription=audiodeskription,
+        tmdb_api_key=tmdb_api_key,
+        omdb_api_key=omdb_api_key,
+        qualitaet=qualitaet or None,
+        serien_qualitaet=serien_qualitaet or None,
+        notify=None,
+        debug_no_download=False,
+    )
+
+
 def check_wishlist_availability(
     path: str,
     sprache: str = "deutsch",
@@ -199,23 +249,62 @@ def check_wishlist_availability(
     serien_download: str = "erste",
     tmdb_api_key: Optional[str] = None,
     omdb_api_key: Optional[str] = None,
+    qualitaet: Optional[str] = None,
+    serien_qualitaet: Optional[str] = None,
+    workers: int = WISHLIST_CHECK_WORKERS,
+    force_all: bool = False,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    use_cache: bool = False,
 ) -> Tuple[List[WishlistItem], int]:
-    """Gibt Wishlist-Einträge zurück, die aktuell in der Mediathek auffindbar sind, und die Gesamtanzahl."""
-    available: List[WishlistItem] = []
-    items = list_items(path)
-    total = len(items)
-    for item in items:
-        meta = _metadata_for_item(item.title, item.year, item.kind, tmdb_api_key, omdb_api_key)
-        if check_item_available(
-            item.title,
-            item.year,
-            item.kind,
-            meta,
-            sprache,
-            audiodeskription,
-            serien_download,
-        ):
-            available.append(item)
+    """
+    Gibt Wishlist-Einträge zurück, die aktuell in der Mediathek auffindbar sind, und die Gesamtanzahl.
+
+    Die Suchen laufen mit bis zu ``workers`` Threads; jedes Ergebnis (bester Treffer, Score, URL,
+    Zeitpunkt) landet in ``availability_cache`` und wird von ``process_wishlist_items`` bzw.
+    ``process_one_wishlist_item`` innerhalb der TTL ohne erneute Suche verwendet — dafür müssen
+    Sprache, Audiodeskription und Qualität dieselben sein wie bei der Verarbeitung.
+
+    Geprüft werden nur fällige Einträge (siehe ``process_wishlist_items``), mit ``force_all`` alle;
+    die Gesamtanzahl zählt immer alle Einträge.
+
+    ``progress(erledigt, gesamt, titel)`` wird nach jeder Suche aufgerufen; liefert ``cancel_check()``
+    True, starten keine weiteren Suchen (bereits gefundene Einträge werden trotzdem zurückgegeben).
+
+    ``use_cache``: noch gültige Ergebnisse aus ``availability_cache`` übernehmen statt neu zu suchen
+    (Daemon-Auffrischung); standardmäßig wird jeder Eintrag neu gesucht.
+    """
+    repo = get_wishlist_repository(path)
+    items_raw = repo.list()
+    total = len(items_raw)
+    items = [WishlistItem.from_dict(x) for x in (items_raw if force_all else _due_items(items_raw))]
+    args = _search_args(sprache, audiodeskription, tmdb_api_key, omdb_api_key, qualitaet, serien_qualitaet)
+    # Serien mit „keine“ werden wie bisher auf die erste Folge geprüft
+    mode = "erste" if serien_download == "keine" else serien_download
+    workers = max(1, min(int(workers), len(items) or 1))
+    done_lock = threading.Lock()
+    done = [0]
+
+    def lookup(it: WishlistItem) -> Optional[_WishlistLookup]:
+        if cancel_check and cancel_check():
+            return None
+        lk = _lookup_or_not_found(it, args, mode, use_cache=use_cache)
+        if progress:
+            with done_lock:
+                done[0] += 1
+                n = done[0]
+            progress(n, len(items), it.title)
+        return lk
+
+    if workers <= 1:
+        lookups = [lookup(it) for it in items]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wishlist-pruefen") as pool:
+            lookups = list(pool.map(lookup, items))
+    lookups = [lk for lk in lookups if lk is not None]
+    for lk in lookups:
+        _record_lookup(repo, lk)
+    available = [lk.item for lk in lookups if lk.available]
     return available, total
 
 
@@ -233,6 +322,13 @@ def _classify_movie_probe(candidates: List[Dict[str, Any]]) -> str:
     return "ambiguous"
 
 
+def _probe_mode(item: WishlistItem, serien_mode: str) -> str:
+    """Modus von Probe/Einzel-Download: Staffel nur bei „staffel“, sonst erste Folge."""
+    if item.kind != "series":
+        return "movie"
+    return "staffel" if serien_mode == "staffel" else "erste"
+
+
 def probe_wishlist_item(
     item: WishlistItem,
     sprache: str = "deutsch",
@@ -240,20 +336,28 @@ def probe_wishlist_item(
     serien_download: str = "erste",
     tmdb_api_key: Optional[str] = None,
     omdb_api_key: Optional[str] = None,
+    qualitaet: Optional[str] = None,
+    serien_qualitaet: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Prüft einen Eintrag direkt nach dem Hinzufügen (MediathekViewWeb).
     Rückgabe ist JSON-tauglich (keine rohen API-Objekte).
-    """
-    meta = _metadata_for_item(item.title, item.year, item.kind, tmdb_api_key, omdb_api_key)
 
+    Kandidaten bzw. Episoden samt Metadaten landen in ``probe_cache`` (Schlüssel: ID + Präferenzen);
+    ``process_one_wishlist_item`` lädt innerhalb der TTL genau den gewählten ``candidate_index``
+    aus dieser Liste, ohne erneut zu suchen.
+    """
     if item.kind == "series" and serien_download == "keine":
         return {
             "status": "serien_skipped",
             "message": "Serien-Download ist auf „keine“ gestellt — Eintrag bleibt nur auf der Liste.",
         }
 
-    if item.kind == "series" and serien_download == "staffel":
+    args = _search_args(sprache, audiodeskription, tmdb_api_key, omdb_api_key, qualitaet, serien_qualitaet)
+    mode = _probe_mode(item, serien_download)
+    meta = _metadata_for_item(item.title, item.year, item.kind, tmdb_api_key, omdb_api_key)
+
+    if mode == "staffel":
         eps = core.search_mediathek_series(
             item.title,
             prefer_language=sprache,
@@ -263,9 +367,11 @@ def probe_wishlist_item(
             year=item.year,
             metadata=meta,
             debug=False,
+            quality=_quality_policy(args, is_series=True),
         )
         if not eps:
             return {"status": "not_found"}
+        probe_cache.put(_lookup_key(item, args, mode), _WishlistLookup(item, mode, meta, eps))
         slots = core.pick_best_series_episodes_per_slot(
             eps,
             item.title,
@@ -287,9 +393,11 @@ def probe_wishlist_item(
         metadata=meta,
         limit=8,
         for_series=(item.kind == "series"),
+        quality=_quality_policy(args, is_series=item.kind == "series"),
     )
     if not raw:
         return {"status": "not_found"}
+    probe_cache.put(_lookup_key(item, args, mode), _WishlistLookup(item, mode, meta, raw))
 
     pub = [
         {
@@ -397,8 +505,7 @@ def process_one_wishlist_item(
     Verarbeitet genau einen Wishlist-Eintrag. Bei Film/Serie (erste Folge) kann ``candidate_index``
     die Auswahl aus list_mediathek_movie_candidates steuern. Bei Staffel-Modus wird die komplette Staffel geladen.
     """
-    data = load_wishlist(path)
-    raw_item = next((x for x in data.get("items", []) if x.get("id") == item_id), None)
+    raw_item = get_wishlist_repository(path).get(item_id)
     if not raw_item:
         log_wishlist_item_result(
             getattr(args, "download_dir", None),
@@ -409,9 +516,6 @@ def process_one_wishlist_item(
         )
         return False, "not_found_item"
     item = WishlistItem.from_dict(raw_item)
-    metadata = _metadata_for_item(
-        item.title, item.year, item.kind, getattr(args, "tmdb_api_key", None), getattr(args, "omdb_api_key", None)
-    )
     entry_id = f"wishlist:{item.id}"
     entry_link = f"wishlist:{item.id}"
     state_file = None if getattr(args, "no_state", False) else getattr(args, "state_file", None)
@@ -427,42 +531,49 @@ def process_one_wishlist_item(
         )
         return False, "serien_skipped"
 
-    if item.kind == "series" and serien_mode == "staffel":
+    mode = _probe_mode(item, serien_mode)
+    # Kandidaten der Probe nach dem Hinzufügen: genau die Liste, aus der gewählt wurde
+    probe = probe_cache.get(_lookup_key(item, args, mode))
+    # Sonst bester Treffer einer frischen Verfügbarkeitsprüfung: direkt laden statt erneut suchen
+    cached = None
+    if probe is None and int(candidate_index) == 0:
+        cached = availability_cache.get(_lookup_key(item, args, _lookup_mode(item, serien_mode)))
+        if cached is not None and not cached.available:
+            cached = None
+    if probe is not None or cached is not None:
+        metadata = (probe or cached).metadata
+    else:
+        metadata = _metadata_for_item(
+            item.title, item.year, item.kind, getattr(args, "tmdb_api_key", None), getattr(args, "omdb_api_key", None)
+        )
+    availability_cache.invalidate(item.id)
+    probe_cache.invalidate(item.id)
+
+    if cached is not None:
+        logging.info(f"Wishlist: Suchergebnis vom {cached.checked_at} wiederverwendet: {item.title}")
+        ok, code = _download_wishlist_lookup(cached, args, state_file)
+    elif mode == "staffel" and probe is not None:
+        ok, code = _process_series_staffel_with_episodes(
+            probe.found, item.title, item.year, metadata, entry_link, args, entry_id, state_file
+        )
+    elif mode == "staffel":
         ok, code = _process_series_staffel(
             item.title, item.year, metadata, entry_link, args, entry_id, state_file
         )
-    elif item.kind == "series":
-        cands = core.list_mediathek_movie_candidates(
-            item.title,
-            prefer_language=args.sprache,
-            prefer_audio_desc=args.audiodeskription,
-            year=item.year,
-            metadata=metadata,
-            limit=8,
-            for_series=True,
-        )
-        if not cands:
-            log_wishlist_item_result(
-                getattr(args, "download_dir", None),
+    else:
+        if probe is not None:
+            cands = probe.found
+        else:
+            cands = core.list_mediathek_movie_candidates(
                 item.title,
-                False,
-                "not_found",
-                getattr(args, "activity_source", "cli"),
+                prefer_language=args.sprache,
+                prefer_audio_desc=args.audiodeskription,
+                year=item.year,
+                metadata=metadata,
+                limit=8,
+                for_series=mode == "erste",
+                quality=_quality_policy(args, is_series=mode == "erste"),
             )
-            return False, "not_found"
-        ci = max(0, min(int(candidate_index), len(cands) - 1))
-        ok, code = _process_series_erste_with_result(
-            cands[ci]["result"], item.title, item.year, metadata, entry_link, args, entry_id, state_file
-        )
-    else:
-        cands = core.list_mediathek_movie_candidates(
-            item.title,
-            prefer_language=args.sprache,
-            prefer_audio_desc=args.audiodeskription,
-            year=item.year,
-            metadata=metadata,
-            limit=8,
-        )
         if not cands:
             log_wishlist_item_result(
                 getattr(args, "download_dir", None),
@@ -473,9 +584,25 @@ def process_one_wishlist_item(
             )
             return False, "not_found"
         ci = max(0, min(int(candidate_index), len(cands) - 1))
-        ok, code = _process_movie_with_result(
-            cands[ci]["result"], item.title, item.year, metadata, entry_link, args, entry_id, state_file
+        # Gewählter Kandidat abgelaufen (404/410): nächster abrufbarer in der Rangfolge
+        live = (
+            0
+            if args.debug_no_download
+            else core.first_live_candidate([c["result"].get("url_video") for c in cands[ci:]])
         )
+        handler = _process_series_erste_with_result if mode == "erste" else _process_movie_with_result
+        if live is None:
+            logging.warning(f"Wishlist: kein abrufbarer Treffer mehr für '{item.title}'")
+            ok, code = handler(None, item.title, item.year, metadata, entry_link, args, entry_id, state_file)
+        else:
+            if live > 0:
+                logging.info(
+                    f"Wishlist: Treffer {ci + 1} nicht mehr abrufbar — weiche auf "
+                    f"'{cands[ci + live]['title']}' aus"
+                )
+            ok, code = handler(
+                cands[ci + live]["result"], item.title, item.year, metadata, entry_link, args, entry_id, state_file
+            )
 
     if ok and code == "success" and remove_on_success:
         remove_item(path, item_id)
@@ -489,16 +616,16 @@ def process_one_wishlist_item(
     return ok, code
 
 
-def _process_series_erste(
+def _search_item(
     movie_title: str,
     year: Optional[int],
     metadata: Dict[str, Any],
     entry_link: str,
     args: Any,
-    entry_id: str,
-    state_file: Optional[str],
-) -> Tuple[bool, str]:
-    result = core.search_mediathek(
+    is_series: bool,
+) -> Optional[Dict[str, Any]]:
+    """Bester Mediathek-Treffer für Film bzw. erste Serienfolge (nur Suche, kein Download)."""
+    return core.search_mediathek(
         movie_title,
         prefer_language=args.sprache,
         prefer_audio_desc=args.audiodeskription,
@@ -508,55 +635,19 @@ def _process_series_erste(
         year=year,
         metadata=metadata,
         debug=args.debug_no_download,
+        quality=_quality_policy(args, is_series=is_series),
     )
-    if not result:
-        return False, "not_found"
-    season, episode = core.extract_episode_info(result, movie_title)
-    series_base_dir = args.serien_dir if args.serien_dir else args.download_dir
-    if args.debug_no_download:
-        fp = core.build_download_filepath(
-            result,
-            args.download_dir,
-            movie_title,
-            metadata,
-            is_series=True,
-            series_base_dir=series_base_dir,
-            season=season,
-            episode=episode,
-            create_dirs=False,
-        )
-        logging.info(f"DEBUG-MODUS: Wishlist-Serie übersprungen: '{result.get('title')}' -> {fp}")
-        return True, "debug"
-    success, title, filepath, _sk = core.download_content(
-        result,
-        args.download_dir,
-        movie_title,
-        metadata,
-        is_series=True,
-        series_base_dir=series_base_dir,
-        season=season,
-        episode=episode,
-        **_notify_download_kwargs(args),
-    )
-    if state_file:
-        st = "download_success" if success else "download_failed"
-        fn = os.path.basename(filepath) if filepath else None
-        core.save_processed_entry(
-            state_file, entry_id, status=st, movie_title=movie_title, filename=fn, is_series=True
-        )
-    return success, "success" if success else "failed"
 
 
-def _process_series_staffel(
+def _search_series_episodes(
     movie_title: str,
     year: Optional[int],
     metadata: Dict[str, Any],
     entry_link: str,
     args: Any,
-    entry_id: str,
-    state_file: Optional[str],
-) -> Tuple[bool, str]:
-    episodes = core.search_mediathek_series(
+) -> List[Dict[str, Any]]:
+    """Alle Episoden-Treffer einer Serie (Staffel-Modus; nur Suche, kein Download)."""
+    return core.search_mediathek_series(
         movie_title,
         prefer_language=args.sprache,
         prefer_audio_desc=args.audiodeskription,
@@ -566,7 +657,50 @@ def _process_series_staffel(
         year=year,
         metadata=metadata,
         debug=args.debug_no_download,
+        quality=_quality_policy(args, is_series=True),
+    ) or []
+
+
+def _process_series_erste(
+    movie_title: str,
+    year: Optional[int],
+    metadata: Dict[str, Any],
+    entry_link: str,
+    args: Any,
+    entry_id: str,
+    state_file: Optional[str],
+) -> Tuple[bool, str]:
+    result = _search_item(movie_title, year, metadata, entry_link, args, is_series=True)
+    return _process_series_erste_with_result(
+        result, movie_title, year, metadata, entry_link, args, entry_id, state_file
     )
+
+
+def _process_series_staffel(
+    movie_title: str,
+    year: Optional[int],
+    metadata: Dict[str, Any],
+    entry_link: str,
+    args: Any,
+    entry_id: str,
+    state_file: Optional[str],
+) -> Tuple[bool, str]:
+    episodes = _search_series_episodes(movie_title, year, metadata, entry_link, args)
+    return _process_series_staffel_with_episodes(
+        episodes, movie_title, year, metadata, entry_link, args, entry_id, state_file
+    )
+
+
+def _process_series_staffel_with_episodes(
+    episodes: List[Dict[str, Any]],
+    movie_title: str,
+    year: Optional[int],
+    metadata: Dict[str, Any],
+    entry_link: str,
+    args: Any,
+    entry_id: str,
+    state_file: Optional[str],
+) -> Tuple[bool, str]:
     if not episodes:
         if state_file:
             core.save_processed_entry(
@@ -581,50 +715,53 @@ def _process_series_staffel(
         prefer_audio_desc=args.audiodeskription,
         search_year=year,
         metadata=metadata,
+        check_liveness=not args.debug_no_download,
     )
     total_episodes = len(episodes_with_info)
     if args.debug_no_download:
         logging.info(f"DEBUG-MODUS: Wishlist-Staffel übersprungen ({total_episodes} Episoden)")
         return True, "debug"
     downloaded_count = 0
-    for season, episode_num, episode_data in episodes_with_info:
-        if season is None or episode_num is None:
-            continue
-        success, title, filepath, _sk = core.download_content(
-            episode_data,
-            args.download_dir,
-            movie_title,
-            metadata,
-            is_series=True,
-            series_base_dir=series_base_dir,
-            season=season,
-            episode=episode_num,
-            **_notify_download_kwargs(args),
-        )
-        if success:
-            downloaded_count += 1
+    # Episoden-Status gebündelt schreiben statt einmal pro Episode
+    with core.state_session(state_file):
+        for season, episode_num, episode_data in episodes_with_info:
+            if season is None or episode_num is None:
+                continue
+            success, title, filepath, _sk = core.download_content(
+                episode_data,
+                args.download_dir,
+                movie_title,
+                metadata,
+                is_series=True,
+                series_base_dir=series_base_dir,
+                season=season,
+                episode=episode_num,
+                **_notify_download_kwargs(args),
+            )
+            if success:
+                downloaded_count += 1
+            if state_file:
+                eid = f"{entry_id}_S{season:02d}E{episode_num:02d}"
+                st = "download_success" if success else "download_failed"
+                fn = os.path.basename(filepath) if filepath else None
+                core.save_processed_entry(
+                    state_file,
+                    eid,
+                    status=st,
+                    movie_title=f"{movie_title} S{season:02d}E{episode_num:02d}",
+                    filename=fn,
+                )
         if state_file:
-            eid = f"{entry_id}_S{season:02d}E{episode_num:02d}"
-            st = "download_success" if success else "download_failed"
-            fn = os.path.basename(filepath) if filepath else None
+            status = "download_success" if downloaded_count > 0 else "download_failed"
+            ep_list = [f"S{s:02d}E{e:02d}" for s, e, _ in episodes_with_info if s is not None and e is not None]
             core.save_processed_entry(
                 state_file,
-                eid,
-                status=st,
-                movie_title=f"{movie_title} S{season:02d}E{episode_num:02d}",
-                filename=fn,
+                entry_id,
+                status=status,
+                movie_title=movie_title,
+                is_series=True,
+                episodes=ep_list,
             )
-    if state_file:
-        status = "download_success" if downloaded_count > 0 else "download_failed"
-        ep_list = [f"S{s:02d}E{e:02d}" for s, e, _ in episodes_with_info if s is not None and e is not None]
-        core.save_processed_entry(
-            state_file,
-            entry_id,
-            status=status,
-            movie_title=movie_title,
-            is_series=True,
-            episodes=ep_list,
-        )
     ok = downloaded_count > 0
     return ok, "success" if ok else "failed"
 
@@ -638,103 +775,294 @@ def _process_movie(
     entry_id: str,
     state_file: Optional[str],
 ) -> Tuple[bool, str]:
-    result = core.search_mediathek(
-        movie_title,
-        prefer_language=args.sprache,
-        prefer_audio_desc=args.audiodeskription,
-        notify_url=args.notify,
-        notify_source="wishlist",
-        entry_link=entry_link,
-        year=year,
-        metadata=metadata,
-        debug=args.debug_no_download,
+    result = _search_item(movie_title, year, metadata, entry_link, args, is_series=False)
+    return _process_movie_with_result(
+        result, movie_title, year, metadata, entry_link, args, entry_id, state_file
     )
-    if not result:
-        if state_file:
-            core.save_processed_entry(state_file, entry_id, status="not_found", movie_title=movie_title)
-        return False, "not_found"
-    if args.debug_no_download:
-        fp = core.build_download_filepath(
-            result, args.download_dir, movie_title, metadata, is_series=False, create_dirs=False
-        )
-        logging.info(f"DEBUG-MODUS: Wishlist-Film übersprungen: '{result.get('title')}' -> {fp}")
-        return True, "debug"
-    success, title, filepath, _sk = core.download_content(
-        result, args.download_dir, movie_title, metadata, is_series=False, **_notify_download_kwargs(args)
+
+
+@dataclass
+class _WishlistLookup:
+    """Ergebnis der Suchphase eines Eintrags (Metadaten + Mediathek-Treffer, noch kein Download)."""
+
+    item: WishlistItem
+    mode: str  # "movie", "erste", "staffel" oder "skip"
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    found: Any = None  # Treffer (Film/erste Folge) bzw. Episodenliste (Staffel)
+    score: Optional[float] = None
+    checked_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    recorded: bool = False  # Planungsfelder schon fortgeschrieben (Wiederverwendung aus dem Cache)
+    failed: bool = False  # Suche gescheitert (API-Fehler, Ausnahme) — kein echtes „nicht gefunden“
+
+    @property
+    def available(self) -> bool:
+        return bool(self.found)
+
+    def best(self) -> Optional[Dict[str, Any]]:
+        """Bester Treffer (bei Staffeln die erste gefundene Episode)."""
+        if isinstance(self.found, list):
+            return self.found[0] if self.found else None
+        return self.found
+
+    def summary(self) -> Dict[str, Any]:
+        best = self.best() or {}
+        return {
+            "id": self.item.id,
+            "title": self.item.title,
+            "mode": self.mode,
+            "available": self.available,
+            "candidate": best.get("title"),
+            "score": self.score,
+            "url": best.get("url_video"),
+            "episodes": len(self.found) if isinstance(self.found, list) else None,
+            "checked_at": self.checked_at,
+        }
+
+
+def _lookup_mode(item: WishlistItem, serien_mode: str) -> str:
+    if item.kind != "series":
+        return "movie"
+    if serien_mode == "keine":
+        return "skip"
+    return "erste" if serien_mode == "erste" else "staffel"
+
+
+def _lookup_key(item: WishlistItem, args: Any, mode: str) -> Tuple[Any, ...]:
+    """Cache-Schlüssel: alles, was das Suchergebnis beeinflusst (Eintrag, Modus, Präferenzen)."""
+    return (
+        item.id,
+        mode,
+        item.title,
+        item.year,
+        getattr(args, "sprache", None),
+        getattr(args, "audiodeskription", None),
+        _quality_policy(args, is_series=item.kind == "series"),
+        bool(getattr(args, "tmdb_api_key", None)),
+        bool(getattr(args, "omdb_api_key", None)),
     )
-    if state_file:
-        st = "download_success" if success else "download_failed"
-        fn = os.path.basename(filepath) if filepath else None
-        core.save_processed_entry(state_file, entry_id, status=st, movie_title=movie_title, filename=fn)
-    return success, "success" if success else "failed"
+
+
+def _lookup_wishlist_item(
+    item: WishlistItem, args: Any, serien_mode: str, use_cache: bool = True
+) -> _WishlistLookup:
+    """
+    Suchphase: Metadaten und Mediathek-Suche; threadsicher, schreibt weder Wishlist noch State.
+    Ein noch gültiges Ergebnis aus ``availability_cache`` wird ohne erneute Suche übernommen.
+    """
+    logging.info(f"Wishlist: '{item.title}' ({item.kind}, Jahr={item.year})")
+    mode = _lookup_mode(item, serien_mode)
+    if mode == "skip":
+        return _WishlistLookup(item, "skip")
+    key = _lookup_key(item, args, mode)
+    if use_cache:
+        cached = availability_cache.get(key)
+        if cached is not None:
+            logging.info(f"Wishlist: Suchergebnis vom {cached.checked_at} wiederverwendet: {item.title}")
+            return cached
+    metadata = _metadata_for_item(
+        item.title,
+        item.year,
+        item.kind,
+        getattr(args, "tmdb_api_key", None),
+        getattr(args, "omdb_api_key", None),
+    )
+    entry_link = f"wishlist:{item.id}"
+    errors_before = metrics.thread_request_errors("mvw")
+    if mode == "staffel":
+        found: Any = _search_series_episodes(item.title, item.year, metadata, entry_link, args)
+    else:
+        found = _search_item(item.title, item.year, metadata, entry_link, args, is_series=mode == "erste")
+    lookup = _WishlistLookup(item, mode, metadata, found)
+    # Ohne Treffer und mit fehlgeschlagenen Mediathek-Anfragen ist „nicht gefunden“ nicht belegt
+    lookup.failed = not found and metrics.thread_request_errors("mvw") > errors_before
+    best = lookup.best()
+    if best:
+        try:
+            lookup.score = core.score_movie(
+                best,
+                args.sprache,
+                args.audiodeskription,
+                search_title=item.title,
+                search_year=item.year,
+                metadata=metadata,
+            )
+        except Exception as e:
+            logging.debug(f"Wishlist: Score für '{item.title}' nicht ermittelbar: {e}")
+    if not lookup.failed:
+        availability_cache.put(key, lookup)
+    return lookup
+
+
+def _download_wishlist_lookup(
+    lookup: _WishlistLookup, args: Any, state_file: Optional[str]
+) -> Tuple[bool, str]:
+    """Downloadphase zu einem Suchergebnis (inkl. State-Einträgen); verwirft danach den Cache-Eintrag."""
+    item = lookup.item
+    availability_cache.invalidate(item.id)
+    if lookup.mode == "skip":
+        logging.info(f"Wishlist: Serie übersprungen (serien-download=keine): {item.title}")
+        return False, "serien_skipped"
+    entry_id = entry_link = f"wishlist:{item.id}"
+    handler = {
+        "movie": _process_movie_with_result,
+        "erste": _process_series_erste_with_result,
+        "staffel": _process_series_staffel_with_episodes,
+    }[lookup.mode]
+    return handler(
+        lookup.found, item.title, item.year, lookup.metadata, entry_link, args, entry_id, state_file
+    )
+
+
+def wishlist_workers_from_args(args: Any) -> int:
+    """Anzahl paralleler Suchen aus ``args.wishlist_workers`` (mindestens 1 = sequenziell)."""
+    try:
+        return max(1, int(getattr(args, "wishlist_workers", None) or WISHLIST_WORKERS_DEFAULT))
+    except (TypeError, ValueError):
+        return WISHLIST_WORKERS_DEFAULT
+
+
+def _due_items(items_raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    now = datetime.now()
+    due = [x for x in items_raw if is_due(x, now)]
+    if len(due) < len(items_raw):
+        logging.info(
+            f"Wishlist: {len(due)} von {len(items_raw)} Einträgen fällig "
+            f"(übrige nach erfolglosen Suchen zurückgestellt; --wishlist-force-all sucht alle)"
+        )
+    return due
+
+
+def _record_lookup(repo: Any, lookup: _WishlistLookup) -> None:
+    """
+    Schreibt das Suchergebnis in die Planungsfelder des Eintrags (einmal pro Suche). Gescheiterte
+    Suchen lassen den Prüfplan unverändert — ein Mediathek-Ausfall soll keine Einträge zurückstellen.
+    """
+    if lookup.mode == "skip" or lookup.recorded or lookup.failed:
+        return
+    lookup.recorded = True
+    raw = repo.get(lookup.item.id)
+    if raw is not None:
+        repo.update(record_check(raw, lookup.available, now=datetime.fromisoformat(lookup.checked_at)))
+
+
+def _lookup_or_not_found(
+    item: WishlistItem, args: Any, serien_mode: str, use_cache: bool = True
+) -> _WishlistLookup:
+    """Wie ``_lookup_wishlist_item``; ein Fehler bei der Suche gilt als „nicht gefunden“ statt den Lauf abzubrechen."""
+    try:
+        return _lookup_wishlist_item(item, args, serien_mode, use_cache=use_cache)
+    except Exception as e:
+        logging.error(f"Wishlist: Suche fehlgeschlagen für '{item.title}': {e}", exc_info=True)
+        return _WishlistLookup(item, _lookup_mode(item, serien_mode), failed=True)
+
+
+def _process_lookups_parallel(
+    items: List[WishlistItem],
+    args: Any,
+    serien_mode: str,
+    workers: int,
+    finish: Any,
+    cancel_check: Optional[Callable[[], bool]] = None,
+) -> None:
+    """
+    Suchen laufen mit ``workers`` Threads, Downloads über eine eigene Warteschlange mit
+    ``WISHLIST_DOWNLOAD_WORKERS`` Threads. Downloads werden in Wishlist-Reihenfolge eingereiht,
+    sobald die jeweilige Suche fertig ist. Fehler einer Suche zählen als „nicht gefunden“, Fehler
+    eines Downloads werden nach Abschluss aller Einträge weitergereicht. Nach einem Abbruch (``cancel_check``) starten keine weiteren Suchen; ``finish`` erhält dann None.
+    """
+
+    def lookup(it: WishlistItem) -> Optional[_WishlistLookup]:
+        if cancel_check and cancel_check():
+            return None
+        return _lookup_or_not_found(it, args, serien_mode)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wishlist-suche") as lookups, \
+            ThreadPoolExecutor(max_workers=WISHLIST_DOWNLOAD_WORKERS, thread_name_prefix="wishlist-dl") as downloads:
+        lookup_futures = [lookups.submit(lookup, it) for it in items]
+        download_futures = [downloads.submit(finish, f.result()) for f in lookup_futures]
+        for f in download_futures:
+            f.result()
 
 
 def process_wishlist_items(
     path: str,
     args: Any,
     remove_on_success: bool = True,
+    workers: Optional[int] = None,
+    item_ids: Optional[Iterable[str]] = None,
+    force_all: Optional[bool] = None,
 ) -> Tuple[int, int]:
     """
-    Verarbeitet alle Wishlist-Einträge. Entfernt erfolgreich verarbeitete Einträge (Download geklappt).
+    Verarbeitet alle Wishlist-Einträge. Erfolgreich verarbeitete Einträge (Download geklappt) werden
+    jeweils direkt danach einzeln entfernt; während des Laufs hinzugefügte Einträge bleiben erhalten.
+
+    ``workers`` (Standard: ``args.wishlist_workers``, sonst 1): Anzahl paralleler Metadaten-/Mediathek-
+    Suchen. Downloads laufen getrennt davon höchstens ``WISHLIST_DOWNLOAD_WORKERS``-fach parallel;
+    entfernte Einträge und Zählwerte sind unabhängig von ``workers``.
+
+    ``item_ids``: nur diese Einträge verarbeiten (z. B. Kandidaten aus den Mediathek-Neuzugängen).
+
+    Gesucht werden nur fällige Einträge (``wishlist_schedule``: Abstand wächst mit jeder Fehlsuche);
+    ``force_all`` bzw. ``args.wishlist_force_all`` verarbeitet alle.
+
+    Optional an ``args``: ``wishlist_progress(erledigt, gesamt, titel)`` nach jedem Eintrag und
+    ``cancel_check()`` — liefert es True, werden keine weiteren Einträge geladen (Web-Jobs).
 
     Returns:
         (processed_count, success_count)
     """
-    data = load_wishlist(path)
-    items_raw = data.get("items", [])
+    repo = get_wishlist_repository(path)
+    items_raw = repo.list()
+    if item_ids is not None:
+        wanted = set(item_ids)
+        items_raw = [x for x in items_raw if x.get("id") in wanted]
     if not items_raw:
-        logging.info("Wishlist ist leer.")
+        logging.info("Wishlist ist leer." if item_ids is None else "Wishlist: keine Einträge zu verarbeiten.")
         return 0, 0
+    if force_all is None:
+        force_all = bool(getattr(args, "wishlist_force_all", False))
+    if not force_all:
+        items_raw = _due_items(items_raw)
+        if not items_raw:
+            return 0, 0
 
     state_file = None if getattr(args, "no_state", False) else getattr(args, "state_file", None)
-    tmdb_key = getattr(args, "tmdb_api_key", None)
-    omdb_key = getattr(args, "omdb_api_key", None)
     serien_mode = getattr(args, "serien_download", "erste")
+    workers = max(1, int(workers)) if workers is not None else wishlist_workers_from_args(args)
+    items = [WishlistItem.from_dict(raw) for raw in items_raw]
+    results: Dict[str, Tuple[bool, str]] = {}
 
-    processed = 0
-    successes = 0
-    remaining: List[Dict[str, Any]] = []
-
-    for raw in items_raw:
-        item = WishlistItem.from_dict(raw)
-        movie_title = item.title
-        year = item.year
-        kind = item.kind
-        entry_id = f"wishlist:{item.id}"
-        entry_link = f"wishlist:{item.id}"
-        metadata = _metadata_for_item(movie_title, year, kind, tmdb_key, omdb_key)
-        is_series = kind == "series"
-
-        logging.info(f"Wishlist: '{movie_title}' ({kind}, Jahr={year})")
-
-        if is_series:
-            if serien_mode == "keine":
-                logging.info(f"Wishlist: Serie übersprungen (serien-download=keine): {movie_title}")
-                remaining.append(raw)
-                processed += 1
-                continue
-            if serien_mode == "erste":
-                ok, code = _process_series_erste(
-                    movie_title, year, metadata, entry_link, args, entry_id, state_file
-                )
-            else:
-                ok, code = _process_series_staffel(
-                    movie_title, year, metadata, entry_link, args, entry_id, state_file
-                )
-        else:
-            ok, code = _process_movie(
-                movie_title, year, metadata, entry_link, args, entry_id, state_file
-            )
+    cancel_check = getattr(args, "cancel_check", None)
+    if not callable(cancel_check):
+        cancel_check = None
+    report = getattr(args, "wishlist_progress", None)
 
-        processed += 1
+    def finish(lookup: Optional[_WishlistLookup]) -> None:
+        if lookup is None or (cancel_check and cancel_check()):
+            return
+        _record_lookup(repo, lookup)
+        ok, code = _download_wishlist_lookup(lookup, args, state_file)
+        results[lookup.item.id] = (ok, code)
         if ok and code == "success" and remove_on_success:
-            successes += 1
-            logging.info(f"Wishlist: Eintrag erledigt und entfernt: {movie_title}")
-            continue
-        remaining.append(raw)
+            repo.remove(lookup.item.id)
+            logging.info(f"Wishlist: Eintrag erledigt und entfernt: {lookup.item.title}")
+        if callable(report):
+            report(len(results), len(items), lookup.item.title)
+
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            if cancel_check and cancel_check():
+                break
+            finish(_lookup_or_not_found(item, args, serien_mode))
+    else:
+        logging.info(f"Wishlist: {len(items)} Einträge, {min(workers, len(items))} parallele Suchen")
+        _process_lookups_parallel(items, args, serien_mode, min(workers, len(items)), finish, cancel_check)
+    if cancel_check and cancel_check():
+        logging.info(f"Wishlist: Verarbeitung abgebrochen nach {len(results)} von {len(items)} Einträgen")
+
+    processed = len(results)
+    successes = sum(1 for ok, code in results.values() if ok and code == "success" and remove_on_success)
 
-    data["items"] = remaining
-    save_wishlist(path, data)
     if processed > 0:
         src = getattr(args, "activity_source", "cli")
         dd = getattr(args, "download_dir", None)
@@ -0,0 +1,326 @@
+"""
+Hintergrund-Jobs für lang laufende Wishlist-Aktionen im Web-UI (Prüfen, Verarbeiten, Probe, Download).
+
+Endpunkte legen einen Job an und antworten sofort mit dessen ID; eine begrenzte Zahl von
+Worker-Threads arbeitet die Warteschlange ab. ``Job.to_dict()`` liefert Status, Fortschritt und
+Ergebnis für ``GET /api/jobs/{id}``. Abbruch: wartende Jobs starten nicht mehr, laufende sehen
+``job.cancelled()`` (als ``cancel_check`` an Suche/Download durchgereicht) und enden an der
+nächsten Prüfstelle.
+
+Änderungen (Status, Fortschritt, Bytes/Durchsatz) werden an Abonnenten gemeldet;
+``JobManager.events`` liefert sie zusammengefasst als asynchronen Strom (SSE im Web-UI).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+JOB_WORKERS = 2
+JOB_QUEUE_MAX = 20
+JOB_KEEP_FINISHED = 100
+# Ereignisstrom: höchstens ein Schub pro Intervall und Abonnent; Lebenszeichen bei Stille
+JOB_EVENT_INTERVAL = 0.25
+JOB_EVENT_HEARTBEAT = 15.0
+# Durchsatz: Messfenster in Sekunden (geglättet)
+JOB_RATE_WINDOW = 1.0
+
+JOB_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+FINISHED_STATUSES = ("done", "failed", "cancelled")
+
+
+class JobQueueFull(RuntimeError):
+    """Zu viele wartende/laufende Jobs."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    label: str = ""
+    status: str = "queued"
+    progress: Optional[float] = None  # 0..1, None = unbestimmt
+    message: str = ""
+    result: Any = None
+    error: Optional[str] = None
+    created_at: str = field(default_factory=_now)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    bytes_done: Optional[int] = None
+    bytes_total: Optional[int] = None
+    rate: Optional[float] = None  # Bytes/s
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _finished: threading.Event = field(default_factory=threading.Event, repr=False)
+    _on_change: Optional[Callable[["Job"], None]] = field(default=None, repr=False)
+    _rate_sample: Optional[tuple] = field(default=None, repr=False)
+
+    def _changed(self) -> None:
+        if self._on_change is not None:
+            self._on_change(self)
+
+    def cancelled(self) -> bool:
+        """Abbruch angefordert (passt als ``cancel_check``)."""
+        return self._cancel.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def report(self, progress: Optional[float] = None, message: Optional[str] = None) -> None:
+        if progress is not None:
+            self.progress = max(0.0, min(1.0, float(progress)))
+        if message is not None:
+            self.message = message
+        self._changed()
+
+    def transfer(self, done: int, total: int = 0) -> None:
+        """Geladene Bytes (``total`` 0 = unbekannt); Durchsatz geglättet über ``JOB_RATE_WINDOW``."""
+        now = time.monotonic()
+        sample = self._rate_sample
+        if sample is None or done < sample[1]:
+            # Erster Wert oder neue Datei (z. B. nächste Episode)
+            self._rate_sample = (now, done)
+        elif now - sample[0] >= JOB_RATE_WINDOW:
+            current = (done - sample[1]) / (now - sample[0])
+            self.rate = current if self.rate is None else 0.5 * self.rate + 0.5 * current
+            self._rate_sample = (now, done)
+        self.bytes_done = done
+        self.bytes_total = total or None
+        self._changed()
+
+    def _finish(self, status: str) -> None:
+        self.status = status
+        self.finished_at = _now()
+        self._finished.set()
+        self._changed()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "label": self.label,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "cancel_requested": self.cancelled(),
+            "bytes_done": self.bytes_done,
+            "bytes_total": self.bytes_total,
+            "rate": round(self.rate) if self.rate is not None else None,
+        }
+
+
+class JobEventStream:
+    """
+    Ein Abonnent auf der asyncio-Seite. Worker-Threads rufen ``notify`` auf; pro Job wird nur der
+    jüngste Stand gehalten, der Event-Loop wird höchstens einmal bis zum nächsten Abholen geweckt.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, job_id: Optional[str] = None):
+        self.job_id = job_id
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[str, Job]" = OrderedDict()
+        self._woken = False
+        self._wake = asyncio.Event()
+
+    def notify(self, job: Job) -> None:
+        if self.job_id is not None and job.id != self.job_id:
+            return
+        with self._lock:
+            self._pending[job.id] = job
+            if self._woken:
+                return
+            self._woken = True
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # Event-Loop bereits beendet (Verbindung geschlossen)
+            pass
+
+    async def next_batch(self, timeout: float) -> List[Dict[str, Any]]:
+        """Jüngste Stände aller geänderten Jobs; leer, wenn bis ``timeout`` nichts kam."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._wake.clear()
+        with self._lock:
+            jobs = list(self._pending.values())
+            self._pending.clear()
+            self._woken = False
+        return [j.to_dict() for j in jobs]
+
+
+class JobManager:
+    """
+    Warteschlange mit ``workers`` Daemon-Threads (beenden den Prozess nicht blockierend).
+    Höchstens ``max_pending`` Jobs dürfen gleichzeitig wartend oder laufend sein; erledigte Jobs
+    bleiben (bis ``keep_finished``) abrufbar.
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_pending: int = JOB_QUEUE_MAX,
+        keep_finished: int = JOB_KEEP_FINISHED,
+    ):
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.keep_finished = max(1, int(keep_finished))
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._subscribers: List[Callable[[Job], None]] = []
+
+    def subscribe(self, callback: Callable[[Job], None]) -> Callable[[], None]:
+        """``callback(job)`` bei jeder Änderung (aus Worker-Threads); liefert die Abmeldung."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def _publish(self, job: Job) -> None:
+        for cb in list(self._subscribers):
+            try:
+                cb(job)
+            except Exception as e:
+                logging.debug(f"Job-Abonnent fehlgeschlagen: {e}")
+
+    async def events(
+        self,
+        job_id: Optional[str] = None,
+        interval: float = JOB_EVENT_INTERVAL,
+        heartbeat: float = JOB_EVENT_HEARTBEAT,
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Asynchroner Strom von Job-Ständen (``to_dict``), beginnend mit dem aktuellen Stand.
+        Änderungen werden gesammelt und höchstens alle ``interval`` Sekunden ausgeliefert;
+        ``None`` = Lebenszeichen nach ``heartbeat`` Sekunden Stille. Mit ``job_id`` endet der
+        Strom, sobald dieser Job abgeschlossen ist.
+        """
+        stream = JobEventStream(asyncio.get_running_loop(), job_id)
+        unsubscribe = self.subscribe(stream.notify)
+        try:
+            current = [self.get(job_id)] if job_id is not None else self.list()
+            for job in current:
+                if job is not None:
+                    yield job.to_dict()
+            if job_id is not None and (current[0] is None or current[0].finished):
+                return
+            while True:
+                batch = await stream.next_batch(heartbeat)
+                if not batch:
+                    yield None
+                    continue
+                for data in batch:
+                    yield data
+                if job_id is not None and any(d["status"] in FINISHED_STATUSES for d in batch):
+                    return
+                await asyncio.sleep(interval)
+        finally:
+            unsubscribe()
+
+    def _ensure_workers(self) -> None:
+        while len(self._threads) < self.workers:
+            t = threading.Thread(
+                target=self._worker, name=f"wishlist-job-{len(self._threads) + 1}", daemon=True
+            )
+            t.start()
+            self._threads.append(t)
+
+    def _worker(self) -> None:
+        while True:
+            job, fn = self._queue.get()
+            try:
+                # Übergang queued → running unter derselben Sperre wie ``cancel``
+                with self._lock:
+                    if job.status != "queued" or job.cancelled():
+                        continue
+                    job.status = "running"
+                    job.started_at = _now()
+                job._changed()
+                try:
+                    job.result = fn(job)
+                except Exception as e:
+                    logging.warning(f"Wishlist-Job {job.kind} ({job.id}) fehlgeschlagen: {e}", exc_info=True)
+                    job.error = str(e).strip() or type(e).__name__
+                    job._finish("failed")
+                else:
+                    if not job.cancelled():
+                        job.progress = 1.0
+                    job._finish("cancelled" if job.cancelled() else "done")
+            finally:
+                self._queue.task_done()
+                self._prune()
+
+    def _pending(self) -> int:
+        return sum(1 for j in self._jobs.values() if j.status in ("queued", "running"))
+
+    def _prune(self) -> None:
+        with self._lock:
+            done = [k for k, j in self._jobs.items() if j.status in FINISHED_STATUSES]
+            for k in done[: max(0, len(done) - self.keep_finished)]:
+                del self._jobs[k]
+
+    def submit(self, kind: str, fn: Callable[[Job], Any], label: str = "") -> Job:
+        """Reiht ``fn(job)`` ein; der Rückgabewert wird ``job.result``. JobQueueFull bei Überlast."""
+        with self._lock:
+            if self._pending() >= self.max_pending:
+                raise JobQueueFull(f"Zu viele laufende Jobs (max. {self.max_pending})")
+            job = Job(id=uuid.uuid4().hex, kind=kind, label=label, _on_change=self._publish)
+            self._jobs[job.id] = job
+            self._ensure_workers()
+        self._queue.put((job, fn))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Fordert den Abbruch an; wartende Jobs gelten sofort als abgebrochen."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status in FINISHED_STATUSES:
+                return job
+            job._cancel.set()
+            if job.status == "queued":
+                job._finish("cancelled")
+        return job
+
+
+def job_workers_from_env() -> int:
+    raw = (os.environ.get("WISHLIST_JOB_WORKERS") or "").strip()
+    return int(raw) if raw.isdigit() and int(raw) > 0 else JOB_WORKERS
@@ -0,0 +1,214 @@
+"""
+Wishlist gegen Mediathek-Neuzugänge abgleichen („Was ist neu?“).
+
+Statt pro Lauf jeden Eintrag einzeln zu suchen, werden die seit dem letzten Lauf neuen Sendungen
+von MediathekViewWeb (sortiert nach Zeitstempel, seitenweise) geladen und lokal gegen einen
+Index aller Wishlist-Titel samt ``mediathek_movie_search_terms``-Varianten abgeglichen. Nur
+Einträge mit plausiblem Kandidaten gehen in die genaue Suche (``search_mediathek``) und den
+Download. Einträge, die noch nie vollständig gesucht wurden, werden immer gesucht.
+
+Der Stand (Wasserzeichen + bereits gesuchte IDs) liegt neben der Wishlist in
+``<wishlist>.news.json``.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import requests
+
+from src import metrics
+from src import perlentaucher as core
+from src.wishlist_core import WishlistItem, list_items, process_wishlist_items
+from src.atomic_file import write_json_atomic
+
+NEWS_SUFFIX = ".news.json"
+NEWS_PAGE_SIZE = 200
+NEWS_MAX_PAGES = 25
+# Sendungen erscheinen teils erst nach ihrem Ausstrahlungszeitpunkt in der Filmliste
+NEWS_OVERLAP_SECONDS = 24 * 3600
+# Vorauswahl für die genaue Suche (Titel-Ähnlichkeit 0..1)
+NEWS_MIN_SIMILARITY = 0.6
+
+
+def news_path_for(wishlist_path: str) -> str:
+    return os.path.splitext(wishlist_path)[0] + NEWS_SUFFIX
+
+
+def load_news_state(wishlist_path: str) -> Dict[str, Any]:
+    """``{'since': <Unix-Zeit oder None>, 'searched': [IDs]}``; fehlend/defekt → Erstlauf."""
+    try:
+        with open(news_path_for(wishlist_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return {"since": data.get("since"), "searched": list(data.get("searched") or [])}
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logging.warning(f"Wishlist-Neuzugänge: Stand nicht lesbar ({e}) — vollständige Suche")
+    return {"since": None, "searched": []}
+
+
+def save_news_state(wishlist_path: str, since: Optional[int], searched: Iterable[str]) -> None:
+    write_json_atomic(
+        news_path_for(wishlist_path), {"since": since, "searched": sorted(set(searched))}, prefix=".wishlist-"
+    )
+
+
+def fetch_new_broadcasts(
+    since: int,
+    page_size: int = NEWS_PAGE_SIZE,
+    max_pages: int = NEWS_MAX_PAGES,
+) -> Optional[Tuple[List[Dict[str, Any]], int, bool]]:
+    """
+    Lädt MVW-Einträge absteigend nach Zeitstempel, bis ``since`` unterschritten ist.
+    Liefert (Einträge, neuester Zeitstempel, abgeschnitten) oder None bei API-Fehler (Wasserzeichen
+    bleibt dann stehen). ``abgeschnitten``: nach ``max_pages`` Seiten war ``since`` noch nicht erreicht.
+    """
+    results: List[Dict[str, Any]] = []
+    newest = since
+    truncated = False
+    for page in range(max_pages):
+        payload = {
+            "queries": [],
+            "sortBy": "timestamp",
+            "sortOrder": "desc",
+            "future": False,
+            "offset": page * page_size,
+            "size": page_size,
+        }
+        try:
+            with metrics.track_request("mvw", core.MVW_API_URL):
+                response = core._http().post(
+                    core.MVW_API_URL, json=payload, headers={"Content-Type": "application/json"}, timeout=10
+                )
+                response.raise_for_status()
+            batch = response.json().get("result", {}).get("results", [])
+        except (requests.RequestException, KeyError, ValueError, TypeError, AttributeError) as e:
+            logging.warning(f"Wishlist-Neuzugänge: MediathekViewWeb-Abfrage fehlgeschlagen: {e}")
+            return None
+        reached = False
+        for r in batch:
+            ts = int(r.get("timestamp") or 0)
+            if ts < since:
+                reached = True
+                break
+            newest = max(newest, ts)
+            results.append(r)
+        if reached or len(batch) < page_size:
+            break
+    else:
+        truncated = True
+        logging.warning(f"Wishlist-Neuzugänge: nach {max_pages} Seiten abgebrochen — ältere Neuzugänge fehlen")
+    return results, newest, truncated
+
+
+def _tokens(text: str) -> Set[str]:
+    norm = core.normalize_search_title(text or "").lower()
+    words = core.get_significant_words(norm)
+    return words or {w for w in norm.split() if w}
+
+
+class WishlistTitleIndex:
+    """
+    Vorberechneter Index der Wishlist-Titel: Suchvarianten je Eintrag und invertierter Index
+    Wort → Einträge, damit pro Sendung nur Einträge mit gemeinsamem Wort verglichen werden.
+    """
+
+    def __init__(self, items: Iterable[WishlistItem]):
+        self.items: Dict[str, WishlistItem] = {}
+        self.variants: Dict[str, List[str]] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        for item in items:
+            self.items[item.id] = item
+            variants = core.mediathek_movie_search_terms(item.title) or [item.title]
+            self.variants[item.id] = variants
+            for v in variants:
+                for tok in _tokens(v):
+                    self.postings.setdefault(tok, set()).add(item.id)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def match(self, result: Dict[str, Any], min_similarity: float = NEWS_MIN_SIMILARITY) -> Dict[str, float]:
+        """Einträge, zu denen die Sendung passt: ID → beste Titel-Ähnlichkeit."""
+        title = result.get("title") or ""
+        topic = result.get("topic") or ""
+        candidates: Set[str] = set()
+        for tok in _tokens(title) | _tokens(topic):
+            candidates |= self.postings.get(tok, set())
+        out: Dict[str, float] = {}
+        for item_id in candidates:
+            item = self.items[item_id]
+            fields = [title, topic] if item.kind == "series" else [title]
+            best = max(
+                core.calculate_title_similarity(v, f) for v in self.variants[item_id] for f in fields if f
+            )
+            if best >= min_similarity:
+                out[item_id] = best
+        return out
+
+    def match_all(
+        self, results: Iterable[Dict[str, Any]], min_similarity: float = NEWS_MIN_SIMILARITY
+    ) -> Dict[str, float]:
+        hits: Dict[str, float] = {}
+        for r in results:
+            for item_id, sim in self.match(r, min_similarity).items():
+                hits[item_id] = max(sim, hits.get(item_id, 0.0))
+        return hits
+
+
+def _process_all(
+    path: str, args: Any, items: List[WishlistItem], started: int, remove_on_success: bool
+) -> Tuple[int, int]:
+    """Ganze Wishlist verarbeiten; danach gilt jeder noch vorhandene Eintrag als gesucht."""
+    processed, successes = process_wishlist_items(path, args, remove_on_success=remove_on_success)
+    current = {it.id for it in list_items(path)}
+    save_news_state(path, started, [it.id for it in items if it.id in current])
+    return processed, successes
+
+
+def process_wishlist_news(path: str, args: Any, remove_on_success: bool = True) -> Tuple[int, int]:
+    """
+    Verarbeitet nur Einträge mit Kandidat unter den Neuzugängen seit dem letzten Lauf sowie
+    Einträge, die noch nie gesucht wurden. Ohne gespeicherten Stand (Erstlauf) oder wenn die
+    Neuzugänge nicht vollständig geladen werden konnten (zu viele Seiten), wird die ganze
+    Wishlist verarbeitet. Returns wie ``process_wishlist_items``.
+    """
+    items = list_items(path)
+    state = load_news_state(path)
+    since = state["since"]
+    searched = set(state["searched"])
+    started = int(time.time())
+
+    if since is None:
+        logging.info("Wishlist-Neuzugänge: kein gespeicherter Stand — vollständige Suche")
+        return _process_all(path, args, items, started, remove_on_success)
+
+    fetched = fetch_new_broadcasts(max(0, int(since) - NEWS_OVERLAP_SECONDS))
+    # API nicht erreichbar: nur neue Einträge suchen, Wasserzeichen bleibt stehen
+    broadcasts, newest, truncated = fetched if fetched is not None else ([], int(since), False)
+    if truncated:
+        # Nicht geladene Seiten würden mit dem neuen Wasserzeichen für immer übersprungen
+        logging.info("Wishlist-Neuzugänge: unvollständig geladen — vollständige Suche")
+        return _process_all(path, args, items, started, remove_on_success)
+    index = WishlistTitleIndex(it for it in items if it.id in searched)
+    hits = index.match_all(broadcasts)
+    fresh = [it.id for it in items if it.id not in searched]
+    todo = [it.id for it in items if it.id in hits or it.id not in searched]
+    logging.info(
+        f"Wishlist-Neuzugänge: {len(broadcasts)} neue Sendungen, {len(hits)} Kandidat(en), "
+        f"{len(fresh)} neue Einträge — {len(todo)} von {len(items)} werden gesucht"
+    )
+    processed, successes = (0, 0)
+    if todo:
+        # Kandidaten aus den Neuzugängen unabhängig vom Prüfplan suchen
+        processed, successes = process_wishlist_items(
+            path, args, remove_on_success=remove_on_success, item_ids=todo, force_all=True
+        )
+    current = {it.id for it in list_items(path)}
+    save_news_state(path, max(newest, int(since)), (searched | set(todo)) & current)
+    return processed, successes
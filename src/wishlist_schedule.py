@@ -0,0 +1,56 @@
+"""
+Adaptive Wiederholungsprüfung für Wishlist-Einträge.
+
+Pro Eintrag werden im Wishlist-Speicher ``last_checked``, ``misses`` (Fehlsuchen in Folge) und
+``next_check`` geführt. Nach jeder erfolglosen Suche verdoppelt sich der Abstand bis zur nächsten
+Suche (ab ``RECHECK_BASE_HOURS``, höchstens ``RECHECK_MAX_HOURS``); ein Treffer setzt ihn zurück.
+Neue Einträge und Einträge ohne ``next_check`` sind immer fällig.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from src.env_settings import env_int
+
+RECHECK_BASE_HOURS = 6
+RECHECK_MAX_HOURS = 7 * 24
+
+SCHEDULE_FIELDS = ("last_checked", "misses", "next_check")
+
+
+def recheck_delay(misses: int) -> timedelta:
+    """Abstand zur nächsten Suche nach ``misses`` Fehlsuchen in Folge (0 → sofort)."""
+    if misses <= 0:
+        return timedelta(0)
+    base = env_int("WISHLIST_RECHECK_BASE_HOURS", RECHECK_BASE_HOURS)
+    cap = env_int("WISHLIST_RECHECK_MAX_HOURS", RECHECK_MAX_HOURS)
+    # Exponent begrenzen, damit lange fehlende Titel nicht überlaufen
+    hours = min(base * (2 ** min(misses - 1, 32)), cap)
+    return timedelta(hours=hours)
+
+
+def _parse(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def is_due(item: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+    """True, wenn der Eintrag gesucht werden soll (kein oder abgelaufener ``next_check``)."""
+    due_at = _parse(item.get("next_check"))
+    return due_at is None or due_at <= (now or datetime.now())
+
+
+def record_check(item: Dict[str, Any], found: bool, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Neuer Eintrag mit fortgeschriebenen Planungsfeldern (Treffer setzt zurück)."""
+    now = now or datetime.now()
+    misses = 0 if found else int(item.get("misses") or 0) + 1
+    out = dict(item)
+    out["last_checked"] = now.isoformat(timespec="seconds")
+    out["misses"] = misses
+    out["next_check"] = (now + recheck_delay(misses)).isoformat(timespec="seconds") if misses else None
+    return out
@@ -0,0 +1,314 @@
+"""
+Speicher der Wishlist (Merkliste): austauschbare Repositories mit Einzel-Operationen.
+
+- ``JsonWishlistRepository``: bisherige ``.perlentaucher_wishlist.json`` (Standard); Änderungen
+  werden prozessweit serialisiert und atomar (Temp-Datei + ``os.replace``) geschrieben.
+- ``SqliteWishlistRepository``: eine Zeile pro Eintrag (Primärschlüssel = ID, Index auf ``kind``),
+  jede Änderung eine eigene Transaktion; parallele Web-Requests überschreiben sich nicht.
+
+Das Backend ergibt sich aus der Dateiendung (``.db``/``.sqlite``/``.sqlite3`` → SQLite). Beim ersten
+Öffnen einer SQLite-Datei wird eine gleichnamige ``.json`` einmalig übernommen. Einträge sind
+Dicts im JSON-Format (``id``, ``title``, ``year``, ``kind``, ``created_at``, ``note`` …).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from src import metrics, profiling
+from src.atomic_file import write_json_atomic
+from src.state_store import SQLITE_SUFFIXES
+
+WISHLIST_BACKENDS = ("json", "sqlite")
+WISHLIST_BASENAME = ".perlentaucher_wishlist"
+
+_repositories: Dict[str, "WishlistRepository"] = {}
+_repositories_lock = threading.Lock()
+
+
+def _empty() -> Dict[str, Any]:
+    return {"version": 1, "items": []}
+
+
+class WishlistRepository(ABC):
+    """Schnittstelle eines Wishlist-Speichers."""
+
+    name = "abstract"
+
+    def __init__(self, path: str):
+        self.path = path
+        # Schreibvorgänge dieses Prozesses (auch bei grober mtime-Auflösung eindeutig)
+        self.generation = 0
+
+    def _files(self) -> List[str]:
+        return [self.path]
+
+    def signature(self) -> tuple:
+        """Änderungskennung für Lese-Caches: Schreibzähler plus mtime/Größe/Inode der Dateien."""
+        stats = []
+        for p in self._files():
+            try:
+                st = os.stat(p)
+                stats.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                stats.append(None)
+        return (self.generation, tuple(stats))
+
+    def load(self) -> Dict[str, Any]:
+        """Gesamter Stand im JSON-Format ``{'version': 1, 'items': [...]}``."""
+        return {"version": 1, "items": self.list()}
+
+    @abstractmethod
+    def list(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        ...
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        for item in self.list():
+            if item.get("id") == item_id:
+                return item
+        return None
+
+    @abstractmethod
+    def add(self, item: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def update(self, item: Dict[str, Any]) -> bool:
+        """Ersetzt den Eintrag mit gleicher ID; False, wenn es ihn nicht (mehr) gibt."""
+
+    @abstractmethod
+    def remove(self, item_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def replace_all(self, items: List[Dict[str, Any]]) -> None:
+        ...
+
+    def export_json(self, target_path: str) -> int:
+        """Exportiert im Format der Wishlist-JSON; liefert die Anzahl der Einträge."""
+        items = self.list()
+        write_json_atomic(target_path, {"version": 1, "items": items}, prefix=".wishlist-")
+        return len(items)
+
+    def import_json(self, source_path: str) -> int:
+        """Übernimmt Einträge aus einer Wishlist-JSON, deren ID noch fehlt; liefert deren Anzahl."""
+        known = {x.get("id") for x in self.list()}
+        added = 0
+        for item in JsonWishlistRepository(source_path).list():
+            if item.get("id") and item["id"] not in known:
+                self.add(item)
+                known.add(item["id"])
+                added += 1
+        return added
+
+
+class JsonWishlistRepository(WishlistRepository):
+    """Bisheriges Format; jede Änderung liest und schreibt die Datei unter einer Sperre."""
+
+    name = "json"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._lock = threading.RLock()
+
+    def load(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            return _empty()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or "items" not in data:
+                data = _empty()
+            return data
+        except (json.JSONDecodeError, OSError) as e:
+            logging.warning(f"Wishlist konnte nicht geladen werden ({self.path}): {e}")
+            return _empty()
+
+    def save(self, data: Dict[str, Any]) -> None:
+        with self._lock, metrics.STORE_WRITE_DURATION.time(store="wishlist"), profiling.stage("store.wishlist"):
+            write_json_atomic(self.path, data, prefix=".wishlist-")
+            self.generation += 1
+
+    def list(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        items = self.load().get("items", [])
+        return [x for x in items if kind is None or x.get("kind", "movie") == kind]
+
+    @contextmanager
+    def _modify(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            data = self.load()
+            data.setdefault("items", [])
+            yield data
+            self.save(data)
+
+    def add(self, item: Dict[str, Any]) -> None:
+        with self._modify() as data:
+            data["items"].append(dict(item))
+
+    def update(self, item: Dict[str, Any]) -> bool:
+        with self._lock:
+            data = self.load()
+            items = data.get("items", [])
+            for i, x in enumerate(items):
+                if x.get("id") == item.get("id"):
+                    items[i] = dict(item)
+                    self.save(data)
+                    return True
+            return False
+
+    def remove(self, item_id: str) -> bool:
+        with self._lock:
+            data = self.load()
+            items = data.get("items", [])
+            new_items = [x for x in items if x.get("id") != item_id]
+            if len(new_items) == len(items):
+                return False
+            data["items"] = new_items
+            self.save(data)
+            return True
+
+    def replace_all(self, items: List[Dict[str, Any]]) -> None:
+        with self._modify() as data:
+            data["items"] = [dict(x) for x in items]
+
+
+class SqliteWishlistRepository(WishlistRepository):
+    """
+    SQLite: eine Zeile pro Eintrag, Reihenfolge nach Einfügen (``seq``), Index auf ``kind``.
+    Verbindungen pro Operation, WAL und ``busy_timeout`` wie beim State-Backend.
+    """
+
+    name = "sqlite"
+    BUSY_TIMEOUT_MS = 10000
+
+    def __init__(self, path: str, migrate_from: Optional[str] = None):
+        super().__init__(path)
+        parent = os.path.dirname(os.path.abspath(path))
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        is_new = not os.path.exists(path)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, kind TEXT NOT NULL, "
+                "title TEXT NOT NULL, year INTEGER, created_at TEXT, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_items_kind ON items(kind, seq)")
+        if is_new and migrate_from and os.path.exists(migrate_from):
+            n = self.import_json(migrate_from)
+            logging.info(f"Wishlist: {n} Einträge aus {migrate_from} nach {path} übernommen")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT_MS / 1000)
+        try:
+            conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        try:
+            with metrics.STORE_WRITE_DURATION.time(store="wishlist"), profiling.stage("store.wishlist"):
+                with self._connect() as conn:
+                    yield conn
+        finally:
+            self.generation += 1
+
+    def _files(self) -> List[str]:
+        # Im WAL-Modus landen Änderungen bis zum Checkpoint in ``-wal``
+        return [self.path, self.path + "-wal"]
+
+    @staticmethod
+    def _row(item: Dict[str, Any]) -> tuple:
+        return (
+            str(item["id"]),
+            str(item.get("kind") or "movie"),
+            str(item.get("title") or ""),
+            item.get("year"),
+            item.get("created_at"),
+            json.dumps(item, ensure_ascii=False),
+        )
+
+    def list(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            if kind is None:
+                rows = conn.execute("SELECT data FROM items ORDER BY seq").fetchall()
+            else:
+                rows = conn.execute("SELECT data FROM items WHERE kind = ? ORDER BY seq", (kind,)).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM items WHERE id = ?", (item_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add(self, item: Dict[str, Any]) -> None:
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO items(id, kind, title, year, created_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+                self._row(item),
+            )
+
+    def update(self, item: Dict[str, Any]) -> bool:
+        row = self._row(item)
+        with self._write() as conn:
+            cur = conn.execute(
+                "UPDATE items SET kind = ?, title = ?, year = ?, created_at = ?, data = ? WHERE id = ?",
+                row[1:] + (row[0],),
+            )
+            return cur.rowcount > 0
+
+    def remove(self, item_id: str) -> bool:
+        with self._write() as conn:
+            return conn.execute("DELETE FROM items WHERE id = ?", (item_id,)).rowcount > 0
+
+    def replace_all(self, items: List[Dict[str, Any]]) -> None:
+        with self._write() as conn:
+            conn.execute("DELETE FROM items")
+            conn.executemany(
+                "INSERT INTO items(id, kind, title, year, created_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+                [self._row(x) for x in items],
+            )
+
+
+def backend_name_for_path(path: str) -> str:
+    """``sqlite`` für ``.db``/``.sqlite``/``.sqlite3``, sonst ``json``."""
+    return "sqlite" if path.lower().endswith(SQLITE_SUFFIXES) else "json"
+
+
+def wishlist_path_for_backend(path: str, backend: Optional[str]) -> str:
+    """
+    Passt den Pfad an das gewünschte Backend an (``.json`` ↔ ``.sqlite3``); ohne Backend bleibt er
+    unverändert. Unbekannte Backends lösen ValueError aus.
+    """
+    if not backend or backend_name_for_path(path) == backend:
+        return path
+    if backend not in WISHLIST_BACKENDS:
+        raise ValueError(f"Unbekanntes Wishlist-Backend '{backend}' (erlaubt: {', '.join(WISHLIST_BACKENDS)})")
+    stem, _ext = os.path.splitext(path)
+    return stem + (".sqlite3" if backend == "sqlite" else ".json")
+
+
+def get_wishlist_repository(path: str) -> WishlistRepository:
+    """Repository für ``path`` (pro Pfad wiederverwendet); SQLite übernimmt eine gleichnamige JSON."""
+    key = os.path.abspath(path)
+    with _repositories_lock:
+        repo = _repositories.get(key)
+        if repo is not None and (repo.name == "json" or os.path.exists(path)):
+            return repo
+        if backend_name_for_path(path) == "sqlite":
+            repo = SqliteWishlistRepository(path, migrate_from=os.path.splitext(path)[0] + ".json")
+        else:
+            repo = JsonWishlistRepository(path)
+        _repositories[key] = repo
+        return repo
@@ -4,12 +4,20 @@ Wishlist-Web-UI (FastAPI): CRUD + Verarbeitung für Headless/Konsolen-Nutzung.
 from __future__ import annotations
 
 import argparse
+import asyncio
+import copy
+import gzip
+import hashlib
 import html
+import json
 import logging
 import os
 import subprocess
 import sys
-from typing import Any, Optional
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Hashable, Optional
 
 try:
     from pydantic import BaseModel
@@ -18,22 +26,32 @@ except ImportError:
 
 try:
     from fastapi import FastAPI, HTTPException, Request
-    from fastapi.responses import FileResponse, HTMLResponse
+    from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response, StreamingResponse
     from fastapi.staticfiles import StaticFiles
+    from starlette.concurrency import run_in_threadpool
     import uvicorn
 except ImportError:
     FastAPI = None  # type: ignore
     FileResponse = None  # type: ignore
+    JSONResponse = None  # type: ignore
+    Response = None  # type: ignore
+    StreamingResponse = None  # type: ignore
     StaticFiles = None  # type: ignore
 
+from src import metrics
+from src.perlentaucher import parse_quality_policy
+from src.state_store import STATE_BACKENDS, state_path_for_backend
+from src.wishlist_store import wishlist_path_for_backend
 from src.wishlist_activity import (
-    append_activity,
+    activity_signature,
     clear_activity,
-    query_activity,
+    query_activity_page,
     resolve_activity_path,
+    submit_activity,
     summarize_probe_for_log,
 )
 from src.wishlist_core import (
+    WISHLIST_WORKERS_DEFAULT,
     WishlistItem,
     WishlistKind,
     add_item,
@@ -44,7 +62,10 @@ from src.wishlist_core import (
     process_wishlist_items,
     probe_wishlist_item,
     remove_item,
+    wishlist_signature,
 )
+from src.wishlist_cache import SignatureCache
+from src.wishlist_jobs import Job, JobManager, JobQueueFull, job_workers_from_env
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +73,74 @@ logger = logging.getLogger(__name__)
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ASSETS_DIR = os.path.join(_PROJECT_ROOT, "assets")
 
+# ``?wait=1``: Abfrageintervall, bis ein Job fertig ist
+JOB_WAIT_POLL_SECONDS = 0.05
+
+# GET-Antworten (Wishlist, Verlauf): gzip erst ab dieser Größe
+GZIP_MIN_BYTES = 1024
+
+
+class _CachedJson:
+    """Fertig serialisierte JSON-Antwort mit ETag (Inhalts-Hash), Last-Modified und gzip-Variante."""
+
+    __slots__ = ("raw", "etag", "last_modified", "_gz")
+
+    def __init__(self, payload: Any, previous: Optional["_CachedJson"] = None):
+        self.raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = 'W/"' + hashlib.sha1(self.raw).hexdigest()[:20] + '"'
+        if previous is not None and previous.etag == self.etag:
+            self.last_modified = previous.last_modified
+        else:
+            # Ganze Sekunden (HTTP-Datum), bei Änderungen streng steigend
+            now = int(time.time())
+            self.last_modified = max(now, previous.last_modified + 1) if previous is not None else now
+        self._gz: Optional[bytes] = None
+
+    def gzipped(self) -> bytes:
+        if self._gz is None:
+            self._gz = gzip.compress(self.raw, compresslevel=6)
+        return self._gz
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match: schwacher Vergleich (``W/`` wird ignoriert), ``*`` passt immer."""
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == bare:
+            return True
+    return False
+
+
+def _not_modified(request: "Request", body: _CachedJson) -> bool:
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        return _etag_matches(inm, body.etag)
+    ims = request.headers.get("if-modified-since")
+    if not ims:
+        return False
+    try:
+        return parsedate_to_datetime(ims).timestamp() >= body.last_modified
+    except (TypeError, ValueError):
+        return False
+
+
+def _cached_json_response(request: "Request", body: _CachedJson) -> "Response":
+    """200 (gzip, falls erlaubt und groß genug) oder 304 bei passender Bedingung."""
+    headers = {
+        "ETag": body.etag,
+        "Last-Modified": formatdate(body.last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if _not_modified(request, body):
+        return Response(status_code=304, headers=headers)
+    content = body.raw
+    if len(content) >= GZIP_MIN_BYTES and "gzip" in (request.headers.get("accept-encoding") or "").lower():
+        content = body.gzipped()
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=content, media_type="application/json", headers=headers)
+
 if BaseModel is not None:
 
     class WishlistItemIn(BaseModel):
@@ -80,9 +169,24 @@ def build_process_args_from_env(download_dir: Optional[str] = None) -> Any:
     a.serien_dir = os.environ.get("SERIEN_DIR")
     a.no_state = os.environ.get("NO_STATE", "").lower() in ("1", "true", "yes")
     a.state_file = os.environ.get("STATE_FILE", ".perlentaucher_state.json")
+    backend = (os.environ.get("STATE_BACKEND") or "").strip().lower() or None
+    if backend in STATE_BACKENDS:
+        a.state_file = state_path_for_backend(a.state_file, backend)
     a.activity_source = "web"
     ff = os.environ.get("FFMPEG_PATH")
     a.ffmpeg_path = ff.strip() if ff and ff.strip() else None
+    for attr, env_name in (("qualitaet", "QUALITAET"), ("serien_qualitaet", "SERIEN_QUALITAET")):
+        q = (os.environ.get(env_name) or "").strip().lower() or None
+        try:
+            parse_quality_policy(q)
+        except ValueError as e:
+            logger.warning(f"{env_name}: {e} — Standard wird verwendet")
+            q = None
+        setattr(a, attr, q)
+    hmh = (os.environ.get("HLS_MAX_HEIGHT") or "").strip()
+    a.hls_max_height = int(hmh) if hmh.isdigit() and int(hmh) > 0 else None
+    ww = (os.environ.get("WISHLIST_WORKERS") or "").strip()
+    a.wishlist_workers = int(ww) if ww.isdigit() and int(ww) > 0 else WISHLIST_WORKERS_DEFAULT
     return a
 
 
@@ -296,6 +400,43 @@ INDEX_HTML = """<!DOCTYPE html>
 
   <script>
     const api = (path, opt) => fetch(path, opt).then(r => { if (!r.ok) throw new Error(r.statusText); return r.json(); });
+    // Lange Aktionen laufen als Hintergrund-Job: Fortschritt per Server-Sent Events bis zum Ende
+    function jobText(j) {
+      let t = j.message || j.label || 'Läuft …';
+      if (j.progress != null) t += ' (' + Math.round(j.progress * 100) + ' %)';
+      if (j.rate) t += ' · ' + (j.rate / 1048576).toFixed(1) + ' MB/s';
+      return t;
+    }
+    function jobOutcome(j, resolve, reject) {
+      if (j.status === 'done') { resolve(j.result); return true; }
+      if (j.status === 'failed') { reject(new Error(j.error || 'Job fehlgeschlagen')); return true; }
+      if (j.status === 'cancelled') { reject(new Error('Job abgebrochen')); return true; }
+      if (j.status === 'running') show(jobText(j), 'loading');
+      return false;
+    }
+    async function pollJob(id) {
+      for (;;) {
+        const j = await api('/api/jobs/' + encodeURIComponent(id));
+        const r = await new Promise(function(res, rej) {
+          if (!jobOutcome(j, function(v) { res({ v: v }); }, rej)) setTimeout(function() { res(null); }, 1000);
+        });
+        if (r) return r.v;
+      }
+    }
+    function waitJob(id) {
+      if (!window.EventSource) return pollJob(id);
+      return new Promise(function(resolve, reject) {
+        const es = new EventSource('/api/jobs/' + encodeURIComponent(id) + '/events' + location.search);
+        es.addEventListener('job', function(ev) {
+          if (jobOutcome(JSON.parse(ev.data), resolve, reject)) es.close();
+        });
+        es.onerror = function() {
+          es.close();
+          pollJob(id).then(resolve, reject);
+        };
+      });
+    }
+    const runJob = (path, opt) => api(path, opt).then(r => waitJob(r.job_id));
     function show(m, err) {
       const el = document.getElementById('msg');
       el.style.display = 'block';
@@ -331,7 +472,7 @@ INDEX_HTML = """<!DOCTYPE html>
       const m = { info: 'lvl-info', success: 'lvl-success', warning: 'lvl-warning', error: 'lvl-error' };
       return m[lvl] || 'lvl-info';
     }
-    const histState = { limit: 20, offset: 0, level: '', action: '', q: '' };
+    const histState = { limit: 20, offset: 0, level: '', action: '', q: '', cursors: [null], nextCursor: null };
     let histEverOpened = false;
     function syncHistFiltersFromDom() {
       const lv = document.getElementById('histFilterLevel');
@@ -363,22 +504,28 @@ INDEX_HTML = """<!DOCTYPE html>
       const next = document.getElementById('histNext');
       const info = document.getElementById('histPageInfo');
       if (prev) prev.disabled = off <= 0;
-      if (next) next.disabled = tot === 0 || off + lim >= tot;
+      if (next) next.disabled = !histState.nextCursor;
       if (info) {
         if (tot === 0) info.textContent = 'Keine Einträge (mit aktuellem Filter).';
         else info.textContent = 'Seite ' + cur + ' von ' + pages + ' · Zeilen ' + (off + 1) + '–' + Math.min(off + lim, tot) + ' von ' + tot;
       }
     }
     async function loadHistoryPage(resetOffset) {
-      if (resetOffset) histState.offset = 0;
+      if (resetOffset) { histState.offset = 0; histState.cursors = [null]; }
+      // Keyset-Paginierung: Cursor der aktuellen Seite (null = neueste Einträge)
+      const pageIdx = Math.floor(histState.offset / histState.limit);
+      const cursor = histState.cursors[pageIdx] || null;
       const params = new URLSearchParams();
       params.set('limit', String(histState.limit));
-      params.set('offset', String(histState.offset));
+      if (cursor) params.set('cursor', cursor);
       if (histState.level) params.set('level', histState.level);
       if (histState.action) params.set('action', histState.action);
       if (histState.q) params.set('q', histState.q);
       const data = await api('/api/history?' + params.toString());
       const total = typeof data.total === 'number' ? data.total : 0;
+      histState.nextCursor = data.next_cursor || null;
+      histState.cursors.length = pageIdx + 1;
+      if (histState.nextCursor) histState.cursors.push(histState.nextCursor);
       renderHistoryRows(data.entries || []);
       const hint = document.getElementById('hist-total-hint');
       if (hint) {
@@ -422,7 +569,7 @@ INDEX_HTML = """<!DOCTYPE html>
           return;
         }
         try {
-          const r = await api('/api/items/' + encodeURIComponent(item.id) + '/download', {
+          const r = await runJob('/api/items/' + encodeURIComponent(item.id) + '/download', {
             method: 'POST', headers: {'Content-Type':'application/json'},
             body: JSON.stringify({ candidate_index: 0, force_staffel: true })
           });
@@ -464,7 +611,7 @@ INDEX_HTML = """<!DOCTYPE html>
       btnDl.onclick = async function() {
         const idx = parseInt(sel.value, 10) || 0;
         try {
-          const r = await api('/api/items/' + encodeURIComponent(item.id) + '/download', {
+          const r = await runJob('/api/items/' + encodeURIComponent(item.id) + '/download', {
             method: 'POST', headers: {'Content-Type':'application/json'},
             body: JSON.stringify({ candidate_index: idx })
           });
@@ -493,7 +640,8 @@ INDEX_HTML = """<!DOCTYPE html>
       try {
         const r = await api('/api/items', { method: 'POST', headers: {'Content-Type':'application/json'}, body: JSON.stringify(body) });
         e.target.reset();
-        await offerDownloadAfterProbe(r.item, r.probe);
+        loadRows();
+        await offerDownloadAfterProbe(r.item, await waitJob(r.job_id));
       } catch (err) {
         show(String(err), true);
       }
@@ -506,7 +654,7 @@ INDEX_HTML = """<!DOCTYPE html>
       btn.disabled = true;
       show('Mediathek wird geprüft … Bitte warten.', 'loading');
       try {
-        const r = await api('/api/check', { method: 'POST' });
+        const r = await runJob('/api/check', { method: 'POST' });
         const total = typeof r.total === 'number' ? r.total : (r.available || []).length;
         const list = r.available || [];
         const n = list.length;
@@ -533,8 +681,9 @@ INDEX_HTML = """<!DOCTYPE html>
       }
     };
     document.getElementById('process').onclick = async () => {
+      show('Wishlist wird verarbeitet …', 'loading');
       try {
-        const r = await api('/api/process', { method: 'POST' });
+        const r = await runJob('/api/process', { method: 'POST' });
         show('Verarbeitet: ' + r.processed + ', erfolgreich: ' + r.successes);
         loadRows();
         refreshHistoryIfOpen();
@@ -623,6 +772,34 @@ def create_app(
             return
         raise HTTPException(status_code=401, detail="Unauthorized")
 
+    jobs = JobManager(workers=job_workers_from_env())
+    app.state.jobs = jobs
+
+    def _submit(kind: str, fn, label: str) -> Job:
+        try:
+            return jobs.submit(kind, fn, label)
+        except JobQueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e))
+
+    def _wants_wait(request: Request) -> bool:
+        return (request.query_params.get("wait") or "").strip().lower() in ("1", "true", "yes", "on")
+
+    async def _job_result(job: Job) -> Any:
+        """Wartet (ohne den Event-Loop zu blockieren) auf das Job-Ende; Fehler als HTTP-Status."""
+        while not job.finished:
+            await asyncio.sleep(JOB_WAIT_POLL_SECONDS)
+        if job.status == "failed":
+            raise HTTPException(status_code=500, detail=job.error or "job failed")
+        if job.status == "cancelled":
+            raise HTTPException(status_code=409, detail="job cancelled")
+        return job.result
+
+    async def _respond(request: Request, job: Job):
+        """``?wait=1``: Ergebnis wie früher synchron; sonst 202 mit Job-ID (Status über /api/jobs/{id})."""
+        if _wants_wait(request):
+            return await _job_result(job)
+        return JSONResponse({"job_id": job.id, "status": job.status}, status_code=202)
+
     @app.get("/", response_class=HTMLResponse)
     async def index():
         return HTMLResponse(_index_html)
@@ -634,11 +811,23 @@ def create_app(
             return FileResponse(ico, media_type="image/x-icon")
         raise HTTPException(status_code=404, detail="favicon not found")
 
+    read_cache = SignatureCache(name="web_read")
+    app.state.read_cache = read_cache
+
+    def _cached(key: Hashable, signature: Any, load: Callable[[], Any]) -> _CachedJson:
+        return read_cache.get_or_load(key, signature, lambda prev: _CachedJson(load(), prev))
+
     @app.get("/api/items")
     async def get_items(request: Request):
         _auth(request)
-        items = [i.to_dict() for i in list_items(wishlist_path)]
-        return {"items": items}
+        body = await run_in_threadpool(
+            lambda: _cached(
+                "items",
+                wishlist_signature(wishlist_path),
+                lambda: {"items": [i.to_dict() for i in list_items(wishlist_path)]},
+            )
+        )
+        return _cached_json_response(request, body)
 
     @app.post("/api/items")
     async def post_item(request: Request, body: WishlistItemIn):
@@ -647,26 +836,44 @@ def create_app(
         if not title:
             raise HTTPException(400, "title required")
         kind: WishlistKind = "series" if body.kind == "series" else "movie"
-        item = add_item(wishlist_path, title, body.year, kind, note=body.note.strip())
+        item = await run_in_threadpool(add_item, wishlist_path, title, body.year, kind, note=body.note.strip())
         args = process_args_factory()
+
+        def run(job: Job) -> dict:
+            job.report(message="Mediathek wird geprüft …")
+            try:
+                probe = probe_wishlist_item(
+                    item,
+                    sprache=getattr(args, "sprache", "deutsch"),
+                    audiodeskription=getattr(args, "audiodeskription", "egal"),
+                    serien_download=getattr(args, "serien_download", "erste"),
+                    tmdb_api_key=getattr(args, "tmdb_api_key", None),
+                    omdb_api_key=getattr(args, "omdb_api_key", None),
+                    qualitaet=getattr(args, "qualitaet", None),
+                    serien_qualitaet=getattr(args, "serien_qualitaet", None),
+                )
+            except Exception as ex:
+                logger.warning("probe_wishlist_item nach add_item fehlgeschlagen: %s", ex, exc_info=True)
+                msg = str(ex).strip() or type(ex).__name__
+                if len(msg) > 300:
+                    msg = msg[:297] + "…"
+                probe = {"status": "probe_error", "message": msg}
+            summ, lvl = summarize_probe_for_log(probe)
+            submit_activity(_hist, "hinzufuegen", item.title, summ, lvl, "web")
+            return probe
+
         try:
-            probe = probe_wishlist_item(
-                item,
-                sprache=getattr(args, "sprache", "deutsch"),
-                audiodeskription=getattr(args, "audiodeskription", "egal"),
-                serien_download=getattr(args, "serien_download", "erste"),
-                tmdb_api_key=getattr(args, "tmdb_api_key", None),
-                omdb_api_key=getattr(args, "omdb_api_key", None),
-            )
-        except Exception as ex:
-            logger.warning("probe_wishlist_item nach add_item fehlgeschlagen: %s", ex, exc_info=True)
-            msg = str(ex).strip() or type(ex).__name__
-            if len(msg) > 300:
-                msg = msg[:297] + "…"
-            probe = {"status": "probe_error", "message": msg}
-        summ, lvl = summarize_probe_for_log(probe)
-        append_activity(_hist, "hinzufuegen", item.title, summ, lvl, "web")
-        return {"item": item.to_dict(), "probe": probe}
+            job = jobs.submit("probe", run, item.title)
+        except JobQueueFull as e:
+            # Ohne Prüf-Job nicht speichern — sonst legt ein erneuter Versuch nach 429 ein Duplikat an
+            await run_in_threadpool(remove_item, wishlist_path, item.id)
+            raise HTTPException(status_code=429, detail=str(e))
+        if _wants_wait(request):
+            probe = await _job_result(job)
+            return {"item": item.to_dict(), "probe": probe}
+        return JSONResponse(
+            {"item": item.to_dict(), "job_id": job.id, "status": job.status}, status_code=202
+        )
 
     @app.post("/api/items/{item_id}/download")
     async def download_one(request: Request, item_id: str):
@@ -678,64 +885,144 @@ def create_app(
         ci = int(data.get("candidate_index", 0))
         force_staffel = bool(data.get("force_staffel"))
         args = process_args_factory()
-        wl_items = list_items(wishlist_path)
+        wl_items = await run_in_threadpool(list_items, wishlist_path)
         title_dl = next((i.title for i in wl_items if i.id == item_id), item_id)
         serien_override = "staffel" if force_staffel else None
-        ok, code = process_one_wishlist_item(
-            wishlist_path,
-            item_id,
-            args,
-            candidate_index=ci,
-            remove_on_success=True,
-            serien_download_override=serien_override,
-        )
-        return {"ok": ok, "code": code}
+
+        def run(job: Job) -> dict:
+            args.cancel_check = job.cancelled
+            args.progress_callback = lambda pct, msg: job.report(pct / 100.0, msg)
+            args.bytes_callback = job.transfer
+            ok, code = process_one_wishlist_item(
+                wishlist_path,
+                item_id,
+                args,
+                candidate_index=ci,
+                remove_on_success=True,
+                serien_download_override=serien_override,
+            )
+            return {"ok": ok, "code": code}
+
+        return await _respond(request, _submit("download", run, title_dl))
 
     @app.delete("/api/items/{item_id}")
     async def del_item(request: Request, item_id: str):
         _auth(request)
-        wl_items = list_items(wishlist_path)
+        wl_items = await run_in_threadpool(list_items, wishlist_path)
         title_rm = next((i.title for i in wl_items if i.id == item_id), None)
         if title_rm is None:
             raise HTTPException(404, "not found")
-        if not remove_item(wishlist_path, item_id):
+        if not await run_in_threadpool(remove_item, wishlist_path, item_id):
             raise HTTPException(404, "not found")
-        append_activity(_hist, "entfernen", title_rm, "Manuell aus der Liste entfernt", "info", "web")
+        submit_activity(_hist, "entfernen", title_rm, "Manuell aus der Liste entfernt", "info", "web")
         return {"ok": True}
 
     @app.post("/api/check")
     async def check(request: Request):
         _auth(request)
         args = process_args_factory()
-        avail, total = check_wishlist_availability(
-            wishlist_path,
-            sprache=getattr(args, "sprache", "deutsch"),
-            audiodeskription=getattr(args, "audiodeskription", "egal"),
-            serien_download=getattr(args, "serien_download", "erste"),
-            tmdb_api_key=getattr(args, "tmdb_api_key", None),
-            omdb_api_key=getattr(args, "omdb_api_key", None),
-        )
-        n = len(avail)
-        detail = f"{n} von {total} Titel(n) auffindbar"
-        if n and n <= 5:
-            detail += ": " + ", ".join(x.title for x in avail)
-        elif n > 5:
-            detail += ": " + ", ".join(x.title for x in avail[:3]) + ", …"
-        append_activity(_hist, "pruefen", f"Wishlist ({total} Einträge)", detail, "info", "web")
-        return {
-            "total": total,
-            "available_count": n,
-            "available": [a.to_dict() for a in avail],
-        }
+
+        def run(job: Job) -> dict:
+            avail, total = check_wishlist_availability(
+                wishlist_path,
+                sprache=getattr(args, "sprache", "deutsch"),
+                audiodeskription=getattr(args, "audiodeskription", "egal"),
+                serien_download=getattr(args, "serien_download", "erste"),
+                tmdb_api_key=getattr(args, "tmdb_api_key", None),
+                omdb_api_key=getattr(args, "omdb_api_key", None),
+                qualitaet=getattr(args, "qualitaet", None),
+                serien_qualitaet=getattr(args, "serien_qualitaet", None),
+                progress=lambda done, n, title: job.report(done / n, f"{done}/{n}: {title}"),
+                cancel_check=job.cancelled,
+                force_all=True,
+            )
+            n = len(avail)
+            detail = f"{n} von {total} Titel(n) auffindbar"
+            if n and n <= 5:
+                detail += ": " + ", ".join(x.title for x in avail)
+            elif n > 5:
+                detail += ": " + ", ".join(x.title for x in avail[:3]) + ", …"
+            submit_activity(_hist, "pruefen", f"Wishlist ({total} Einträge)", detail, "info", "web")
+            return {
+                "total": total,
+                "available_count": n,
+                "available": [a.to_dict() for a in avail],
+            }
+
+        return await _respond(request, _submit("check", run, "Wishlist prüfen"))
 
     @app.post("/api/process")
     async def process(request: Request):
         _auth(request)
         args = process_args_factory()
-        processed, successes = process_wishlist_items(wishlist_path, args, remove_on_success=True)
-        if processed == 0:
-            append_activity(_hist, "verarbeiten", "Wishlist leer oder keine Aktion", "", "info", "web")
-        return {"processed": processed, "successes": successes}
+
+        def run(job: Job) -> dict:
+            args.cancel_check = job.cancelled
+            args.wishlist_progress = lambda done, n, title: job.report(done / n, f"{done}/{n}: {title}")
+            args.bytes_callback = job.transfer
+            processed, successes = process_wishlist_items(wishlist_path, args, remove_on_success=True)
+            if processed == 0:
+                submit_activity(_hist, "verarbeiten", "Wishlist leer oder keine Aktion", "", "info", "web")
+            return {"processed": processed, "successes": successes}
+
+        return await _respond(request, _submit("process", run, "Wishlist verarbeiten"))
+
+    @app.get("/api/jobs")
+    async def get_jobs(request: Request):
+        _auth(request)
+        return {"jobs": [j.to_dict() for j in reversed(jobs.list())]}
+
+    @app.get("/api/jobs/{job_id}")
+    async def get_job(request: Request, job_id: str):
+        _auth(request)
+        job = jobs.get(job_id)
+        if job is None:
+            raise HTTPException(404, "job not found")
+        return job.to_dict()
+
+    async def _sse(request: Request, job_id: Optional[str] = None):
+        async for data in jobs.events(job_id):
+            if data is None:
+                if await request.is_disconnected():
+                    return
+                yield ": ping\n\n"
+            else:
+                yield f"event: job\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    def _sse_response(request: Request, job_id: Optional[str] = None):
+        return StreamingResponse(
+            _sse(request, job_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.get("/api/jobs/{job_id}/events")
+    async def job_events(request: Request, job_id: str):
+        """Server-Sent Events: Fortschritt eines Jobs bis zu dessen Ende."""
+        _auth(request)
+        if jobs.get(job_id) is None:
+            raise HTTPException(404, "job not found")
+        return _sse_response(request, job_id)
+
+    @app.get("/api/events")
+    async def all_job_events(request: Request):
+        """Server-Sent Events: Änderungen aller Jobs (offen bis zum Verbindungsende)."""
+        _auth(request)
+        return _sse_response(request)
+
+    @app.delete("/api/jobs/{job_id}")
+    async def cancel_job(request: Request, job_id: str):
+        _auth(request)
+        job = jobs.cancel(job_id)
+        if job is None:
+            raise HTTPException(404, "job not found")
+        return job.to_dict()
+
+    @app.get("/metrics")
+    async def get_metrics(request: Request):
+        """Prometheus-Metriken des Prozesses (Suchen, HTTP-Latenzen, Downloads, Caches …)."""
+        _auth(request)
+        return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
     @app.get("/api/history")
     async def get_history(
@@ -744,23 +1031,43 @@ def create_app(
         offset: int = 0,
         level: Optional[str] = None,
         action: Optional[str] = None,
+        source: Optional[str] = None,
         q: Optional[str] = None,
+        cursor: Optional[str] = None,
     ):
         _auth(request)
-        entries, total = query_activity(
-            _hist,
-            limit=limit,
-            offset=offset,
-            level=level,
-            action=action,
-            q=q,
-        )
-        return {"entries": entries, "total": total, "limit": limit, "offset": offset}
+
+        def load() -> dict:
+            page = query_activity_page(
+                _hist,
+                limit=limit,
+                cursor=cursor,
+                offset=offset,
+                level=level,
+                action=action,
+                source=source,
+                q=q,
+            )
+            return {
+                "entries": page["entries"],
+                "total": page["total"],
+                "limit": limit,
+                "offset": offset,
+                "next_cursor": page["next_cursor"],
+            }
+
+        key = ("history", limit, offset, level, action, source, q, cursor)
+        try:
+            # Warteschlange leeren, Segmente lesen und Index nachziehen blockiert — nicht im Event-Loop
+            body = await run_in_threadpool(lambda: _cached(key, activity_signature(_hist), load))
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        return _cached_json_response(request, body)
 
     @app.delete("/api/history")
     async def delete_history(request: Request):
         _auth(request)
-        clear_activity(_hist)
+        await run_in_threadpool(clear_activity, _hist)
         return {"ok": True}
 
     return app
@@ -792,6 +1099,25 @@ def _preflight_port(host: str, port: int) -> None:
         sys.exit(1)
 
 
+def _server_app(
+    wishlist_path: Optional[str],
+    download_dir: Optional[str],
+    token: Optional[str],
+    cli_args: Optional[Any],
+    activity_path: Optional[str],
+) -> tuple:
+    dd = download_dir or os.getcwd()
+    wl = wishlist_path or default_wishlist_path(dd)
+
+    def factory():
+        if cli_args is not None:
+            # Eigene Kopie je Aktion: Jobs setzen cancel_check/Fortschritt direkt am Objekt
+            return copy.copy(cli_args)
+        return build_process_args_from_env(dd)
+
+    return create_app(wl, factory, token=token, activity_path=activity_path), wl
+
+
 def run_server(
     host: str = "127.0.0.1",
     port: int = 8765,
@@ -805,20 +1131,43 @@ def run_server(
         print("Bitte installieren: pip install fastapi uvicorn[standard]", file=sys.stderr)
         sys.exit(1)
 
-    dd = download_dir or os.getcwd()
-    wl = wishlist_path or default_wishlist_path(dd)
-
-    def factory():
-        if cli_args is not None:
-            return cli_args
-        return build_process_args_from_env(dd)
-
-    app = create_app(wl, factory, token=token, activity_path=activity_path)
+    app, wl = _server_app(wishlist_path, download_dir, token, cli_args, activity_path)
     _preflight_port(host, port)
     logging.info(f"Wishlist-Web-UI: http://{host}:{port}/  (Wishlist: {wl})")
     uvicorn.run(app, host=host, port=port, log_level="info")
 
 
+def start_server_thread(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    wishlist_path: Optional[str] = None,
+    download_dir: Optional[str] = None,
+    token: Optional[str] = None,
+    cli_args: Optional[Any] = None,
+    activity_path: Optional[str] = None,
+) -> Callable[[], None]:
+    """
+    Startet das Web-UI in einem Hintergrund-Thread (``--daemon``); Zwischenspeicher, Status-Sitzung
+    und HTTP-Verbindungen teilt es mit den geplanten Läufen. Liefert ``stop()`` (wartet auf das Ende).
+    """
+    if FastAPI is None:
+        raise RuntimeError("Wishlist-Web-UI benötigt fastapi und uvicorn (pip install fastapi uvicorn[standard])")
+
+    app, wl = _server_app(wishlist_path, download_dir, token, cli_args, activity_path)
+    _preflight_port(host, port)
+    # Signale bleiben beim Haupt-Thread: uvicorn installiert außerhalb davon keine Handler
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="info"))
+    thread = threading.Thread(target=server.run, name="wishlist-web", daemon=True)
+    thread.start()
+    logging.info(f"Wishlist-Web-UI: http://{host}:{port}/  (Wishlist: {wl}, im Daemon-Prozess)")
+
+    def stop(timeout: float = 10.0) -> None:
+        server.should_exit = True
+        thread.join(timeout)
+
+    return stop
+
+
 def main():
     p = argparse.ArgumentParser(description="Perlentaucher Wishlist Web-UI")
     p.add_argument("--host", default=os.environ.get("WISHLIST_WEB_HOST", "127.0.0.1"))
@@ -828,6 +1177,10 @@ def main():
     p.add_argument("--token", default=os.environ.get("WISHLIST_WEB_TOKEN"))
     args = p.parse_args()
     wl = args.wishlist_file or default_wishlist_path(args.download_dir)
+    try:
+        wl = wishlist_path_for_backend(wl, (os.environ.get("WISHLIST_BACKEND") or "").strip().lower() or None)
+    except ValueError as e:
+        p.error(f"WISHLIST_BACKEND: {e}")
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
     run_server(host=args.host, port=args.port, wishlist_path=wl, download_dir=args.download_dir, token=args.token)
 
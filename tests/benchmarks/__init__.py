@@ -0,0 +1,5 @@
+"""
+Benchmarks für die Such-, Matching- und Parsing-Pfade mit aufgezeichneten Fixtures.
+
+Ausführen (im Projektverzeichnis): ``python -m tests.benchmarks.runner`` — siehe ``tests/README.md``.
+"""
@@ -0,0 +1,325 @@
+"""
+Benchmark-Fälle für die heißen Pfade der Kernlogik.
+
+Grundlage sind die synthetischen Fixtures in ``fixtures/``: von Hand erstellte Antworten im Format von
+MediathekViewWeb für Filme und Serien (``mvw_movies.json``, ``mvw_series.json``, je Suchanfrage mit Titel,
+Jahr und Metadaten) und ein Feed im Format des nexxtpress-RSS-Feeds (``nexxtpress_feed.xml``) — keine
+Mitschnitte echter Antworten. Große Status-, Aktivitäts- und
+Wishlist-Dateien werden daraus deterministisch im Arbeitsordner erzeugt (Größen siehe ``*_ENTRIES``),
+damit das Repository keine Megabyte-Dateien mitführen muss.
+
+Jeder Fall ist ein Kontextmanager, der im Arbeitsordner aufbaut und die zu messende Funktion ohne
+Argumente liefert; ein Aufruf verarbeitet jeweils den ganzen Fixture-Satz (``items``).
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Tuple
+
+from src import perlentaucher as core
+from src.state_store import get_state_backend
+from src.wishlist_activity import append_activity
+from src.wishlist_core import WishlistItem
+from src.wishlist_store import get_wishlist_repository
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Größen der erzeugten Dateien: Status bis zur Kompaktierungsschwelle, Aktivität knapp unter der Rotation
+STATE_ENTRIES = 5000
+ACTIVITY_ENTRIES = 3000
+WISHLIST_ITEMS = 1000
+# Status-Einträge, die save_processed_entry reihum überschreibt (Dateigröße bleibt konstant)
+STATE_WRITE_IDS = 50
+
+SEED = 50
+
+
+def _load_json(name: str) -> Dict[str, Any]:
+    with open(FIXTURES_DIR / name, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@dataclass
+class BenchContext:
+    """Arbeitsordner und geladene Fixtures eines Benchmark-Laufs."""
+
+    workdir: str
+    rng: random.Random = field(default_factory=lambda: random.Random(SEED))
+
+    @cached_property
+    def movie_queries(self) -> List[Dict[str, Any]]:
+        return _load_json("mvw_movies.json")["queries"]
+
+    @cached_property
+    def series_queries(self) -> List[Dict[str, Any]]:
+        return _load_json("mvw_series.json")["queries"]
+
+    @property
+    def feed_path(self) -> str:
+        return str(FIXTURES_DIR / "nexxtpress_feed.xml")
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+
+@dataclass
+class Benchmark:
+    name: str
+    description: str
+    count_items: Callable[[BenchContext], int]
+    setup: Callable[[BenchContext], ContextManager[Callable[[], Any]]]
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, description: str, items: Callable[[BenchContext], int]):
+    """Registriert einen Fall; ``items`` zählt die pro Aufruf verarbeiteten Elemente."""
+
+    def decorate(fn: Callable[[BenchContext], Iterator[Callable[[], Any]]]):
+        BENCHMARKS[name] = Benchmark(name, description, items, contextmanager(fn))
+        return fn
+
+    return decorate
+
+
+def _results(query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return query["response"]["result"]["results"]
+
+
+def _all_titles(ctx: BenchContext) -> List[str]:
+    titles: List[str] = []
+    for q in ctx.movie_queries + ctx.series_queries:
+        titles.append(q["title"])
+        titles.extend(r["title"] for r in _results(q))
+    return titles
+
+
+def _similarity_pairs(ctx: BenchContext) -> List[Tuple[str, str]]:
+    return [(q["title"], r["title"]) for q in ctx.movie_queries for r in _results(q)]
+
+
+def _series_filtered(ctx: BenchContext) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    return [
+        (q, core._filter_series_mvw_results(q["title"], core.normalize_search_title(q["title"]), _results(q)))
+        for q in ctx.series_queries
+    ]
+
+
+# --- große Dateien ---------------------------------------------------------
+
+
+def _iso(ctx: BenchContext, days: int = 365) -> str:
+    ts = datetime(2026, 10, 1) - timedelta(seconds=ctx.rng.randint(0, days * 86400))
+    return ts.isoformat()
+
+
+def build_state_file(ctx: BenchContext, name: str, entries: int = STATE_ENTRIES) -> str:
+    """Status-Datei (JSON oder SQLite je nach Endung) mit ``entries`` Einträgen in realistischer Mischung."""
+    path = ctx.path(name)
+    titles = [q["title"] for q in ctx.movie_queries + ctx.series_queries]
+    statuses = ["download_success"] * 6 + ["not_found"] * 3 + ["skipped", "title_extraction_failed", "download_failed"]
+    data: Dict[str, Dict[str, Any]] = {}
+    for i in range(entries):
+        title = f"{ctx.rng.choice(titles)} ({i})"
+        status = ctx.rng.choice(statuses)
+        entry: Dict[str, Any] = {"status": status, "timestamp": _iso(ctx), "movie_title": title}
+        if status == "download_success":
+            entry["filename"] = f"{title} [tmdbid-{1000 + i}].mp4"
+        if i % 7 == 0:
+            entry["is_series"] = True
+            entry["episodes"] = [f"S01E{n:02d}" for n in range(1, ctx.rng.randint(2, 9))]
+        data[f"https://nexxtpress.de/?p={10000 + i}"] = entry
+    get_state_backend(path).replace_entries(data)
+    return path
+
+
+def build_activity_file(ctx: BenchContext, name: str, entries: int = ACTIVITY_ENTRIES) -> str:
+    """Aktivitätsprotokoll (JSON Lines, älteste zuerst) im Format von ``append_activity``."""
+    path = ctx.path(name)
+    actions = ["wishlist_add", "wishlist_check", "download", "search", "rss_run", "wishlist_remove"]
+    titles = [q["title"] for q in ctx.movie_queries + ctx.series_queries]
+    start = datetime.now(timezone.utc) - timedelta(days=7)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(entries):
+            entry = {
+                "id": uuid.UUID(int=ctx.rng.getrandbits(128)).hex,
+                "ts": (start + timedelta(seconds=i * 60)).isoformat(timespec="seconds"),
+                "action": ctx.rng.choice(actions),
+                "label": ctx.rng.choice(titles),
+                "detail": "MediathekViewWeb: 3 Treffer, bester ARTE.DE (HD, 1920x1080), Score 112450",
+                "level": ctx.rng.choice(["info"] * 8 + ["warning", "error"]),
+                "source": ctx.rng.choice(["cli", "web", "daemon"]),
+            }
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return path
+
+
+def build_wishlist_file(ctx: BenchContext, name: str, items: int = WISHLIST_ITEMS) -> str:
+    """Wishlist (JSON oder SQLite je nach Endung) mit ``items`` Filmen und Serien."""
+    path = ctx.path(name)
+    queries = ctx.movie_queries + ctx.series_queries
+    out = []
+    for i in range(items):
+        k = i % len(queries)
+        q = queries[k]
+        item = WishlistItem(
+            id=uuid.UUID(int=ctx.rng.getrandbits(128)).hex,
+            title=f"{q['title']} {i}" if i >= len(queries) else q["title"],
+            year=q["year"],
+            kind="series" if k >= len(ctx.movie_queries) else "movie",
+            created_at=_iso(ctx, days=720)[:19],
+            note="",
+        )
+        out.append(item.to_dict())
+    get_wishlist_repository(path).replace_all(out)
+    return path
+
+
+# --- Fälle -----------------------------------------------------------------
+
+
+@benchmark("normalize_search_title", "Titel normalisieren (Such- und Ergebnistitel)", lambda c: len(_all_titles(c)))
+def _normalize(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    titles = _all_titles(ctx)
+    fn = core.normalize_search_title
+    yield lambda: [fn(t) for t in titles]
+
+
+@benchmark(
+    "calculate_title_similarity", "Titelähnlichkeit Suchtitel ↔ MVW-Treffer", lambda c: len(_similarity_pairs(c))
+)
+def _similarity(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    pairs = _similarity_pairs(ctx)
+    fn = core.calculate_title_similarity
+    yield lambda: [fn(a, b) for a, b in pairs]
+
+
+@benchmark(
+    "score_movie", "Filmtreffer bewerten (Titel, Jahr, Sprache, Provider-ID)", lambda c: len(_similarity_pairs(c))
+)
+def _score(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    jobs = [(r, q) for q in ctx.movie_queries for r in _results(q)]
+
+    def run():
+        return [
+            core.score_movie(r, "deutsch", "egal", search_title=q["title"], search_year=q["year"], metadata=q["metadata"])
+            for r, q in jobs
+        ]
+
+    yield run
+
+
+@benchmark(
+    "extract_episode_info",
+    "Staffel/Episode aus Serientreffern",
+    lambda c: sum(len(_results(q)) for q in c.series_queries),
+)
+def _episode_info(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    jobs = [(r, q["title"]) for q in ctx.series_queries for r in _results(q)]
+    fn = core.extract_episode_info
+    yield lambda: [fn(r, t) for r, t in jobs]
+
+
+@benchmark(
+    "filter_series_mvw_results",
+    "Serientreffer filtern (_filter_series_mvw_results)",
+    lambda c: sum(len(_results(q)) for q in c.series_queries),
+)
+def _filter_series(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    jobs = [(q["title"], core.normalize_search_title(q["title"]), _results(q)) for q in ctx.series_queries]
+    fn = core._filter_series_mvw_results
+    yield lambda: [fn(t, n, res) for t, n, res in jobs]
+
+
+@benchmark(
+    "pick_best_series_episodes_per_slot",
+    "Beste Fassung je Episode wählen",
+    lambda c: sum(len(f) for _q, f in _series_filtered(c)),
+)
+def _pick_best(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    jobs = _series_filtered(ctx)
+    fn = core.pick_best_series_episodes_per_slot
+
+    def run():
+        return [
+            fn(episodes, q["title"], search_year=q["year"], metadata=q["metadata"]) for q, episodes in jobs
+        ]
+
+    yield run
+
+
+def _feed_items(ctx: BenchContext) -> int:
+    with open(ctx.feed_path, "r", encoding="utf-8") as f:
+        return f.read().count("<item>")
+
+
+@benchmark("parse_rss_feed", "RSS-Feed parsen inkl. Status-Abgleich (JSON, 5000 Einträge)", _feed_items)
+def _parse_feed(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    state = build_state_file(ctx, "feed_state.json")
+    original = core.RSS_FEED_URL
+    core.RSS_FEED_URL = ctx.feed_path
+    try:
+
+        def run():
+            # Wie ein frischer Prozess: Sender-Links nicht aus dem Modul-Cache
+            core._SENDER_LINK_FETCH_CACHE.clear()
+            return core.parse_rss_feed(1000, state_file=state)
+
+        yield run
+    finally:
+        core.RSS_FEED_URL = original
+
+
+def _state_writer(ctx: BenchContext, name: str) -> Callable[[], Any]:
+    state = build_state_file(ctx, name)
+    counter = iter(range(1 << 62))
+
+    def run():
+        n = next(counter) % STATE_WRITE_IDS
+        core.save_processed_entry(
+            state, f"https://nexxtpress.de/?p={90000 + n}", status="download_success",
+            movie_title="Der Name der Rose", filename="Der Name der Rose (1986).mp4",
+        )
+
+    return run
+
+
+@benchmark("save_processed_entry.json", "Status-Eintrag schreiben (JSON, 5000 Einträge)", lambda c: 1)
+def _save_json(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    yield _state_writer(ctx, "state.json")
+
+
+@benchmark("save_processed_entry.sqlite", "Status-Eintrag schreiben (SQLite, 5000 Einträge)", lambda c: 1)
+def _save_sqlite(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    yield _state_writer(ctx, "state.sqlite3")
+
+
+@benchmark("append_activity", "Aktivität anhängen (JSON Lines, 3000 Einträge)", lambda c: 1)
+def _append_activity(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    path = build_activity_file(ctx, "activity.jsonl")
+    yield lambda: append_activity(path, "download", "Der Name der Rose", "ARTE.DE, HD", source="cli")
+
+
+@benchmark("wishlist_update.json", "Wishlist-Eintrag ändern (JSON, 1000 Einträge)", lambda c: 1)
+def _wishlist_update(ctx: BenchContext) -> Iterator[Callable[[], Any]]:
+    path = build_wishlist_file(ctx, "wishlist.json")
+    repo = get_wishlist_repository(path)
+    items = repo.list()
+    targets = [items[i] for i in range(0, len(items), max(1, len(items) // 20))]
+    counter = iter(range(1 << 62))
+
+    def run():
+        item = dict(targets[next(counter) % len(targets)])
+        item["note"] = "geprüft"
+        return repo.update(item)
+
+    yield run
@@ -0,0 +1,316 @@
+"""
+Eigenständiger Benchmark-Runner mit JSON-Baselines.
+
+    python -m tests.benchmarks.runner                  # messen und Tabelle ausgeben
+    python -m tests.benchmarks.runner --save           # Baseline schreiben (tests/benchmarks/baseline.json)
+    python -m tests.benchmarks.runner --compare        # gegen Baseline vergleichen, Exit-Code 1 bei Regression
+    python -m tests.benchmarks.runner -k score --compare --threshold 0.5
+
+Jeder Fall wird einmal aufgewärmt, dann wird die Anzahl Aufrufe je Runde so gewählt, dass eine Runde
+mindestens ``--min-time`` Sekunden dauert (Garbage Collection aus, wie bei ``timeit``). Verglichen wird
+die schnellste Runde (``min_us``, pro Aufruf) — sie schwankt am wenigsten. Baselines sind nur auf
+derselben Maschine aussagekräftig und werden nicht eingecheckt; ``environment`` in der Datei hält fest,
+wo gemessen wurde.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from tests.benchmarks.cases import BENCHMARKS, BenchContext  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+# Erlaubte Verlangsamung gegenüber der Baseline (0.25 = 25 %)
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_TIME = 0.1
+DEFAULT_ROUNDS = 5
+BASELINE_VERSION = 1
+
+
+def _timed(fn: Callable[[], Any], loops: int, timer: Callable[[], float]) -> float:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = timer()
+        for _ in range(loops):
+            fn()
+        return timer() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def measure(
+    fn: Callable[[], Any],
+    min_time: float = DEFAULT_MIN_TIME,
+    rounds: int = DEFAULT_ROUNDS,
+    timer: Callable[[], float] = time.perf_counter,
+) -> Dict[str, Any]:
+    """Misst ``fn``; Zeiten pro Aufruf in Mikrosekunden."""
+    fn()  # Aufwärmen (Caches, Imports, erstes Schreiben)
+    loops = 1
+    while True:
+        elapsed = _timed(fn, loops, timer)
+        if elapsed >= min_time:
+            break
+        # Hochrechnen statt nur verdoppeln, damit langsame Fälle nicht unnötig oft kalibrieren
+        factor = min_time / elapsed * 1.2 if elapsed > 0 else 10
+        loops = max(loops * 2, int(loops * factor))
+    per_call = [elapsed / loops] + [_timed(fn, loops, timer) / loops for _ in range(max(rounds, 1) - 1)]
+    return {
+        "min_us": round(min(per_call) * 1e6, 3),
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "loops": loops,
+        "rounds": len(per_call),
+    }
+
+
+def select(patterns: Optional[Iterable[str]] = None) -> List[str]:
+    """Namen der Fälle, die einen der Teilstrings enthalten (ohne Muster: alle)."""
+    patterns = [p for p in (patterns or []) if p]
+    return [n for n in BENCHMARKS if not patterns or any(p in n for p in patterns)]
+
+
+def run_benchmarks(
+    names: Optional[Iterable[str]] = None,
+    min_time: float = DEFAULT_MIN_TIME,
+    rounds: int = DEFAULT_ROUNDS,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Führt die Fälle in je eigenem temporären Arbeitsordner aus."""
+    results: Dict[str, Dict[str, Any]] = {}
+    # Log-Ausgaben der Kernlogik würden die Messung dominieren
+    logging.disable(logging.CRITICAL)
+    try:
+        with tempfile.TemporaryDirectory(prefix="perlentaucher-bench-") as tmp:
+            for name in names if names is not None else list(BENCHMARKS):
+                bench = BENCHMARKS[name]
+                if progress:
+                    progress(name)
+                workdir = os.path.join(tmp, name)
+                os.makedirs(workdir)
+                ctx = BenchContext(workdir)
+                with bench.setup(ctx) as fn:
+                    stats = measure(fn, min_time=min_time, rounds=rounds)
+                items = bench.count_items(ctx)
+                stats["items"] = items
+                stats["per_item_us"] = round(stats["min_us"] / items, 3) if items else None
+                stats["description"] = bench.description
+                results[name] = stats
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_baseline(path: str, results: Dict[str, Dict[str, Any]]) -> None:
+    data = {
+        "version": BASELINE_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "results": results,
+    }
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("results"), dict):
+        raise ValueError(f"Keine Benchmark-Baseline: {path}")
+    return data
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_us: Optional[float]
+    current_us: Optional[float]
+    status: str  # ok | regression | faster | new | missing
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline_us or self.current_us is None:
+            return None
+        return self.current_us / self.baseline_us - 1
+
+
+def compare(
+    baseline: Dict[str, Dict[str, Any]],
+    results: Dict[str, Dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Comparison]:
+    """
+    Vergleicht ``min_us`` je Fall. Langsamer als ``threshold`` → ``regression``, entsprechend
+    schneller → ``faster``. Fälle ohne Baseline sind ``new``; nicht gemessene Baseline-Fälle ``missing``.
+    """
+    rows: List[Comparison] = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        current = stats["min_us"]
+        if not base:
+            rows.append(Comparison(name, None, current, "new"))
+            continue
+        row = Comparison(name, base["min_us"], current, "ok")
+        change = row.change
+        if change is not None and change > threshold:
+            row.status = "regression"
+        elif change is not None and change < -threshold:
+            row.status = "faster"
+        rows.append(row)
+    for name, base in baseline.items():
+        if name not in results:
+            rows.append(Comparison(name, base.get("min_us"), None, "missing"))
+    return rows
+
+
+def _fmt_us(value: Optional[float]) -> str:
+    if value is None:
+        return "—"
+    if value >= 1000:
+        return f"{value / 1000:.2f} ms"
+    return f"{value:.1f} µs"
+
+
+def format_results(results: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"{'Benchmark':<36} {'min/Aufruf':>12} {'Median':>12} {'Elemente':>9} {'/Element':>10} {'Aufrufe':>9}"]
+    for name, s in results.items():
+        lines.append(
+            f"{name:<36} {_fmt_us(s['min_us']):>12} {_fmt_us(s['median_us']):>12} {s['items']:>9} "
+            f"{_fmt_us(s['per_item_us']):>10} {s['loops']:>5}×{s['rounds']:<3}"
+        )
+    return "\n".join(lines)
+
+
+_STATUS_LABELS = {
+    "ok": "ok",
+    "regression": "REGRESSION",
+    "faster": "schneller",
+    "new": "neu",
+    "missing": "nicht gemessen",
+}
+
+
+def format_comparison(rows: List[Comparison], threshold: float) -> str:
+    lines = [
+        f"Vergleich mit Baseline (Schwelle {threshold:.0%}):",
+        f"{'Benchmark':<36} {'Baseline':>12} {'Jetzt':>12} {'Änderung':>9}  Status",
+    ]
+    for row in rows:
+        change = f"{row.change:+.1%}" if row.change is not None else "—"
+        lines.append(
+            f"{row.name:<36} {_fmt_us(row.baseline_us):>12} {_fmt_us(row.current_us):>12} {change:>9}  "
+            f"{_STATUS_LABELS[row.status]}"
+        )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks.runner",
+        description="Benchmarks der Such-, Matching- und Parsing-Pfade mit aufgezeichneten Fixtures.",
+    )
+    parser.add_argument("-k", dest="patterns", action="append", default=[],
+                        help="Nur Fälle, deren Name den Teilstring enthält (mehrfach möglich)")
+    parser.add_argument("--list", action="store_true", help="Fälle auflisten und beenden")
+    parser.add_argument("--save", nargs="?", const=str(DEFAULT_BASELINE), default=None, metavar="DATEI",
+                        help=f"Ergebnisse als Baseline speichern (Standard: {DEFAULT_BASELINE.name})")
+    parser.add_argument("--compare", nargs="?", const=str(DEFAULT_BASELINE), default=None, metavar="DATEI",
+                        help="Mit Baseline vergleichen; Exit-Code 1 bei Regression über der Schwelle")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Erlaubte Verlangsamung als Anteil (Standard: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help=f"Mindestdauer einer Runde in Sekunden (Standard: {DEFAULT_MIN_TIME})")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS,
+                        help=f"Anzahl Runden je Fall (Standard: {DEFAULT_ROUNDS})")
+    parser.add_argument("--json", metavar="DATEI", help="Ergebnisse zusätzlich als JSON schreiben")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    names = select(args.patterns)
+    if args.list:
+        for name in names:
+            print(f"{name:<36} {BENCHMARKS[name].description}")
+        return 0
+    if not names:
+        print("Kein Benchmark passt zu -k", file=sys.stderr)
+        return 2
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = load_baseline(args.compare)
+        except (OSError, ValueError) as e:
+            print(f"Baseline nicht lesbar: {e} (zuerst mit --save anlegen)", file=sys.stderr)
+            return 2
+
+    results = run_benchmarks(
+        names,
+        min_time=args.min_time,
+        rounds=args.rounds,
+        progress=lambda n: print(f"… {n}", file=sys.stderr, flush=True),
+    )
+    print(format_results(results))
+    if args.json:
+        write_baseline(args.json, results)
+
+    exit_code = 0
+    if baseline is not None:
+        # Nur die gewählten Fälle vergleichen, sonst wäre bei -k alles andere „nicht gemessen“
+        base_results = {k: v for k, v in baseline["results"].items() if k in names}
+        rows = compare(base_results, results, args.threshold)
+        print()
+        print(format_comparison(rows, args.threshold))
+        env = baseline.get("environment") or {}
+        if env and env != environment():
+            print("Hinweis: Baseline wurde in einer anderen Umgebung gemessen "
+                  f"({env.get('python')}, {env.get('platform')})")
+        if any(r.status == "regression" for r in rows):
+            exit_code = 1
+
+    if args.save:
+        results_to_save = results
+        if os.path.exists(args.save) and args.patterns:
+            # Mit -k nur die gemessenen Fälle in der bestehenden Baseline ersetzen
+            try:
+                results_to_save = {**load_baseline(args.save)["results"], **results}
+            except (OSError, ValueError):
+                pass
+        write_baseline(args.save, results_to_save)
+        print(f"Baseline gespeichert: {args.save}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Tests für die Benchmark-Suite (``tests/benchmarks``): Fälle laufen mit den Fixtures, Baselines
+werden geschrieben und Regressionen über der Schwelle erkannt. Gemessen wird hier nicht.
+"""
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import perlentaucher as core  # noqa: E402
+from tests.benchmarks import runner  # noqa: E402
+from tests.benchmarks.cases import BENCHMARKS, BenchContext  # noqa: E402
+
+
+def test_all_cases_run_on_fixtures():
+    results = runner.run_benchmarks(min_time=0, rounds=1)
+    assert list(results) == list(BENCHMARKS)
+    for name, stats in results.items():
+        assert stats["min_us"] > 0, name
+        assert stats["items"] > 0, name
+        assert stats["loops"] == 1 and stats["rounds"] == 1
+
+
+def test_feed_fixture_yields_movies_and_restores_url(tmp_path):
+    original = core.RSS_FEED_URL
+    with BENCHMARKS["parse_rss_feed"].setup(BenchContext(str(tmp_path))) as fn:
+        movies, entries = fn()
+    assert core.RSS_FEED_URL == original
+    assert ("Der Name der Rose", 1986) in movies
+    assert len(movies) >= 30
+    assert all(sender for _id, _entry, _link, sender in entries)
+
+
+def test_compare_flags_regressions_and_new_cases():
+    baseline = {"a": {"min_us": 100.0}, "b": {"min_us": 100.0}, "c": {"min_us": 100.0}, "weg": {"min_us": 5.0}}
+    results = {"a": {"min_us": 120.0}, "b": {"min_us": 140.0}, "c": {"min_us": 60.0}, "neu": {"min_us": 1.0}}
+    rows = {r.name: r for r in runner.compare(baseline, results, threshold=0.25)}
+    assert rows["a"].status == "ok"
+    assert rows["b"].status == "regression" and abs(rows["b"].change - 0.4) < 1e-9
+    assert rows["c"].status == "faster"
+    assert rows["neu"].status == "new" and rows["weg"].status == "missing"
+    assert "REGRESSION" in runner.format_comparison(list(rows.values()), 0.25)
+
+
+def test_main_saves_baseline_and_fails_on_regression(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    quick = ["-k", "extract_episode_info", "--min-time", "0", "--rounds", "1"]
+    assert runner.main(quick + ["--save", str(baseline)]) == 0
+    data = json.loads(baseline.read_text(encoding="utf-8"))
+    assert list(data["results"]) == ["extract_episode_info"]
+    assert data["environment"]["python"]
+
+    data["results"]["extract_episode_info"]["min_us"] = 0.001
+    baseline.write_text(json.dumps(data), encoding="utf-8")
+    assert runner.main(quick + ["--compare", str(baseline)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+    assert runner.main(quick + ["--compare", str(baseline), "--threshold", "1e12"]) == 0
+
+
+def test_compare_without_baseline_fails_cleanly(tmp_path, capsys):
+    assert runner.main(["-k", "extract_episode_info", "--compare", str(tmp_path / "fehlt.json")]) == 2
+    assert "--save" in capsys.readouterr().err
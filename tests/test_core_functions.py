@@ -12,6 +12,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src import perlentaucher as core
+from src.wishlist_cache import TtlCache
 
 
 class TestYearExtraction:
@@ -953,6 +954,15 @@ class TestPickBestSeriesEpisodesPerSlot:
         assert slots[0][1] == 1
         assert "Original" not in (slots[0][2].get("title") or "")
 
+    def test_numbers_episodes_without_info_and_logs(self, caplog):
+        episodes = [{"title": "Folge A", "topic": "Show"}, {"title": "Folge B", "topic": "Show"}]
+        with patch.object(core, "extract_episode_info", return_value=(None, None)), patch.object(
+            core, "score_movie", return_value=1.0
+        ), caplog.at_level("INFO"):
+            slots = core.pick_best_series_episodes_per_slot(episodes, "Show")
+        assert [(s, e) for s, e, _d in slots] == [(1, 1), (1, 2)]
+        assert "2 Episoden ohne Staffel/Episode-Info als S01E1+ nummeriert" in caplog.text
+
 
 class TestUnknownEpisodeFallbackPolicy:
     def test_fallback_allowed_when_no_parsed_episodes(self):
@@ -1026,7 +1036,158 @@ class TestHlsDownloadHelpers:
         mock_get.return_value = Resp()
         with tempfile.TemporaryDirectory() as td:
             md = {"url_video": "https://x.example/vid.mp4", "title": "P"}
-            ok, title, fp, skipped = core.download_content(md, td, "P", {}, is_series=False)
+            seen = []
+            ok, title, fp, skipped = core.download_content(
+                md, td, "P", {}, is_series=False, bytes_callback=lambda done, total: seen.append((done, total))
+            )
         assert ok is True
         assert skipped is False
+        assert seen == [(5, 5)]
         mock_get.assert_called_once()
+
+
+class TestQualityPolicy:
+    GB = 1024 * 1024 * 1024
+
+    def _result(self):
+        return {
+            "title": "Film",
+            "url_video": "https://cdn.example/film_sd.mp4",
+            "url_video_hd": "https://cdn.example/film_hd.mp4",
+            "url_video_low": "https://cdn.example/film_low.mp4",
+            "size": 1 * self.GB,
+        }
+
+    def test_parse_quality_policy(self):
+        assert core.parse_quality_policy(None) == (None, None)
+        assert core.parse_quality_policy("HD") == ("hd", None)
+        assert core.parse_quality_policy("max-size=1,5") == (None, 1.5)
+        with pytest.raises(ValueError):
+            core.parse_quality_policy("4k")
+        with pytest.raises(ValueError):
+            core.parse_quality_policy("max-size=0")
+
+    def test_no_policy_leaves_results_untouched(self):
+        r = self._result()
+        core.apply_quality_policy([r], None)
+        assert r == self._result()
+
+    def test_hd_uses_head_size_for_scoring(self):
+        sizes = {"https://cdn.example/film_hd.mp4": 3 * self.GB}
+        r = self._result()
+        with patch.object(core, "_head_content_length", side_effect=sizes.get) as head:
+            core.apply_quality_policy([r], "hd")
+        head.assert_called_once_with("https://cdn.example/film_hd.mp4")
+        assert r["url_video"] == "https://cdn.example/film_hd.mp4"
+        assert r["quality_tier"] == "hd"
+        assert r["size"] == 3 * self.GB
+        # zweite Anwendung (z. B. andere Policy) arbeitet mit den gesicherten Originalwerten
+        core.apply_quality_policy([r], "sd")
+        assert r["url_video"] == "https://cdn.example/film_sd.mp4"
+        assert r["size"] == 1 * self.GB
+
+    def test_hd_falls_back_to_sd_without_hd_url(self):
+        r = self._result()
+        del r["url_video_hd"]
+        with patch.object(core, "_head_content_length") as head:
+            core.apply_quality_policy([r], "hd")
+        head.assert_not_called()
+        assert r["quality_tier"] == "sd"
+
+    def test_max_size_picks_best_fitting_tier(self):
+        sizes = {
+            "https://cdn.example/film_hd.mp4": 3 * self.GB,
+            "https://cdn.example/film_low.mp4": self.GB // 4,
+        }
+        r1, r2 = self._result(), self._result()
+        with patch.object(core, "_head_content_length", side_effect=sizes.get):
+            core.apply_quality_policy([r1], "max-size=2")
+            core.apply_quality_policy([r2], "max-size=0.5")
+        assert r1["quality_tier"] == "sd"
+        assert r2["quality_tier"] == "low"
+        assert r2["size"] == self.GB // 4
+
+    def test_unknown_tier_size_is_not_taken_from_sd(self):
+        r = self._result()
+        with patch.object(core, "_head_content_length", return_value=None):
+            core.apply_quality_policy([r], "hd")
+        assert r["quality_tier"] == "hd"
+        assert r["size"] is None
+        assert r["size_sd"] == 1 * self.GB
+
+    def test_search_heads_only_matching_results(self):
+        hit = self._result()
+        hit["title"] = "Der Name der Rose"
+        other = dict(self._result(), title="Wetter vor acht", url_video_hd="https://cdn.example/other_hd.mp4")
+        with patch.object(core, "_fetch_mvw_api_movie_results", return_value=[other, hit]), patch.object(
+            core, "_head_content_length", return_value=2 * self.GB
+        ) as head, patch.object(core, "first_live_candidate", return_value=0):
+            best = core.search_mediathek("Der Name der Rose", quality="hd")
+        assert best is hit and best["quality_tier"] == "hd"
+        head.assert_called_once_with("https://cdn.example/film_hd.mp4")
+        assert "quality_tier" not in other
+
+
+class TestUrlLivenessProbe:
+    def setup_method(self):
+        core._url_probe_cache.clear()
+
+    @staticmethod
+    def _head(statuses):
+        def fake_head(url, **kwargs):
+            resp = Mock()
+            resp.status_code = statuses[url]
+            resp.headers = {"content-length": "2048", "content-type": "video/mp4"}
+            return resp
+        return fake_head
+
+    def test_probe_url_classifies_and_caches(self):
+        statuses = {"https://a/ok.mp4": 200, "https://a/gone.mp4": 410, "https://a/busy.mp4": 503}
+        with patch.object(core.requests, "head", side_effect=self._head(statuses)) as head:
+            ok = core.probe_url("https://a/ok.mp4")
+            assert ok["alive"] is True and ok["size"] == 2048 and ok["content_type"] == "video/mp4"
+            assert core.probe_url("https://a/gone.mp4")["alive"] is False
+            assert core.probe_url("https://a/busy.mp4")["alive"] is None
+            core.probe_url("https://a/ok.mp4")
+        assert head.call_count == 3
+
+    def test_probe_url_network_error_is_unknown_and_not_cached(self):
+        with patch.object(core.requests, "head", side_effect=core.requests.ConnectionError("x")) as head:
+            assert core.probe_url("https://a/x.mp4")["alive"] is None
+            core.probe_url("https://a/x.mp4")
+        assert head.call_count == 2
+
+    def test_first_live_candidate_skips_dead_links(self):
+        statuses = {"https://a/1.mp4": 404, "https://a/2.mp4": 410, "https://a/3.mp4": 200, "https://a/4.mp4": 200}
+        urls = list(statuses)
+        with patch.object(core.requests, "head", side_effect=self._head(statuses)):
+            assert core.first_live_candidate(urls, top_k=2) == 2
+            assert core.first_live_candidate(urls[:2], top_k=2) is None
+
+    def test_probe_cache_is_bounded(self):
+        assert isinstance(core._url_probe_cache, TtlCache)
+        assert core._url_probe_cache.max_entries == core.URL_PROBE_MAX_ENTRIES
+
+    def test_series_slots_skip_dead_versions(self):
+        statuses = {
+            "https://a/e1_de.mp4": 410,
+            "https://a/e1_ov.mp4": 200,
+            "https://a/e2_de.mp4": 404,
+            "https://a/e3_de.mp4": 200,
+        }
+        episodes = [
+            {"title": "Show (1/3)", "topic": "Show", "url_video": "https://a/e1_de.mp4"},
+            {"title": "Show (1/3) (Originalversion)", "topic": "Show", "url_video": "https://a/e1_ov.mp4"},
+            {"title": "Show (2/3)", "topic": "Show", "url_video": "https://a/e2_de.mp4"},
+            {"title": "Show (3/3)", "topic": "Show", "url_video": "https://a/e3_de.mp4"},
+        ]
+        with patch.object(core.requests, "head", side_effect=self._head(statuses)):
+            slots = core.pick_best_series_episodes_per_slot(episodes, "Show", check_liveness=True)
+        assert [(s, e, d["url_video"]) for s, e, d in slots] == [
+            (1, 1, "https://a/e1_ov.mp4"),
+            (1, 3, "https://a/e3_de.mp4"),
+        ]
+        # ohne Prüfung: keine HEAD-Anfragen, beste Fassung je Episode
+        with patch.object(core.requests, "head") as head:
+            assert len(core.pick_best_series_episodes_per_slot(episodes, "Show")) == 3
+        head.assert_not_called()
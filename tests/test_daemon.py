@@ -0,0 +1,178 @@
+"""
+Tests für den Daemon-Betrieb (Scheduler, Aufgaben, geordnetes Beenden) ohne Netzwerk.
+"""
+import random
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import daemon  # noqa: E402
+from src import perlentaucher as core  # noqa: E402
+from src.daemon import ScheduledTask, Scheduler  # noqa: E402
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _args(tmp_path, **kwargs):
+    a = SimpleNamespace(
+        interval_hours=None,
+        wishlist_interval_hours=None,
+        wishlist_path=str(tmp_path / "wl.json"),
+        download_dir=str(tmp_path),
+        sprache="deutsch",
+        audiodeskription="egal",
+        serien_download="erste",
+        tmdb_api_key=None,
+        omdb_api_key=None,
+        qualitaet=None,
+        serien_qualitaet=None,
+        wishlist_workers=None,
+        metrics_file=None,
+    )
+    for k, v in kwargs.items():
+        setattr(a, k, v)
+    return a
+
+
+def test_scheduler_runs_due_tasks_with_jitter_and_delay():
+    clock = _Clock()
+    calls = []
+    feed = ScheduledTask("feed", 100, lambda: calls.append("feed"), jitter=0.1)
+    later = ScheduledTask("later", 50, lambda: calls.append("later"), delay=50, jitter=0)
+    off = ScheduledTask("off", 0, lambda: calls.append("off"))
+    sched = Scheduler([feed, later, off], clock=clock, rng=random.Random(1))
+    assert [t.name for t in sched.tasks] == ["feed", "later"]
+
+    assert sched.run_pending() is feed
+    assert sched.run_pending() is None
+    assert 90 <= feed.next_run - clock.now <= 110
+    assert sched.seconds_until_next() == 50
+
+    clock.now += 50
+    assert sched.run_pending() is later
+    assert later.next_run == clock.now + 50
+    assert calls == ["feed", "later"]
+
+
+def test_scheduler_keeps_failing_task_scheduled():
+    clock = _Clock()
+
+    def boom():
+        raise RuntimeError("kaputt")
+
+    task = ScheduledTask("boom", 10, boom, jitter=0)
+    sched = Scheduler([task], clock=clock)
+    assert sched.run_pending() is task
+    assert task.failures == 1 and task.runs == 1
+    assert task.next_run == clock.now + 10
+
+
+def test_scheduler_stop_interrupts_wait():
+    sched = Scheduler([ScheduledTask("selten", 3600, lambda: None, delay=3600)])
+    t = threading.Thread(target=sched.run_forever)
+    t.start()
+    sched.stop()
+    t.join(5)
+    assert not t.is_alive()
+
+
+def test_build_tasks_intervals_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("INTERVAL_HOURS", "2")
+    monkeypatch.setenv("CACHE_REFRESH_MINUTES", "0")
+    monkeypatch.setenv("DAEMON_JITTER", "0.2")
+    tasks = daemon.build_tasks(_args(tmp_path), None, lambda: False)
+    by_name = {t.name: t for t in tasks}
+    assert by_name["RSS-Lauf"].interval == 7200
+    assert by_name["Wishlist-Verarbeitung"].interval == 7200
+    assert by_name["Cache-Auffrischung"].interval == 0
+    assert all(t.jitter == 0.2 for t in tasks)
+
+    tasks = daemon.build_tasks(_args(tmp_path, interval_hours=1, wishlist_interval_hours=0.5), None, lambda: False)
+    assert [t.interval for t in tasks[:2]] == [3600, 1800]
+
+
+def test_cache_refresh_off_by_default_and_reuses_fresh_results(tmp_path, monkeypatch):
+    monkeypatch.delenv("CACHE_REFRESH_MINUTES", raising=False)
+    by_name = {t.name: t for t in daemon.build_tasks(_args(tmp_path), None, lambda: False)}
+    assert by_name["Cache-Auffrischung"].interval == 0
+
+    monkeypatch.setenv("CACHE_REFRESH_MINUTES", "30")
+    with patch("src.wishlist_core.check_wishlist_availability", return_value=([], 0)) as check:
+        by_name = {t.name: t for t in daemon.build_tasks(_args(tmp_path), None, lambda: False)}
+        assert by_name["Cache-Auffrischung"].interval == 1800
+        by_name["Cache-Auffrischung"].run()
+    assert check.call_args.kwargs["use_cache"] is True
+
+
+def test_feed_task_compacts_state_after_each_run(tmp_path):
+    state_file = str(tmp_path / "state.json")
+    tasks = daemon.build_tasks(_args(tmp_path), state_file, lambda: False)
+    feed = next(t for t in tasks if t.name == "RSS-Lauf")
+    with patch.object(core, "run_feed_cycle"), patch.object(core, "maybe_compact_state") as compact:
+        feed.run()
+        feed.run()
+    assert compact.call_count == 2
+    assert compact.call_args.args == (state_file,)
+
+
+def test_run_daemon_shares_http_session_and_stops_gracefully(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_REFRESH_MINUTES", "0")
+    args = _args(tmp_path)
+    seen = {}
+
+    def feed(a, state_file, session):
+        seen["http"] = core._http()
+        seen["cancel"] = a.cancel_check
+        assert a is not args
+        a.cancel_check.__self__.set()  # wie SIGTERM während des Laufs
+
+    with patch.object(core, "run_feed_cycle", side_effect=feed), patch.object(
+        core, "run_wishlist_cycle"
+    ) as wishlist, patch.object(daemon, "install_stop_signals"):
+        assert daemon.run_daemon(args, None) == 0
+    assert seen["http"] is not core.requests
+    assert seen["cancel"]() is True
+    # Nach dem Beenden startet keine weitere Aufgabe mehr
+    wishlist.assert_not_called()
+    assert core._http() is core.requests
+
+
+def test_http_session_per_thread():
+    core.use_shared_http_session(True)
+    try:
+        main = core._http()
+        assert core._http() is main
+        other = []
+        t = threading.Thread(target=lambda: other.append(core._http()))
+        t.start()
+        t.join(5)
+        assert other[0] is not main and other[0] is not core.requests
+    finally:
+        core.use_shared_http_session(False)
+    assert core._http() is core.requests
+
+
+def test_feed_cycle_stops_before_next_entry(tmp_path):
+    args = SimpleNamespace(
+        limit=5,
+        resolve_sender_link_fetch=False,
+        notify=None,
+        cancel_check=lambda: True,
+    )
+    entries = [("id1", None, "", None), ("id2", None, "", None)]
+    with patch.object(core, "parse_rss_feed", return_value=(["A", "B"], entries)), patch.object(
+        core, "get_metadata"
+    ) as meta:
+        core.run_feed_cycle(args, None)
+    meta.assert_not_called()
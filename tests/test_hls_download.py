@@ -0,0 +1,302 @@
+"""
+Tests für die eingebaute HLS-Engine (lokal ausgelieferte Playlist, kein Internet).
+"""
+import os
+import sys
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import hls_download as hls  # noqa: E402
+from src import perlentaucher as core  # noqa: E402
+
+MASTER = """#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360
+low/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=3000000,RESOLUTION=1280x720
+high/index.m3u8
+"""
+
+MEDIA = """#EXTM3U
+#EXT-X-VERSION:3
+#EXT-X-TARGETDURATION:4
+#EXT-X-MEDIA-SEQUENCE:7
+#EXT-X-KEY:METHOD=AES-128,URI="../k.bin"
+#EXTINF:4.0,
+s0.ts
+#EXTINF:4.0,
+s1.ts
+#EXT-X-KEY:METHOD=NONE
+#EXTINF:2.5,
+s2.ts
+#EXT-X-ENDLIST
+"""
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    requested = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        _QuietHandler.requested.append(self.path)
+        return super().do_GET()
+
+
+@pytest.fixture
+def hls_server(tmp_path):
+    """Liefert eine Master-/Media-Playlist mit drei Segmenten und einem AES-Schlüssel aus."""
+    root = tmp_path / "www"
+    (root / "high").mkdir(parents=True)
+    (root / "low").mkdir()
+    (root / "master.m3u8").write_text(MASTER, encoding="utf-8")
+    (root / "high" / "index.m3u8").write_text(MEDIA, encoding="utf-8")
+    (root / "low" / "index.m3u8").write_text(MEDIA, encoding="utf-8")
+    (root / "k.bin").write_bytes(b"0123456789abcdef")
+    for i in range(3):
+        (root / "high" / f"s{i}.ts").write_bytes(bytes([i]) * (1000 + i))
+        (root / "low" / f"s{i}.ts").write_bytes(bytes([i]) * 100)
+    (root / "live.m3u8").write_text("#EXTM3U\n#EXTINF:4.0,\nhigh/s0.ts\n", encoding="utf-8")
+
+    _QuietHandler.requested = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_QuietHandler, directory=str(root)))
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_parse_master_playlist_variants():
+    m = hls.parse_master_playlist(MASTER, "https://x.example/a/master.m3u8")
+    assert [v.bandwidth for v in m.variants] == [800000, 3000000]
+    assert m.variants[1].resolution == (1280, 720)
+    assert m.variants[1].uri == "https://x.example/a/high/index.m3u8"
+    assert hls.select_variant(m).bandwidth == 3000000
+
+
+def test_parse_media_playlist_keys_and_sequence():
+    pl = hls.parse_media_playlist(MEDIA, "https://x.example/a/high/index.m3u8")
+    assert pl.endlist is True
+    assert [s.sequence for s in pl.segments] == [7, 8, 9]
+    assert pl.segments[0].key.uri == "https://x.example/a/k.bin"
+    assert pl.segments[2].key is None
+    assert pl.total_duration == pytest.approx(10.5)
+
+
+def test_fetch_to_spool_parallel_with_key(hls_server, tmp_path):
+    spool = str(tmp_path / "out.mp4") + hls.SPOOL_SUFFIX
+    progress = []
+    playlist, media = hls.fetch_hls_to_spool(
+        f"{hls_server}/master.m3u8",
+        spool,
+        workers=3,
+        progress_callback=lambda p, m: progress.append(p),
+    )
+    assert media.url.endswith("/high/index.m3u8")
+    for i in range(3):
+        assert os.path.getsize(os.path.join(spool, f"seg_{i:05d}.ts")) == 1000 + i
+    with open(os.path.join(spool, "key_000.key"), "rb") as f:
+        assert f.read() == b"0123456789abcdef"
+    text = Path(playlist).read_text(encoding="utf-8")
+    assert '#EXT-X-KEY:METHOD=AES-128,URI="key_000.key",IV=0x' + format(7, "032x") in text
+    assert "#EXT-X-KEY:METHOD=NONE" in text
+    assert text.strip().endswith("#EXT-X-ENDLIST")
+    assert progress[-1] == 90
+    assert progress == sorted(progress)
+
+
+def test_fetch_to_spool_resumes_existing_segments(hls_server, tmp_path):
+    spool = str(tmp_path / "out.mp4") + hls.SPOOL_SUFFIX
+    hls.fetch_hls_to_spool(f"{hls_server}/master.m3u8", spool)
+    os.remove(os.path.join(spool, "seg_00001.ts"))
+    _QuietHandler.requested = []
+    hls.fetch_hls_to_spool(f"{hls_server}/master.m3u8", spool)
+    seg_requests = [p for p in _QuietHandler.requested if p.endswith(".ts")]
+    assert seg_requests == ["/high/s1.ts"]
+
+
+def test_fetch_to_spool_cancel(hls_server, tmp_path):
+    spool = str(tmp_path / "out.mp4") + hls.SPOOL_SUFFIX
+    with pytest.raises(InterruptedError):
+        hls.fetch_hls_to_spool(f"{hls_server}/master.m3u8", spool, cancel_check=lambda: True)
+
+
+def test_segment_retry_wait_checks_cancel(hls_server, tmp_path):
+    calls = []
+
+    def cancel_check():
+        calls.append(1)
+        return len(calls) > 1
+
+    session = hls._new_session(1)
+    started = hls.time.monotonic()
+    # 404 → Wiederholungen mit Wartepause (zusammen > 15 s); der Abbruch greift schon in der ersten
+    with pytest.raises(InterruptedError):
+        hls._download_to_file(
+            session, f"{hls_server}/fehlt.ts", str(tmp_path / "x.ts"), 5, threading.Event(), cancel_check
+        )
+    session.close()
+    assert hls.time.monotonic() - started < 2
+
+
+def test_live_playlist_is_unsupported(hls_server, tmp_path):
+    with pytest.raises(hls.HlsUnsupportedError):
+        hls.fetch_hls_to_spool(f"{hls_server}/live.m3u8", str(tmp_path / "sp"))
+
+
+def test_download_hls_native_remuxes_local_playlist(hls_server, tmp_path):
+    out = str(tmp_path / "film.mp4")
+    with patch.object(core, "_run_ffmpeg_hls") as run:
+        core.download_hls_with_ffmpeg(f"{hls_server}/master.m3u8", out, "/bin/ffmpeg")
+    run.assert_called_once()
+    assert run.call_args[0][0].endswith(hls.LOCAL_PLAYLIST_NAME)
+    assert run.call_args[1]["local_input"] is True
+    assert not os.path.exists(hls.spool_dir_for(out))
+
+
+def test_download_hls_unsupported_falls_back_to_ffmpeg(hls_server, tmp_path):
+    out = str(tmp_path / "live.mp4")
+    url = f"{hls_server}/live.m3u8"
+    with patch.object(core, "_run_ffmpeg_hls") as run:
+        core.download_hls_with_ffmpeg(url, out, "/bin/ffmpeg")
+    run.assert_called_once()
+    assert run.call_args[0][0] == url
+    assert run.call_args[1].get("local_input", False) is False
+
+
+def test_download_hls_engine_error_falls_back_to_ffmpeg(hls_server, tmp_path):
+    out = str(tmp_path / "film.mp4")
+    url = f"{hls_server}/master.m3u8"
+    os.makedirs(hls.spool_dir_for(out))
+    with patch.object(hls, "fetch_hls_to_spool", side_effect=RuntimeError("Segment nicht ladbar")), patch.object(
+        core, "_run_ffmpeg_hls"
+    ) as run:
+        core.download_hls_with_ffmpeg(url, out, "/bin/ffmpeg")
+    run.assert_called_once()
+    assert run.call_args[0][0] == url
+    assert not os.path.exists(hls.spool_dir_for(out))
+
+
+def test_download_hls_cancel_does_not_fall_back(hls_server, tmp_path):
+    with patch.object(hls, "fetch_hls_to_spool", side_effect=InterruptedError("Download abgebrochen")), patch.object(
+        core, "_run_ffmpeg_hls"
+    ) as run:
+        with pytest.raises(InterruptedError):
+            core.download_hls_with_ffmpeg(f"{hls_server}/master.m3u8", str(tmp_path / "film.mp4"), "/bin/ffmpeg")
+    run.assert_not_called()
+
+
+def test_unsupported_master_fallback_keeps_height_cap(hls_server, tmp_path):
+    # Separate Audio-Rendition: Engine steigt aus, ffmpeg bekommt die gedeckelte Variante als Programm
+    master = (
+        '#EXTM3U\n#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aud",NAME="de",URI="audio/index.m3u8"\n'
+        + MASTER.replace("RESOLUTION=640x360", 'RESOLUTION=640x360,AUDIO="aud"').replace(
+            "RESOLUTION=1280x720", 'RESOLUTION=1280x720,AUDIO="aud"'
+        ).replace("#EXTM3U\n", "")
+    )
+    root = Path(tmp_path) / "www"
+    (root / "master_audio.m3u8").write_text(master, encoding="utf-8")
+    url = f"{hls_server}/master_audio.m3u8"
+    assert hls.master_program_index(url, 480) == 0
+    assert hls.master_program_index(url) == 1
+    assert hls.master_program_index(f"{hls_server}/live.m3u8", 480) is None
+
+    with patch.object(core, "_run_ffmpeg_hls") as run:
+        core.download_hls_with_ffmpeg(url, str(tmp_path / "film.mp4"), "/bin/ffmpeg", max_height=480)
+    assert run.call_args[0][0] == url
+    assert run.call_args[1]["program"] == 0
+
+
+def test_select_variant_respects_max_height():
+    text = MASTER + "#EXT-X-STREAM-INF:BANDWIDTH=15000000,RESOLUTION=3840x2160\nuhd/index.m3u8\n"
+    m = hls.parse_master_playlist(text, "https://x.example/a/master.m3u8")
+    assert hls.select_variant(m).resolution == (3840, 2160)
+    assert hls.select_variant(m, max_height=1080).resolution == (1280, 720)
+    assert hls.select_variant(m, max_height=480).resolution == (640, 360)
+    # nichts passt: kleinste Variante statt Fehler
+    assert hls.select_variant(m, max_height=240).resolution == (640, 360)
+
+
+def test_fetch_to_spool_uses_capped_variant(hls_server, tmp_path):
+    spool = str(tmp_path / "out.mp4") + hls.SPOOL_SUFFIX
+    _playlist, media = hls.fetch_hls_to_spool(f"{hls_server}/master.m3u8", spool, max_height=480)
+    assert media.url.endswith("/low/index.m3u8")
+    assert os.path.getsize(os.path.join(spool, "seg_00000.ts")) == 100
+    assert not [p for p in _QuietHandler.requested if p.startswith("/high/")]
+
+
+FAKE_FFMPEG = """#!{python}
+import sys, time
+out = sys.argv[-1]
+for i in range(1, 5):
+    sys.stdout.write(f"total_size={{i * 1048576}}\\nout_time_us={{i * 2500000}}\\nspeed=10x\\nprogress=continue\\n")
+    sys.stdout.flush()
+    time.sleep({delay})
+sys.stdout.write("out_time_us=10000000\\nprogress=end\\n")
+sys.stdout.flush()
+if {rc}:
+    sys.stderr.write("Invalid data found when processing input\\n")
+    sys.exit({rc})
+open(out, "wb").write(b"mp4")
+"""
+
+
+def _fake_ffmpeg(tmp_path, rc=0, delay=0.0):
+    exe = tmp_path / "ffmpeg"
+    exe.write_text(FAKE_FFMPEG.format(python=sys.executable, rc=rc, delay=delay), encoding="utf-8")
+    exe.chmod(0o755)
+    return str(exe)
+
+
+def test_describe_ffmpeg_progress_maps_duration_to_range():
+    fields = {"out_time_us": "30000000", "total_size": str(20 * 1024 * 1024), "progress": "continue"}
+    pct, msg = core.describe_ffmpeg_progress(fields, 120.0, 10.0, (0, 100))
+    assert pct == 25
+    assert "25%" in msg and "20.0 MB" in msg and "2.0 MB/s" in msg and "ETA 0:30" in msg
+    pct, _ = core.describe_ffmpeg_progress({"out_time_us": "5", "progress": "end"}, None, 1.0, (92, 99))
+    assert pct == 99
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Shebang-Skript als ffmpeg-Ersatz")
+def test_run_ffmpeg_reports_progress_protocol(tmp_path):
+    out = str(tmp_path / "film.mp4")
+    seen = []
+    core._run_ffmpeg_hls(
+        "local.m3u8",
+        out,
+        _fake_ffmpeg(tmp_path),
+        progress_callback=lambda p, m: seen.append(p),
+        local_input=True,
+        duration_seconds=10.0,
+        progress_range=(0, 100),
+    )
+    assert seen == [25, 50, 75, 100, 100]
+    assert os.path.exists(out)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Shebang-Skript als ffmpeg-Ersatz")
+def test_run_ffmpeg_error_and_cancel(tmp_path):
+    out = str(tmp_path / "film.mp4")
+    with pytest.raises(RuntimeError, match="Invalid data"):
+        core._run_ffmpeg_hls("x.m3u8", out, _fake_ffmpeg(tmp_path, rc=1))
+    calls = []
+    with pytest.raises(InterruptedError):
+        core._run_ffmpeg_hls(
+            "x.m3u8",
+            out,
+            _fake_ffmpeg(tmp_path, delay=0.5),
+            progress_callback=lambda p, m: calls.append(p),
+            cancel_check=lambda: bool(calls),
+        )
+    assert not os.path.exists(out)
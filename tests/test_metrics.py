@@ -0,0 +1,86 @@
+"""
+Tests für die Prometheus-Metriken (Registry, Textformat, Instrumentierung ohne Netzwerk).
+"""
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import metrics  # noqa: E402
+from src import perlentaucher as core  # noqa: E402
+
+
+def test_counter_and_histogram_render():
+    reg = metrics.Registry()
+    c = reg.counter("t_requests_total", "Anfragen", ("host",))
+    c.inc(host="a")
+    c.inc(2, host='b"x')
+    h = reg.histogram("t_latency_seconds", "Latenz", buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 3.0):
+        h.observe(v)
+    assert reg.counter("t_requests_total", "Anfragen", ("host",)) is c
+    text = reg.render()
+    assert "# TYPE t_requests_total counter" in text
+    assert 't_requests_total{host="a"} 1' in text
+    assert 't_requests_total{host="b\\"x"} 2' in text
+    assert 't_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 't_latency_seconds_bucket{le="1"} 2' in text
+    assert 't_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "t_latency_seconds_count 3" in text
+    assert "t_latency_seconds_sum 3.55" in text
+    with pytest.raises(ValueError):
+        c.inc(falsch="x")
+
+
+def test_write_textfile_atomic(tmp_path):
+    reg = metrics.Registry()
+    reg.counter("t_runs_total", "Läufe").inc()
+    target = tmp_path / "sub" / "perlentaucher.prom"
+    reg.write_textfile(str(target))
+    assert "t_runs_total 1" in target.read_text(encoding="utf-8")
+    assert [p.name for p in target.parent.iterdir()] == ["perlentaucher.prom"]
+
+
+def test_track_request_counts_errors_by_host():
+    before = metrics.HTTP_ERRORS.value(service="tmdb", host="api.example", error="ConnectionError")
+    n = metrics.HTTP_DURATION.count(service="tmdb", host="api.example")
+    with pytest.raises(core.requests.ConnectionError):
+        with metrics.track_request("tmdb", "https://api.example/3/search"):
+            raise core.requests.ConnectionError("weg")
+    with metrics.track_request("tmdb", "https://api.example/3/search"):
+        pass
+    assert metrics.HTTP_ERRORS.value(service="tmdb", host="api.example", error="ConnectionError") == before + 1
+    assert metrics.HTTP_DURATION.count(service="tmdb", host="api.example") == n + 2
+
+
+def test_search_mediathek_records_outcome_and_variants():
+    resp = MagicMock()
+    resp.json.return_value = {"result": {"results": []}}
+    resp.raise_for_status.return_value = None
+    title = "Der Name der Rose"
+    terms = core.mediathek_movie_search_terms(title)
+    searches = metrics.SEARCHES.value(kind="movie", outcome="not_found")
+    variants = metrics.SEARCH_VARIANTS.count(kind="movie")
+    requests_before = metrics.HTTP_DURATION.count(service="mvw", host="mediathekviewweb.de")
+    with patch.object(core.requests, "post", return_value=resp):
+        assert core.search_mediathek(title) is None
+    assert metrics.SEARCHES.value(kind="movie", outcome="not_found") == searches + 1
+    assert metrics.SEARCH_VARIANTS.count(kind="movie") == variants + 1
+    # Jede Suchvariante fragt die API (Titelfeld und Volltext) ab
+    assert metrics.HTTP_DURATION.count(service="mvw", host="mediathekviewweb.de") > requests_before + len(terms) - 1
+    assert f'perlentaucher_search_variants_sum{{kind="movie"}}' in metrics.REGISTRY.render()
+
+
+def test_cache_hit_rate_counted():
+    from src.wishlist_cache import TtlCache
+
+    cache = TtlCache(60, name="t_cache")
+    cache.put(("a",), 1)
+    assert cache.get(("a",)) == 1
+    assert cache.get(("b",)) is None
+    assert metrics.CACHE_REQUESTS.value(cache="t_cache", result="hit") == 1
+    assert metrics.CACHE_REQUESTS.value(cache="t_cache", result="miss") == 1
@@ -0,0 +1,86 @@
+"""
+Tests für das Laufzeitprofil nach Pipeline-Stufen (``--profile``) ohne Netzwerk.
+"""
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import perlentaucher as core  # noqa: E402
+from src import profiling  # noqa: E402
+
+
+@pytest.fixture
+def profiler():
+    profiling.disable()
+    p = profiling.enable()
+    try:
+        yield p
+    finally:
+        profiling.disable()
+
+
+def test_stage_is_noop_without_profile():
+    profiling.disable()
+    with profiling.stage("rss"):
+        pass
+    assert profiling.active() is None
+
+
+def test_summary_table_and_trace(profiler, tmp_path):
+    with profiling.stage("metadata", title="Ein Film"):
+        with profiling.stage("http.tmdb", host="api.themoviedb.org"):
+            pass
+    with pytest.raises(ValueError):
+        with profiling.stage("download", title="Kaputt"):
+            raise ValueError("x")
+
+    @profiling.profiled("score", lambda x: {"x": x})
+    def score(x):
+        return x * 2
+
+    assert score(2) == 4 and score(3) == 6
+
+    summary = profiler.summary()
+    by_stage = {row["stage"]: row for row in summary["stages"]}
+    assert by_stage["score"]["count"] == 2
+    assert by_stage["metadata"]["total_seconds"] >= by_stage["http.tmdb"]["total_seconds"]
+    failed = next(r for r in summary["slowest"] if r["stage"] == "download")
+    assert failed["title"] == "Kaputt" and failed["error"] == "ValueError"
+
+    table = profiling.format_table(summary)
+    assert "Stufe" in table and "http.tmdb" in table and "title=Ein Film" in table
+
+    out = tmp_path / "p.json"
+    profiling.write_summary(profiler, str(out))
+    assert json.loads(out.read_text(encoding="utf-8"))["stages"]
+    trace = tmp_path / "trace.json"
+    assert profiling.write_trace(profiler, str(trace)) == 5
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    assert {e["ph"] for e in events} == {"X"}
+    assert next(e for e in events if e["name"] == "http.tmdb")["cat"] == "http"
+
+
+def test_search_records_search_and_http_stages(profiler):
+    resp = MagicMock()
+    resp.json.return_value = {"result": {"results": []}}
+    resp.raise_for_status.return_value = None
+    with patch.object(core.requests, "post", return_value=resp):
+        assert core.search_mediathek("Der Name der Rose") is None
+    stages = {row["stage"]: row for row in profiler.summary()["stages"]}
+    assert stages["search.movie"]["count"] == 1
+    assert stages["http.mvw"]["count"] >= 1
+    slow = [r for r in profiler.summary()["slowest"] if r["stage"] == "search.movie"]
+    assert slow[0]["title"] == "Der Name der Rose"
+
+
+def test_finish_profile_writes_outputs(profiler, tmp_path):
+    with profiling.stage("rss"):
+        pass
+    core._finish_profile(profiler, str(tmp_path / "p.json"), trace_path=str(tmp_path / "t.json"))
+    assert (tmp_path / "p.json").exists() and (tmp_path / "t.json").exists()
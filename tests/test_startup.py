@@ -0,0 +1,116 @@
+"""
+Tests für den schnellen Start der CLI: verzögerte Importe, zwischengespeicherte Update-Prüfung
+und Importzeit-Budget der Wishlist-Befehle (``python -X importtime``).
+"""
+import json
+import logging
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import perlentaucher as core  # noqa: E402
+from src.lazy_import import LazyModule  # noqa: E402
+
+# Summe der Importzeiten (ms) für einen Wishlist-Kurzbefehl inkl. Interpreter-Start-Importen;
+# vorher rund 450 ms, jetzt rund 150 ms — großzügig bemessen für langsame CI-Maschinen
+WISHLIST_IMPORT_BUDGET_MS = 300
+HEAVY_MODULES = ("requests", "urllib3", "apprise", "feedparser", "semver")
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def _importtime(*cli_args):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(project_root / "src" / "perlentaucher.py"), *cli_args],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        cwd=str(project_root),
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    modules = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+        modules[m.group(4)] = int(m.group(2))
+        if not m.group(3):
+            total_us += int(m.group(2))
+    return modules, total_us / 1000
+
+
+def _assert_fast(modules, total_ms):
+    heavy = sorted(n for n in modules if n.split(".")[0] in HEAVY_MODULES)
+    assert heavy == [], f"schwere Module geladen: {heavy}"
+    # Die Skriptdatei darf nicht zusätzlich als src.perlentaucher ausgeführt werden
+    assert "src.perlentaucher" not in modules
+    assert total_ms < WISHLIST_IMPORT_BUDGET_MS, f"Importzeit {total_ms:.0f} ms"
+
+
+def test_wishlist_commands_stay_within_import_budget(tmp_path):
+    wl = str(tmp_path / "wl.json")
+    modules, total_ms = _importtime("--wishlist-add", "Ein Film", "--wishlist-file", wl, "--download-dir", str(tmp_path))
+    _assert_fast(modules, total_ms)
+    modules, total_ms = _importtime("--wishlist-list", "--wishlist-file", wl, "--download-dir", str(tmp_path))
+    _assert_fast(modules, total_ms)
+
+
+def test_wishlist_commands_leave_state_file_alone(tmp_path):
+    # Kompaktierung fällig (Schwelle 1, alte Einträge) — Kurzbefehle dürfen sie trotzdem nicht auslösen
+    state = tmp_path / "state.json"
+    entries = {f"e{i}": {"status": "skipped", "timestamp": "2001-01-01T00:00:00"} for i in range(5)}
+    state.write_text(json.dumps({"entries": entries}), encoding="utf-8")
+    before = state.read_bytes()
+    proc = subprocess.run(
+        [
+            sys.executable, str(project_root / "src" / "perlentaucher.py"), "--wishlist-list",
+            "--wishlist-file", str(tmp_path / "wl.json"), "--download-dir", str(tmp_path),
+            "--state-file", str(state), "--state-compact-threshold", "1",
+        ],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        cwd=str(project_root),
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert state.read_bytes() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["state.json"]
+
+
+def test_lazy_module_loads_on_demand_and_forwards_patches():
+    lazy = LazyModule("json")
+    assert "nicht geladen" in repr(lazy)
+    with patch.object(lazy, "dumps", return_value="x"):
+        assert lazy.dumps({}) == "x"
+        assert json.dumps({}) == "x"
+    assert json.dumps({}) == "{}"
+    assert lazy.loads("[1]") == [1]
+
+
+def test_update_check_uses_fresh_cache(tmp_path, caplog):
+    cache = tmp_path / "update.json"
+    cache.write_text(json.dumps({"checked_at": time.time(), "latest": "v99.0.0"}), encoding="utf-8")
+    with patch.object(core.requests, "get") as get, caplog.at_level(logging.INFO):
+        assert core.check_for_updates("1.0.0", cache_path=str(cache)) is None
+    get.assert_not_called()
+    assert "v99.0.0" in caplog.text
+
+
+def test_update_check_refreshes_stale_cache(tmp_path, caplog):
+    cache = tmp_path / "sub" / "update.json"
+    resp = MagicMock()
+    resp.json.return_value = {"tag_name": "v1.0.0"}
+    resp.raise_for_status.return_value = None
+    with patch.object(core.requests, "get", return_value=resp) as get, caplog.at_level(logging.INFO):
+        thread = core.check_for_updates("1.0.0", cache_path=str(cache))
+        thread.join(5)
+    get.assert_called_once()
+    assert "Auf dem neuesten Stand" in caplog.text
+    assert json.loads(cache.read_text(encoding="utf-8"))["latest"] == "v1.0.0"
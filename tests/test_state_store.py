@@ -0,0 +1,275 @@
+"""
+Tests für die State-Backends (JSON / SQLite) und die Migration.
+"""
+import json
+import subprocess
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import perlentaucher as core  # noqa: E402
+from src import state_store  # noqa: E402
+
+
+def test_backend_by_extension(tmp_path):
+    assert state_store.backend_name_for_path(str(tmp_path / "s.json")) == "json"
+    assert state_store.backend_name_for_path(str(tmp_path / "s.sqlite3")) == "sqlite"
+    assert state_store.state_path_for_backend("/x/.perlentaucher_state.json", "sqlite") == "/x/.perlentaucher_state.sqlite3"
+    assert state_store.state_path_for_backend("/x/state.db", "sqlite") == "/x/state.db"
+    assert state_store.state_path_for_backend("/x/state.db", None) == "/x/state.db"
+
+
+def test_backend_interface_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        state_store.StateBackend(str(tmp_path / "s.json"))
+
+
+def test_sqlite_roundtrip_through_core_api(tmp_path):
+    db = str(tmp_path / "state.sqlite3")
+    core.save_processed_entry(db, "a", status="download_success", movie_title="Film", filename="f.mp4")
+    core.save_processed_entry(db, "b", status="skipped")
+    core.save_processed_entry(db, "a", status="download_failed", movie_title="Film")
+    assert core.load_processed_entries(db) == {"a", "b"}
+    data = core.load_state_file(db)
+    assert data["entries"]["a"]["status"] == "download_failed"
+    assert "filename" not in data["entries"]["a"]
+    assert data["last_updated"]
+
+
+def test_sqlite_migrates_sibling_json_once(tmp_path):
+    legacy = tmp_path / "state.json"
+    legacy.write_text(json.dumps({"processed_entries": ["x", "y"], "last_updated": "2024-01-01T00:00:00"}))
+    db = str(tmp_path / "state.sqlite3")
+    assert core.load_processed_entries(db) == {"x", "y"}
+    assert core.load_state_file(db)["entries"]["x"]["status"] == "unknown"
+    # JSON bleibt unverändert, spätere Änderungen daran werden nicht erneut übernommen
+    legacy.write_text(json.dumps({"processed_entries": ["z"]}))
+    state_store._backends.clear()
+    assert core.load_processed_entries(db) == {"x", "y"}
+
+
+def test_export_json_matches_state_file_format(tmp_path):
+    db = str(tmp_path / "state.sqlite3")
+    core.save_processed_entry(db, "e1", status="not_found", movie_title="T")
+    out = tmp_path / "export.json"
+    assert state_store.get_state_backend(db).export_json(str(out)) == 1
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert data["processed_entries"] == ["e1"]
+    assert core.load_processed_entries(str(out)) == {"e1"}
+
+
+def test_sqlite_concurrent_writers(tmp_path):
+    db = str(tmp_path / "state.sqlite3")
+
+    def writer(n):
+        for i in range(25):
+            core.save_processed_entry(db, f"w{n}_{i}", status="skipped")
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(core.load_processed_entries(db)) == 100
+
+
+def test_json_backend_keeps_legacy_format(tmp_path):
+    path = str(tmp_path / "state.json")
+    core.save_processed_entry(path, "a", status="skipped", is_series=True)
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    assert data["processed_entries"] == ["a"]
+    assert data["entries"]["a"]["is_series"] is True
+
+
+def test_session_batches_writes_until_flush(tmp_path):
+    path = tmp_path / "state.json"
+    with state_store.state_session(str(path), flush_interval=0) as session:
+        for i in range(50):
+            core.save_processed_entry(str(path), f"p{i}", status="skipped")
+        # Noch nichts geschrieben, aber über die Core-API sichtbar
+        assert not path.exists()
+        assert len(core.load_processed_entries(str(path))) == 50
+        assert core.load_state_file(str(path))["entries"]["p7"]["status"] == "skipped"
+    assert session.flush_count == 1
+    assert state_store.active_state_session(str(path)) is None
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert len(data["processed_entries"]) == 50
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+def test_session_flushes_at_max_pending_and_on_timer(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    with state_store.state_session(path, flush_interval=0, max_pending=10) as session:
+        for i in range(25):
+            core.save_processed_entry(path, f"p{i}", status="skipped")
+        assert session.flush_count == 2
+        assert session.pending_count() == 5
+    with state_store.state_session(path, flush_interval=0.05) as session:
+        core.save_processed_entry(path, "late", status="skipped")
+        for _ in range(100):
+            if session.flush_count:
+                break
+            threading.Event().wait(0.02)
+        assert session.flush_count == 1
+    assert "late" in state_store.get_state_backend(path).entry_ids()
+
+
+def test_nested_sessions_share_state_and_flush_all(tmp_path):
+    path = str(tmp_path / "state.json")
+    outer = state_store.open_state_session(path, flush_interval=0)
+    try:
+        with state_store.state_session(path) as inner:
+            assert inner is outer
+            core.save_processed_entry(path, "a", status="skipped")
+        # Innere Freigabe schreibt, die Sitzung bleibt aber aktiv
+        assert state_store.active_state_session(path) is outer
+        core.save_processed_entry(path, "b", status="skipped")
+        state_store.flush_all_sessions()
+        assert json.loads(Path(path).read_text(encoding="utf-8"))["processed_entries"] == ["a", "b"]
+    finally:
+        state_store.release_state_session(outer)
+    assert state_store.active_state_session(path) is None
+
+
+def _seed_compaction_state(path):
+    old = "2020-01-01T10:00:00"
+    new = datetime.now().isoformat()
+    entries = {
+        "serie": {"status": "download_success", "timestamp": new, "is_series": True, "episodes": ["S01E01", "S01E02"]},
+        "serie_S01E01": {"status": "download_success", "timestamp": new, "filename": "e1.mp4", "movie_title": "X"},
+        "serie_S01E02": {"status": "download_failed", "timestamp": new, "movie_title": "X"},
+        "waise_S02E03": {"status": "download_success", "timestamp": new},
+        "alt": {"status": "skipped", "timestamp": old},
+        "wishlist:1": {"status": "download_success", "timestamp": old},
+        "ohne_zeit": {"status": "unknown", "timestamp": "kaputt"},
+    }
+    state_store.get_state_backend(path).put_entries(entries)
+
+
+@pytest.mark.parametrize("name", ["state.json", "state.sqlite3"])
+def test_compact_collapses_episodes_and_archives_old(tmp_path, name):
+    path = str(tmp_path / name)
+    _seed_compaction_state(path)
+    report = state_store.compact_state(path, retention_days=30)
+    assert (report.entries_before, report.entries_after) == (7, 3)
+    assert report.episodes_collapsed == 2 and report.archived == 2
+    data = core.load_state_file(path)["entries"]
+    assert set(data) == {"serie", "waise_S02E03", "ohne_zeit"}
+    assert data["serie"]["episode_status"]["S01E01"]["filename"] == "e1.mp4"
+    assert data["serie"]["episode_status"]["S01E02"]["status"] == "download_failed"
+    archived = state_store.read_state_archive(path)
+    assert sorted(a["entry_id"] for a in archived) == ["alt", "wishlist:1"]
+    assert "gespart" in report.summary()
+    # Zweiter Lauf ändert nichts mehr
+    again = state_store.compact_state(path, retention_days=30)
+    assert again.entries_before == again.entries_after == 3
+
+
+@pytest.mark.parametrize("name", ["state.json", "state.sqlite3"])
+def test_resaving_series_keeps_episode_status(tmp_path, name):
+    path = str(tmp_path / name)
+    _seed_compaction_state(path)
+    state_store.compact_state(path, retention_days=30)
+    core.save_processed_entry(path, "serie", status="download_success", movie_title="X", is_series=True)
+    entry = core.load_state_file(path)["entries"]["serie"]
+    assert entry["status"] == "download_success"
+    assert set(entry["episode_status"]) == {"S01E01", "S01E02"}
+
+
+@pytest.mark.parametrize("name", ["state.json", "state.sqlite3"])
+def test_compact_waits_for_concurrent_writer(tmp_path, name):
+    path = str(tmp_path / name)
+    _seed_compaction_state(path)
+    backend = state_store.get_state_backend(path)
+    original = backend.rewrite_entries
+    writer = []
+
+    def rewrite(transform):
+        def during(entries):
+            # Ein anderer Thread schreibt mitten in der Kompaktierung
+            t = threading.Thread(target=backend.put_entry, args=("neu", {"status": "skipped", "timestamp": "x"}))
+            t.start()
+            writer.append(t)
+            t.join(0.2)
+            return transform(entries)
+
+        return original(during)
+
+    backend.rewrite_entries = rewrite
+    try:
+        state_store.compact_state(path, retention_days=30)
+    finally:
+        del backend.rewrite_entries
+    writer[0].join(5)
+    assert "neu" in core.load_state_file(path)["entries"]
+
+
+@pytest.mark.parametrize("name", ["state.json", "state.sqlite3"])
+def test_compact_through_open_session(tmp_path, name):
+    path = str(tmp_path / name)
+    _seed_compaction_state(path)
+    with state_store.state_session(path, flush_interval=0) as session:
+        session.record("offen", {"status": "skipped", "timestamp": datetime.now().isoformat()})
+        backend = state_store.get_state_backend(path)
+        original = backend.rewrite_entries
+
+        def rewrite(transform):
+            # Die Sitzung darf während der Kompaktierung nicht schreiben
+            assert not session._flush_lock.acquire(blocking=False)
+            session.record("neu", {"status": "skipped", "timestamp": datetime.now().isoformat()})
+            return original(transform)
+
+        backend.rewrite_entries = rewrite
+        try:
+            state_store.compact_state(path, retention_days=30)
+        finally:
+            del backend.rewrite_entries
+        assert session.pending_count() == 1
+        assert "neu" in session.entry_ids()
+    entries = core.load_state_file(path)["entries"]
+    assert {"offen", "neu"} <= set(entries)
+
+
+def test_compact_json_reports_size_saved(tmp_path):
+    path = str(tmp_path / "state.json")
+    backend = state_store.get_state_backend(path)
+    backend.put_entries(
+        {f"s_S01E{i:02d}": {"status": "download_success", "timestamp": "2021-01-01T00:00:00"} for i in range(1, 60)}
+    )
+    backend.put_entry("s", {"status": "download_success", "timestamp": "2021-01-01T00:00:00"})
+    report = state_store.compact_state(path, retention_days=0)
+    assert report.entries_after == 1
+    assert report.bytes_saved > 0 and report.bytes_after == Path(path).stat().st_size
+
+
+def test_maybe_compact_only_above_threshold(tmp_path):
+    path = str(tmp_path / "state.json")
+    _seed_compaction_state(path)
+    assert state_store.maybe_compact_state(path, threshold=10) is None
+    assert state_store.maybe_compact_state(path, threshold=0) is None
+    report = state_store.maybe_compact_state(path, threshold=5, retention_days=30)
+    assert report is not None and report.entries_after == 3
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="SIGHUP nur unter POSIX")
+def test_signal_flush_keeps_ignored_sighup():
+    # Unter nohup ist SIGHUP ignoriert; danach darf SIGHUP den Prozess nicht beenden
+    code = (
+        "import os, signal, sys\n"
+        f"sys.path.insert(0, {str(project_root)!r})\n"
+        "from src import state_store\n"
+        "signal.signal(signal.SIGHUP, signal.SIG_IGN)\n"
+        "state_store.install_signal_flush()\n"
+        "assert signal.getsignal(signal.SIGHUP) == signal.SIG_IGN\n"
+        "os.kill(os.getpid(), signal.SIGHUP)\n"
+        "print('weiter')\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "weiter"
@@ -174,6 +174,25 @@ def test_check_wishlist_availability(tmp_path):
         assert avail[0].title == "Only"
 
 
+def test_check_wishlist_availability_survives_item_error(tmp_path):
+    p = str(tmp_path / "wl.json")
+    add_item(p, "Kaputt", None, "movie")
+    add_item(p, "Gut", None, "movie")
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+
+    def fake_search(title, **kwargs):
+        if title == "Kaputt":
+            raise ValueError("unerwartete Antwort")
+        return {"ok": True}
+
+    with patch.object(wc.core, "get_metadata", return_value=meta), patch.object(
+        wc.core, "search_mediathek", side_effect=fake_search
+    ):
+        avail, total = check_wishlist_availability(p)
+    assert [x.title for x in avail] == ["Gut"]
+    assert total == 2
+
+
 def test_probe_serien_skipped():
     item = WishlistItem(
         id="i1", title="S", year=None, kind="series", created_at="", note=""
@@ -364,3 +383,305 @@ def test_add_remove_item(tmp_path):
     assert remove_item(str(p), it.id)
     assert len(load_wishlist(str(p))["items"]) == 0
     assert not remove_item(str(p), "bogus")
+
+
+def test_process_wishlist_parallel_matches_sequential(tmp_path):
+    """Parallele Suchen: gleiche Einträge entfernt, gleiche Zählwerte; Downloads seriell in Listenreihenfolge."""
+    import threading
+    import time
+
+    titles = [f"T{i}" for i in range(8)]
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+    outcomes = {}
+    for workers in (1, 4):
+        p = str(tmp_path / f"wl{workers}.json")
+        for t in titles:
+            add_item(p, t, None, "movie")
+        args = _args_base(tmp_path, wishlist_workers=workers)
+        lock = threading.Lock()
+        active = {"search": 0, "search_max": 0, "dl": 0, "dl_max": 0}
+        order = []
+
+        def fake_search(title, **kwargs):
+            with lock:
+                active["search"] += 1
+                active["search_max"] = max(active["search_max"], active["search"])
+            time.sleep(0.02 * (len(titles) - int(title[1:])))
+            with lock:
+                active["search"] -= 1
+            # Jeder dritte Titel ohne Treffer
+            return None if int(title[1:]) % 3 == 0 else {"title": title, "url_video": "http://x/v.mp4"}
+
+        def fake_download(result, download_dir, title, *a, **k):
+            with lock:
+                active["dl"] += 1
+                active["dl_max"] = max(active["dl_max"], active["dl"])
+            time.sleep(0.005)
+            with lock:
+                active["dl"] -= 1
+                order.append(title)
+            return (title != "T4", title, None, False)
+
+        with patch.object(wc.core, "get_metadata", return_value=meta), patch.object(
+            wc.core, "search_mediathek", side_effect=fake_search
+        ), patch.object(wc.core, "download_content", side_effect=fake_download):
+            counts = process_wishlist_items(p, args)
+        outcomes[workers] = (counts, [i.title for i in list_items(p)], order, dict(active))
+
+    seq, par = outcomes[1], outcomes[4]
+    assert seq[0] == par[0] == (8, 4)
+    assert seq[1] == par[1] == ["T0", "T3", "T4", "T6"]
+    assert seq[2] == par[2] == ["T1", "T2", "T4", "T5", "T7"]
+    assert par[3]["search_max"] > 1
+    assert par[3]["dl_max"] == 1
+
+
+def test_process_wishlist_lookup_error_counts_as_not_found(tmp_path):
+    """Eine fehlschlagende Suche bricht den Lauf nicht ab; spätere Einträge werden trotzdem geladen."""
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+
+    def fake_search(title, **kwargs):
+        if title == "T1":
+            raise RuntimeError("Mediathek nicht erreichbar")
+        return {"title": title, "url_video": "http://x/v.mp4"}
+
+    outcomes = {}
+    for workers in (1, 4):
+        p = str(tmp_path / f"wl{workers}.json")
+        for t in ("T0", "T1", "T2", "T3"):
+            add_item(p, t, None, "movie")
+        args = _args_base(tmp_path, wishlist_workers=workers)
+        with patch.object(wc.core, "get_metadata", return_value=meta), patch.object(
+            wc.core, "search_mediathek", side_effect=fake_search
+        ), patch.object(wc.core, "download_content", return_value=(True, "x", None, False)) as dl:
+            counts = process_wishlist_items(p, args)
+        outcomes[workers] = (counts, [i.title for i in list_items(p)], dl.call_count)
+    assert outcomes[1] == outcomes[4] == ((4, 3), ["T1"], 3)
+
+
+def test_process_wishlist_cancel_and_progress(tmp_path):
+    """``args.cancel_check``: nach dem Abbruch keine weiteren Downloads; Fortschritt pro Eintrag."""
+    p = str(tmp_path / "wl.json")
+    for t in ("A", "B", "C"):
+        add_item(p, t, None, "movie")
+    reports = []
+    args = _args_base(
+        tmp_path,
+        cancel_check=lambda: len(reports) >= 1,
+        wishlist_progress=lambda done, total, title: reports.append((done, total, title)),
+    )
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+    with patch.object(wc.core, "get_metadata", return_value=meta), patch.object(
+        wc.core, "search_mediathek", side_effect=lambda title, **k: {"title": title, "url_video": "http://x/v.mp4"}
+    ), patch.object(wc.core, "download_content", return_value=(True, "A", None, False)) as dl:
+        assert process_wishlist_items(p, args) == (1, 1)
+    assert reports == [(1, 3, "A")]
+    assert dl.call_count == 1
+    assert dl.call_args.kwargs["cancel_check"] is args.cancel_check
+    assert [i.title for i in list_items(p)] == ["B", "C"]
+
+
+def test_ttl_cache_expiry_and_invalidate():
+    from src.wishlist_cache import TtlCache
+
+    now = [0.0]
+    c = TtlCache(10, max_entries=2, clock=lambda: now[0])
+    c.put(("a", 1), "A")
+    c.put(("b", 1), "B")
+    assert c.get(("a", 1)) == "A"
+    c.put(("c", 1), "C")  # verdrängt den am längsten unbenutzten Eintrag ("b")
+    assert c.get(("b", 1)) is None
+    assert c.invalidate("a") == 1
+    assert c.get(("a", 1)) is None
+    now[0] = 10.0
+    assert c.get(("c", 1)) is None
+
+
+def test_check_then_process_searches_once(tmp_path):
+    p = str(tmp_path / "wl.json")
+    for t in ("A", "B", "C"):
+        add_item(p, t, None, "movie")
+    args = _args_base(tmp_path)
+    os.makedirs(args.download_dir, exist_ok=True)
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+
+    def fake_search(title, **kwargs):
+        return None if title == "C" else {"title": title, "url_video": f"http://x/{title}.mp4"}
+
+    with patch.object(wc.core, "get_metadata", return_value=meta), patch.object(
+        wc.core, "search_mediathek", side_effect=fake_search
+    ) as search, patch.object(
+        wc.core, "download_content", return_value=(True, "t", None, False)
+    ) as dl:
+        avail, total = check_wishlist_availability(p)
+        assert (sorted(x.title for x in avail), total) == (["A", "B"], 3)
+        assert search.call_count == 3
+        # "C" wurde beim Prüfen nicht gefunden und ist damit erst später wieder fällig
+        assert process_wishlist_items(p, args) == (2, 2)
+        assert search.call_count == 3
+        assert [c.args[0]["url_video"] for c in dl.call_args_list] == ["http://x/A.mp4", "http://x/B.mp4"]
+        # Erzwungen: "C" nutzt das noch frische Prüfergebnis, A/B sind verbraucht und entfernt
+        assert process_wishlist_items(p, args, force_all=True) == (1, 0)
+        assert search.call_count == 3
+        wc.availability_cache.clear()
+        assert process_wishlist_items(p, args, force_all=True) == (1, 0)
+        assert search.call_count == 4
+
+
+def test_check_result_reused_by_process_one(tmp_path):
+    p = str(tmp_path / "wl.json")
+    it = add_item(p, "A", None, "movie")
+    args = _args_base(tmp_path)
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+    with patch.object(wc.core, "get_metadata", return_value=meta) as gm, patch.object(
+        wc.core, "search_mediathek", return_value={"title": "A", "url_video": "http://x/a.mp4"}
+    ), patch.object(wc.core, "list_mediathek_movie_candidates") as cands, patch.object(
+        wc.core, "download_content", return_value=(True, "A", None, False)
+    ):
+        check_wishlist_availability(p)
+        ok, code = process_one_wishlist_item(p, it.id, args)
+    assert (ok, code) == (True, "success")
+    cands.assert_not_called()
+    assert gm.call_count == 1
+
+
+def test_check_result_ignored_for_other_preferences(tmp_path):
+    p = str(tmp_path / "wl.json")
+    add_item(p, "A", None, "movie")
+    args = _args_base(tmp_path, sprache="englisch")
+    os.makedirs(args.download_dir, exist_ok=True)
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+    with patch.object(wc.core, "get_metadata", return_value=meta), patch.object(
+        wc.core, "search_mediathek", return_value={"title": "A", "url_video": "http://x/a.mp4"}
+    ) as search, patch.object(wc.core, "download_content", return_value=(True, "A", None, False)):
+        check_wishlist_availability(p, sprache="deutsch")
+        process_wishlist_items(p, args)
+    assert search.call_count == 2
+
+
+def test_recheck_backoff_and_reset():
+    from datetime import datetime, timedelta
+
+    from src.wishlist_schedule import RECHECK_BASE_HOURS, RECHECK_MAX_HOURS, is_due, record_check
+
+    t0 = datetime(2026, 1, 1, 12, 0, 0)
+    item = {"id": "x", "title": "X"}
+    assert is_due(item, t0)
+    delays = []
+    for _ in range(8):
+        item = record_check(item, found=False, now=t0)
+        due_at = datetime.fromisoformat(item["next_check"])
+        delays.append((due_at - t0) / timedelta(hours=1))
+        assert not is_due(item, t0) and is_due(item, due_at)
+    assert delays[:3] == [RECHECK_BASE_HOURS, 2 * RECHECK_BASE_HOURS, 4 * RECHECK_BASE_HOURS]
+    assert delays[-1] == RECHECK_MAX_HOURS
+    item = record_check(item, found=True, now=t0)
+    assert item["misses"] == 0 and item["next_check"] is None and is_due(item, t0)
+
+
+def test_process_skips_items_not_due(tmp_path):
+    from src.wishlist_schedule import record_check
+
+    p = str(tmp_path / "wl.json")
+    fresh = add_item(p, "Frisch", None, "movie")
+    old = add_item(p, "Lange weg", None, "movie")
+    repo = wc.get_wishlist_repository(p)
+    repo.update(record_check(repo.get(old.id), found=False))
+    args = _args_base(tmp_path)
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+    with patch.object(wc.core, "get_metadata", return_value=meta), patch.object(
+        wc.core, "search_mediathek", return_value=None
+    ) as search:
+        assert process_wishlist_items(p, args) == (1, 0)
+        assert [c.args[0] for c in search.call_args_list] == ["Frisch"]
+        assert repo.get(fresh.id)["misses"] == 1
+        args.wishlist_force_all = True
+        assert process_wishlist_items(p, args) == (2, 0)
+    assert repo.get(old.id)["misses"] == 2
+
+
+def test_failed_search_leaves_schedule_unchanged(tmp_path):
+    """Mediathek nicht erreichbar bzw. Ausnahme in der Suche: keine Fehlsuche, kein Zurückstellen."""
+    p = str(tmp_path / "wl.json")
+    a = add_item(p, "Ausfall", None, "movie")
+    b = add_item(p, "Kaputt", None, "movie")
+    repo = wc.get_wishlist_repository(p)
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+    real_search = wc.core.search_mediathek
+
+    def search(title, **kwargs):
+        if title == "Kaputt":
+            raise RuntimeError("unerwartet")
+        return real_search(title, **kwargs)
+
+    down = wc.core.requests.ConnectionError("MVW down")
+    with patch.object(wc.core, "get_metadata", return_value=meta), patch.object(
+        wc.core, "search_mediathek", side_effect=search
+    ), patch.object(wc.core.requests, "post", side_effect=down), patch.object(
+        wc.core.requests, "get", side_effect=down
+    ):
+        assert process_wishlist_items(p, _args_base(tmp_path)) == (2, 0)
+    for item_id in (a.id, b.id):
+        raw = repo.get(item_id)
+        assert not raw.get("misses") and not raw.get("next_check")
+
+
+def test_manual_check_covers_items_not_due(tmp_path):
+    from src.wishlist_schedule import record_check
+
+    p = str(tmp_path / "wl.json")
+    it = add_item(p, "Zurückgestellt", None, "movie")
+    repo = wc.get_wishlist_repository(p)
+    repo.update(record_check(repo.get(it.id), found=False))
+    hit = {"title": "Zurückgestellt", "url_video": "http://x/v.mp4"}
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+    with patch.object(wc.core, "get_metadata", return_value=meta), patch.object(
+        wc.core, "search_mediathek", return_value=hit
+    ):
+        assert check_wishlist_availability(p)[0] == []
+        avail, total = check_wishlist_availability(p, force_all=True)
+    assert [x.id for x in avail] == [it.id] and total == 1
+
+
+def _cands(*titles):
+    return [
+        {"title": t, "score": 10.0 - i, "title_similarity": 0.9, "result": {"title": t, "url_video": f"http://x/{t}"}}
+        for i, t in enumerate(titles)
+    ]
+
+
+def test_probe_candidates_reused_by_download_one(tmp_path):
+    p = str(tmp_path / "wl.json")
+    it = add_item(p, "Film", None, "movie")
+    args = _args_base(tmp_path)
+    meta = {"year": None, "content_type": "movie", "provider_id": None}
+    with patch.object(wc.core, "get_metadata", return_value=meta) as gm, patch.object(
+        wc.core, "list_mediathek_movie_candidates", side_effect=[_cands("A", "B"), _cands("Z")]
+    ) as lc, patch.object(wc.core, "download_content", return_value=(True, "B", None, False)) as dl:
+        r = probe_wishlist_item(it)
+        assert [c["title"] for c in r["candidates"]] == ["A", "B"]
+        ok, code = process_one_wishlist_item(p, it.id, args, candidate_index=1)
+    assert (ok, code) == (True, "success")
+    # Genau der gewählte Kandidat, ohne zweite Suche (die würde eine andere Liste liefern)
+    assert dl.call_args.args[0]["title"] == "B"
+    assert lc.call_count == 1 and gm.call_count == 1
+
+
+def test_probe_staffel_reused_and_other_prefs_search_again(tmp_path):
+    p = str(tmp_path / "wl.json")
+    it = add_item(p, "Serie", None, "series")
+    args = _args_base(tmp_path, serien_download="staffel")
+    meta = {"year": None, "content_type": "tv", "provider_id": None}
+    eps = [{"title": "S01E01", "url_video": "http://x/1"}]
+    with patch.object(wc.core, "get_metadata", return_value=meta), patch.object(
+        wc.core, "search_mediathek_series", return_value=eps
+    ) as ss, patch.object(wc.core, "extract_episode_info", return_value=(1, 1)), patch.object(
+        wc.core, "score_movie", return_value=1.0
+    ), patch.object(wc.core, "download_content", return_value=(True, "S01E01", None, False)):
+        probe_wishlist_item(it, serien_download="staffel", sprache="englisch")
+        process_one_wishlist_item(p, it.id, args, remove_on_success=False)
+        assert ss.call_count == 2  # andere Sprache → eigener Schlüssel, neue Suche
+        probe_wishlist_item(it, serien_download="staffel")
+        ok, code = process_one_wishlist_item(p, it.id, args)
+    assert (ok, code) == (True, "success")
+    assert ss.call_count == 3
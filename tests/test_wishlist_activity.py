@@ -2,23 +2,34 @@
 Tests für wishlist_activity (Aktivitätslog ohne GUI).
 """
 import json
+import logging
+import queue
+import sqlite3
+import subprocess
 import sys
+import threading
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from src import wishlist_activity  # noqa: E402
 from src.wishlist_activity import (  # noqa: E402
     ACTIVITY_FILENAME,
+    LEGACY_ACTIVITY_FILENAME,
     LEGACY_WISHLIST_ACTIVITY,
     append_activity,
     clear_activity,
     default_activity_path,
+    flush_activity,
+    iter_activity,
     list_activity,
     log_activity_event,
     log_wishlist_item_result,
     query_activity,
+    query_activity_page,
     resolve_activity_path,
+    submit_activity,
     summarize_probe_for_log,
 )
 
@@ -45,6 +56,21 @@ class TestResolveActivityPath:
         p = resolve_activity_path(str(tmp_path))
         assert p == str(new)
         assert new.exists()
+        assert list_activity(p)[0]["label"] == "L"
+
+    def test_migrates_legacy_json_to_jsonl_oldest_first(self, tmp_path):
+        entries = [
+            {"ts": f"2021-01-0{i}T00:00:00+00:00", "action": "a", "label": f"E{i}", "level": "info"}
+            for i in (3, 2, 1)
+        ]
+        (tmp_path / LEGACY_ACTIVITY_FILENAME).write_text(
+            json.dumps({"version": 2, "entries": entries}, indent=2), encoding="utf-8"
+        )
+        p = resolve_activity_path(str(tmp_path))
+        lines = Path(p).read_text(encoding="utf-8").splitlines()
+        assert [json.loads(x)["label"] for x in lines] == ["E1", "E2", "E3"]
+        append_activity(p, "a", "E4")
+        assert [e["label"] for e in list_activity(p)] == ["E4", "E3", "E2", "E1"]
 
     def test_no_migration_when_new_already_exists(self, tmp_path):
         new = tmp_path / ACTIVITY_FILENAME
@@ -78,6 +104,152 @@ class TestListAndClear:
         assert len(list_activity(str(p), limit=0)) == 1
 
 
+class TestJsonLinesLog:
+    def test_append_only_and_uncapped(self, tmp_path):
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        for i in range(450):
+            append_activity(p, "a", f"x{i}")
+        lines = Path(p).read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 450
+        assert json.loads(lines[0])["label"] == "x0"
+        rows, total = query_activity(p, limit=2, offset=0)
+        assert total == 450
+        assert [r["label"] for r in rows] == ["x449", "x448"]
+
+    def test_reverse_read_across_blocks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(wishlist_activity, "_READ_BLOCK", 37)
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        for i in range(30):
+            append_activity(p, "a", f"label-{i}", "d" * (i % 7))
+        assert [e["label"] for e in iter_activity(p)] == [f"label-{i}" for i in reversed(range(30))]
+
+    def test_rotation_by_size_keeps_history_readable(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(wishlist_activity, "ROTATE_MAX_BYTES", 600)
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        for i in range(40):
+            append_activity(p, "a", f"r{i}")
+        segs = sorted(tmp_path.glob(ACTIVITY_FILENAME + ".*.gz"))
+        assert len(segs) >= 3
+        assert not Path(p).exists() or Path(p).stat().st_size < 600
+        assert [e["label"] for e in iter_activity(p)] == [f"r{i}" for i in reversed(range(40))]
+        rows, total = query_activity(p, q="r3", limit=20)
+        assert total == 11
+        clear_activity(p)
+        assert list_activity(p) == []
+        assert not list(tmp_path.glob(ACTIVITY_FILENAME + ".*.gz"))
+
+    def test_rotation_by_age(self, tmp_path):
+        p = tmp_path / ACTIVITY_FILENAME
+        old = {"ts": "2020-01-01T00:00:00+00:00", "action": "a", "label": "alt", "level": "info"}
+        p.write_text(json.dumps(old) + "\n", encoding="utf-8")
+        append_activity(str(p), "a", "neu")
+        assert len(list(tmp_path.glob(ACTIVITY_FILENAME + ".*.gz"))) == 1
+        assert not p.exists() or p.stat().st_size == 0
+        assert [e["label"] for e in list_activity(str(p))] == ["neu", "alt"]
+
+    def test_rotation_across_processes_loses_nothing(self, tmp_path):
+        # CLI, GUI und Web schreiben dieselbe Datei; Rotation darf keine Zeile und kein Segment verlieren
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        code = (
+            "import sys\n"
+            f"sys.path.insert(0, {str(project_root)!r})\n"
+            "from src import wishlist_activity as wa\n"
+            "wa.ROTATE_MAX_BYTES = 700\n"
+            "for i in range(80):\n"
+            f"    wa.append_activity({p!r}, 'a', f'{{sys.argv[1]}}-{{i}}')\n"
+        )
+        procs = [subprocess.Popen([sys.executable, "-c", code, f"p{n}"], stderr=subprocess.PIPE) for n in range(4)]
+        for proc in procs:
+            _out, err = proc.communicate(timeout=120)
+            assert proc.returncode == 0, err.decode()
+        labels = [e["label"] for e in iter_activity(p)]
+        assert sorted(labels) == sorted(f"p{n}-{i}" for n in range(4) for i in range(80))
+        assert not list(tmp_path.glob("*.rotating")) and not list(tmp_path.glob("*.tmp"))
+
+    def test_skips_broken_lines(self, tmp_path):
+        p = tmp_path / ACTIVITY_FILENAME
+        append_activity(str(p), "a", "ok1")
+        append_activity(str(p), "a", "ok2")
+        with open(p, "a", encoding="utf-8") as f:
+            f.write('{"ts": "kaputt')
+        append_activity(str(p), "a", "ok3")
+        assert [e["label"] for e in list_activity(str(p))] == ["ok3", "ok2", "ok1"]
+
+
+class TestActivityIndex:
+    def test_cursor_pages_are_stable_while_appending(self, tmp_path):
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        for i in range(7):
+            append_activity(p, "a", f"n{i}")
+        first = query_activity_page(p, limit=3)
+        assert [e["label"] for e in first["entries"]] == ["n6", "n5", "n4"]
+        append_activity(p, "a", "neu")
+        second = query_activity_page(p, limit=3, cursor=first["next_cursor"])
+        assert [e["label"] for e in second["entries"]] == ["n3", "n2", "n1"]
+        third = query_activity_page(p, limit=3, cursor=second["next_cursor"])
+        assert [e["label"] for e in third["entries"]] == ["n0"]
+        assert third["next_cursor"] is None
+        assert third["total"] == 8
+
+    def test_text_search_substring_and_case(self, tmp_path):
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        append_activity(p, "feed_download", "Größenwahn", "Datei GEFUNDEN", "success")
+        append_activity(p, "pruefen", "Andere", "nichts", "info")
+        assert query_activity_page(p, q="gefund")["total"] == 1
+        assert query_activity_page(p, q="grö")["total"] == 1
+        # kürzer als ein Trigramm: Teilstring-Scan
+        assert [e["label"] for e in query_activity_page(p, q="ä")["entries"]] == []
+        assert query_activity_page(p, q="er")["total"] == 1
+        assert query_activity_page(p, q="feed", level="success")["total"] == 1
+
+    def test_index_follows_rotation_without_duplicates(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(wishlist_activity, "ROTATE_MAX_BYTES", 900)
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        for i in range(5):
+            append_activity(p, "a", f"v{i}")
+        assert query_activity_page(p)["total"] == 5
+        for i in range(5, 25):
+            append_activity(p, "a", f"v{i}")
+        page = query_activity_page(p, limit=200)
+        assert page["total"] == 25
+        assert [e["label"] for e in page["entries"]] == [f"v{i}" for i in reversed(range(25))]
+
+    def test_unchanged_log_skips_write_transaction(self, tmp_path, monkeypatch):
+        from src import activity_index
+
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        append_activity(p, "a", "eins")
+        index = activity_index.get_activity_index(p)  # zieht bereits nach
+        monkeypatch.setattr(activity_index, "BUSY_TIMEOUT_MS", 50)
+        blocker = sqlite3.connect(index.path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        try:
+            # Ohne Änderung keine Schreibsperre nötig — sonst "database is locked"
+            assert index.sync() == 0
+        finally:
+            blocker.execute("ROLLBACK")
+            blocker.close()
+        append_activity(p, "a", "zwei")
+        assert index.sync() > 0
+        assert query_activity_page(p)["total"] == 2
+
+    def test_legacy_lines_without_id_are_indexed(self, tmp_path):
+        p = tmp_path / ACTIVITY_FILENAME
+        line = {"ts": "2021-01-01T00:00:00+00:00", "action": "a", "label": "alt", "level": "info"}
+        p.write_text(json.dumps(line) + "\n" + json.dumps(line) + "\n", encoding="utf-8")
+        rows = query_activity_page(str(p))["entries"]
+        # Identische Zeilen ohne ID sind nicht unterscheidbar und zählen einmal
+        assert [e["label"] for e in rows] == ["alt"]
+        assert rows[0]["id"].startswith("h")
+
+    def test_clear_removes_index(self, tmp_path):
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        append_activity(p, "a", "x")
+        assert query_activity_page(p)["total"] == 1
+        clear_activity(p)
+        assert query_activity_page(p)["total"] == 0
+
+
 class TestQueryActivity:
     def test_filter_level_and_pagination(self, tmp_path):
         p = str(tmp_path / ACTIVITY_FILENAME)
@@ -203,3 +375,104 @@ class TestLogActivityEvent:
         e = list_activity(resolve_activity_path(dd))
         assert e[0]["action"] == "act"
         assert e[0]["source"] == "gui"
+
+
+class TestAsyncWriter:
+    def test_log_event_is_queued_and_visible_before_flush(self, tmp_path, monkeypatch):
+        flush_activity()
+        monkeypatch.setattr(wishlist_activity, "ACTIVITY_FLUSH_SECONDS", 60)
+        dd = str(tmp_path)
+        path = resolve_activity_path(dd)
+        for i in range(3):
+            log_activity_event(dd, "act", f"q{i}")
+        assert not Path(path).exists() or Path(path).read_text(encoding="utf-8") == ""
+        assert [e["label"] for e in list_activity(path)] == ["q2", "q1", "q0"]
+        assert flush_activity() == 3
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+        assert [json.loads(x)["label"] for x in lines] == ["q0", "q1", "q2"]
+        assert [e["label"] for e in list_activity(path)] == ["q2", "q1", "q0"]
+
+    def test_query_flushes_pending_events(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(wishlist_activity, "ACTIVITY_FLUSH_SECONDS", 60)
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        append_activity(p, "a", "alt")
+        submit_activity(p, "a", "neu", level="warning")
+        page = query_activity_page(p, level="warning")
+        assert [e["label"] for e in page["entries"]] == ["neu"]
+        assert query_activity_page(p)["total"] == 2
+
+    def test_background_thread_writes_batch(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(wishlist_activity, "ACTIVITY_FLUSH_SECONDS", 0.01)
+        writer = wishlist_activity._ActivityWriter()
+        p = tmp_path / ACTIVITY_FILENAME
+        for i in range(20):
+            writer.submit(str(p), wishlist_activity._make_entry("a", f"b{i}", "", "info", "cli"))
+        for _ in range(200):
+            # Erst nach dem Schreiben verschwinden die Einträge aus ``pending``
+            if p.exists() and len(p.read_text(encoding="utf-8").splitlines()) == 20 and not writer.pending(str(p)):
+                break
+            threading.Event().wait(0.01)
+        assert len(p.read_text(encoding="utf-8").splitlines()) == 20
+        assert writer.pending(str(p)) == []
+
+    def test_write_error_logs_dropped_count(self, tmp_path, monkeypatch, caplog):
+        writer = wishlist_activity._ActivityWriter()
+        writer._ensure_thread = lambda: None
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        for i in range(3):
+            writer.submit(p, wishlist_activity._make_entry("a", f"e{i}", "", "info", "cli"))
+
+        def fail(path, entries):
+            raise OSError("Datenträger voll")
+
+        monkeypatch.setattr(wishlist_activity, "_write_entries", fail)
+        with caplog.at_level(logging.WARNING):
+            assert writer.flush() == 3
+        assert "3 Ereignisse verworfen" in caplog.text
+        assert writer.pending(p) == []
+
+    def test_full_queue_drops_with_policy(self, tmp_path, monkeypatch):
+        writer = wishlist_activity._ActivityWriter()
+        writer._queue = queue.Queue(maxsize=2)
+        writer._ensure_thread = lambda: None
+        monkeypatch.setattr(wishlist_activity, "ACTIVITY_QUEUE_POLICY", "drop")
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        results = [writer.submit(p, wishlist_activity._make_entry("a", f"d{i}", "", "info", "cli")) for i in range(4)]
+        assert results == [True, True, False, False]
+        assert writer.dropped == 2
+        assert [e["label"] for e in writer.pending(p)] == ["d0", "d1"]
+        assert writer.flush() == 2
+        assert [e["label"] for e in list_activity(p)] == ["d1", "d0"]
+
+    def test_full_queue_drops_oldest_by_default(self, tmp_path):
+        assert wishlist_activity.ACTIVITY_QUEUE_POLICY == "drop-oldest"
+        writer = wishlist_activity._ActivityWriter()
+        writer._queue = queue.Queue(maxsize=2)
+        writer._ensure_thread = lambda: None
+        p = str(tmp_path / ACTIVITY_FILENAME)
+        results = [writer.submit(p, wishlist_activity._make_entry("a", f"d{i}", "", "info", "cli")) for i in range(4)]
+        assert results == [True] * 4
+        assert writer.dropped == 2
+        assert [e["label"] for e in writer.pending(p)] == ["d2", "d3"]
+        assert writer.flush() == 2
+        assert [e["label"] for e in list_activity(p)] == ["d3", "d2"]
+
+    def test_block_policy_never_blocks_event_loop(self, tmp_path, monkeypatch):
+        import asyncio
+        import time
+
+        writer = wishlist_activity._ActivityWriter()
+        writer._queue = queue.Queue(maxsize=1)
+        writer._ensure_thread = lambda: None
+        monkeypatch.setattr(wishlist_activity, "ACTIVITY_QUEUE_POLICY", "block")
+        monkeypatch.setattr(wishlist_activity, "ACTIVITY_BLOCK_SECONDS", 5)
+        p = str(tmp_path / ACTIVITY_FILENAME)
+
+        async def handler():
+            for i in range(3):
+                writer.submit(p, wishlist_activity._make_entry("a", f"d{i}", "", "info", "web"))
+
+        start = time.monotonic()
+        asyncio.run(handler())
+        assert time.monotonic() - start < 1
+        assert writer.dropped == 2
@@ -0,0 +1,114 @@
+"""
+Tests für die Hintergrund-Jobs der Wishlist-Web-UI (ohne Server).
+"""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import wishlist_jobs as wj  # noqa: E402
+from src.wishlist_jobs import JobManager, JobQueueFull  # noqa: E402
+
+
+def test_job_manager_bounds_pending_jobs():
+    gate = threading.Event()
+    jm = JobManager(workers=1, max_pending=2)
+    first = jm.submit("x", lambda job: gate.wait(5))
+    jm.submit("x", lambda job: None)
+    with pytest.raises(JobQueueFull):
+        jm.submit("x", lambda job: None)
+    gate.set()
+    assert first.wait(5) and first.status == "done"
+
+
+def test_job_cancelled_while_dequeued_does_not_run():
+    gate = threading.Event()
+    jm = JobManager(workers=1)
+    first = jm.submit("x", lambda job: gate.wait(5))
+    ran = []
+    second = jm.submit("x", lambda job: ran.append(job.id))
+    jm.cancel(second.id)
+    # Der Worker sieht den Abbruch erst nach seiner Prüfung (Wettlauf mit ``cancel``)
+    second.cancelled = lambda: False
+    gate.set()
+    assert first.wait(5)
+    jm._queue.join()
+    assert ran == []
+    assert second.status == "cancelled" and second.started_at is None
+
+
+def test_job_manager_failed_job_keeps_error():
+    def boom(job):
+        raise RuntimeError("kaputt")
+
+    job = JobManager(workers=1).submit("x", boom)
+    assert job.wait(5)
+    assert job.status == "failed" and job.error == "kaputt"
+
+
+def test_job_transfer_rate(monkeypatch):
+    clock = iter([0.0, 0.5, 2.0, 3.0, 10.0])
+    monkeypatch.setattr(wj.time, "monotonic", lambda: next(clock))
+    job = wj.Job(id="j", kind="download")
+    job.transfer(0, 4000)
+    job.transfer(500, 4000)
+    assert job.rate is None  # Messfenster noch nicht voll
+    job.transfer(2000, 4000)
+    assert job.rate == 1000.0
+    job.transfer(4000, 4000)
+    assert job.rate == 1500.0  # geglättet
+    job.transfer(100, 0)  # neue Datei: Messung beginnt neu
+    assert job.bytes_done == 100 and job.bytes_total is None and job.rate == 1500.0
+
+
+def test_job_events_coalesce_and_end_with_job():
+    async def run():
+        jm = JobManager(workers=1)
+        gate = threading.Event()
+
+        def work(job):
+            gate.wait(5)
+            for i in range(1, 201):
+                job.report(i / 200, f"{i}")
+            return "fertig"
+
+        job = jm.submit("x", work)
+        seen = []
+        async for data in jm.events(job.id, interval=0.05, heartbeat=0.05):
+            if data is None:
+                gate.set()
+                continue
+            seen.append(data)
+        return seen
+
+    seen = asyncio.run(run())
+    assert seen[0]["status"] in ("queued", "running")
+    assert seen[-1]["status"] == "done" and seen[-1]["result"] == "fertig"
+    assert len(seen) < 50
+
+
+def test_job_events_all_jobs_and_unsubscribe():
+    async def run():
+        jm = JobManager(workers=2)
+        stream = jm.events(heartbeat=0.05)
+        first = await stream.__anext__()  # noch keine Jobs: erstes Element ist ein Lebenszeichen
+        jm.submit("a", lambda job: 1)
+        jm.submit("b", lambda job: 2)
+        kinds = set()
+        async for data in stream:
+            if data and data["status"] == "done":
+                kinds.add(data["kind"])
+            if kinds == {"a", "b"}:
+                break
+        await stream.aclose()
+        return first, kinds, jm._subscribers
+
+    first, kinds, subscribers = asyncio.run(run())
+    assert first is None
+    assert kinds == {"a", "b"}
+    assert subscribers == []
@@ -0,0 +1,114 @@
+"""
+Tests für den Abgleich der Wishlist mit Mediathek-Neuzugängen (ohne Netzwerk).
+"""
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import wishlist_news as wn  # noqa: E402
+from src.wishlist_core import WishlistItem, add_item, list_items  # noqa: E402
+
+
+def _args(tmp_path):
+    a = type("A", (), {})()
+    a.download_dir = str(tmp_path / "dl")
+    a.no_state = True
+    a.serien_download = "erste"
+    return a
+
+
+def _response(results):
+    resp = MagicMock()
+    resp.json.return_value = {"result": {"results": results}}
+    resp.raise_for_status.return_value = None
+    return resp
+
+
+def test_title_index_matches_variants_and_series_topic():
+    items = [
+        WishlistItem(id="m", title="Das Lehrerzimmer", year=2023, kind="movie"),
+        WishlistItem(id="s", title="Babylon Berlin", year=None, kind="series"),
+        WishlistItem(id="x", title="Völlig anderer Film", year=None, kind="movie"),
+    ]
+    index = wn.WishlistTitleIndex(items)
+    assert set(index.match({"title": "Lehrerzimmer", "topic": "Filme"})) == {"m"}
+    assert set(index.match({"title": "Folge 3", "topic": "Babylon Berlin"})) == {"s"}
+    # Film-Einträge vergleichen nur den Titel, nicht die Rubrik
+    assert index.match({"title": "Tagesschau", "topic": "Das Lehrerzimmer"}) == {}
+    hits = index.match_all([{"title": "Das Lehrerzimmer (2023)"}, {"title": "Wetter"}])
+    assert set(hits) == {"m"}
+
+
+def test_fetch_new_broadcasts_pages_until_watermark():
+    page1 = [{"title": f"A{i}", "timestamp": 1000 - i} for i in range(3)]
+    page2 = [{"title": "B", "timestamp": 990}, {"title": "alt", "timestamp": 900}]
+    with patch.object(wn.requests, "post", side_effect=[_response(page1), _response(page2)]) as post:
+        results, newest, truncated = wn.fetch_new_broadcasts(950, page_size=3)
+    assert [r["title"] for r in results] == ["A0", "A1", "A2", "B"]
+    assert newest == 1000 and truncated is False
+    assert post.call_args_list[1].kwargs["json"]["offset"] == 3
+    assert post.call_args_list[0].kwargs["json"]["sortBy"] == "timestamp"
+
+
+def test_fetch_new_broadcasts_error_returns_none():
+    with patch.object(wn.requests, "post", side_effect=wn.requests.ConnectionError("down")):
+        assert wn.fetch_new_broadcasts(0) is None
+
+
+def test_truncated_news_fall_back_to_full_run(tmp_path):
+    p = str(tmp_path / "wl.json")
+    a = add_item(p, "Das Lehrerzimmer", None, "movie")
+    wn.save_news_state(p, 1000, [a.id])
+    page = [{"title": f"N{i}", "timestamp": 5000 - i} for i in range(2)]
+    with patch.object(wn.requests, "post", return_value=_response(page)):
+        fetched = wn.fetch_new_broadcasts(1000, page_size=2, max_pages=2)
+    assert fetched[1:] == (5000, True)
+    with patch.object(wn, "fetch_new_broadcasts", return_value=fetched), patch.object(
+        wn, "process_wishlist_items", return_value=(1, 0)
+    ) as proc:
+        wn.process_wishlist_news(p, _args(tmp_path))
+    # Vollständige Suche statt nur Kandidaten; Wasserzeichen = Laufbeginn, nicht der neueste Zeitstempel
+    assert proc.call_args.kwargs.get("item_ids") is None
+    assert wn.load_news_state(p)["since"] != 5000
+
+
+def test_process_news_first_run_full_then_only_candidates(tmp_path):
+    p = str(tmp_path / "wl.json")
+    a = add_item(p, "Das Lehrerzimmer", None, "movie")
+    b = add_item(p, "Anderer Film", None, "movie")
+    args = _args(tmp_path)
+
+    with patch.object(wn, "process_wishlist_items", return_value=(2, 0)) as proc:
+        assert wn.process_wishlist_news(p, args) == (2, 0)
+    assert proc.call_args.kwargs.get("item_ids") is None
+    state = wn.load_news_state(p)
+    assert state["since"] and set(state["searched"]) == {a.id, b.id}
+
+    c = add_item(p, "Neu hinzugefügt", None, "movie")
+    new = [{"title": "Das Lehrerzimmer", "timestamp": state["since"] + 60}]
+    with patch.object(wn.requests, "post", return_value=_response(new)), patch.object(
+        wn, "process_wishlist_items", return_value=(2, 1)
+    ) as proc:
+        assert wn.process_wishlist_news(p, args) == (2, 1)
+    # Treffer aus den Neuzugängen plus der noch nie gesuchte Eintrag — nicht „Anderer Film“
+    assert proc.call_args.kwargs["item_ids"] == [a.id, c.id]
+    state2 = wn.load_news_state(p)
+    assert state2["since"] == state["since"] + 60
+    assert set(state2["searched"]) == {i.id for i in list_items(p)}
+
+
+def test_process_news_api_error_keeps_watermark(tmp_path):
+    p = str(tmp_path / "wl.json")
+    old = add_item(p, "Alt", None, "movie")
+    new = add_item(p, "Neu", None, "movie")
+    wn.save_news_state(p, 500, [old.id])
+    with patch.object(wn, "fetch_new_broadcasts", return_value=None), patch.object(
+        wn, "process_wishlist_items", return_value=(1, 0)
+    ) as proc:
+        assert wn.process_wishlist_news(p, _args(tmp_path)) == (1, 0)
+    # Ohne Neuzugänge nur der noch nie gesuchte Eintrag; Wasserzeichen unverändert
+    assert proc.call_args.kwargs["item_ids"] == [new.id]
+    assert wn.load_news_state(p) == {"since": 500, "searched": sorted([old.id, new.id])}
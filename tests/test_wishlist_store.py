@@ -0,0 +1,125 @@
+"""
+Tests für die Wishlist-Repositories (JSON / SQLite).
+"""
+import json
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import wishlist_core as wc  # noqa: E402
+from src import wishlist_store  # noqa: E402
+from src.wishlist_core import add_item, list_items, load_wishlist, process_wishlist_items, remove_item  # noqa: E402
+
+
+@pytest.mark.parametrize("name", ["wl.json", "wl.sqlite3"])
+def test_crud_through_core_api(tmp_path, name):
+    p = str(tmp_path / name)
+    a = add_item(p, "Film A", 2020, "movie")
+    b = add_item(p, "Serie B", None, "series", note="Notiz")
+    assert [i.title for i in list_items(p)] == ["Film A", "Serie B"]
+    assert [i.id for i in list_items(p, kind="series")] == [b.id]
+    assert wc.get_item(p, b.id).note == "Notiz"
+    repo = wishlist_store.get_wishlist_repository(p)
+    assert repo.update({**a.to_dict(), "title": "Film A2"})
+    assert not repo.update({**a.to_dict(), "id": "fehlt"})
+    assert wc.get_item(p, a.id).title == "Film A2"
+    assert remove_item(p, a.id)
+    assert not remove_item(p, a.id)
+    assert [x["id"] for x in load_wishlist(p)["items"]] == [b.id]
+
+
+@pytest.mark.parametrize("name", ["wl.json", "wl.sqlite3"])
+def test_signature_changes_on_write_only(tmp_path, name):
+    p = str(tmp_path / name)
+    add_item(p, "Film A", None, "movie")
+    sig = wc.wishlist_signature(p)
+    list_items(p)
+    assert wc.wishlist_signature(p) == sig
+    b = add_item(p, "Film B", None, "movie")
+    sig2 = wc.wishlist_signature(p)
+    assert sig2 != sig
+    remove_item(p, b.id)
+    assert wc.wishlist_signature(p) != sig2
+
+
+def test_sqlite_migrates_json_and_exports(tmp_path):
+    legacy = tmp_path / "wl.json"
+    it = add_item(str(legacy), "Alt", 1999, "movie")
+    db = str(tmp_path / "wl.sqlite3")
+    assert [i.id for i in list_items(db)] == [it.id]
+    out = tmp_path / "export.json"
+    assert wishlist_store.get_wishlist_repository(db).export_json(str(out)) == 1
+    assert json.loads(out.read_text(encoding="utf-8"))["items"][0]["title"] == "Alt"
+    # Import übernimmt nur neue IDs
+    assert wishlist_store.get_wishlist_repository(db).import_json(str(out)) == 0
+
+
+def test_repository_interface_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        wishlist_store.WishlistRepository(str(tmp_path / "wl.json"))
+
+
+def test_path_for_backend():
+    assert wishlist_store.wishlist_path_for_backend("/d/.perlentaucher_wishlist.json", "sqlite") == (
+        "/d/.perlentaucher_wishlist.sqlite3"
+    )
+    assert wishlist_store.wishlist_path_for_backend("/d/w.db", None) == "/d/w.db"
+    with pytest.raises(ValueError):
+        wishlist_store.wishlist_path_for_backend("/d/w.json", "xml")
+
+
+def test_default_path_follows_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("WISHLIST_BACKEND", "sqlite")
+    assert wc.default_wishlist_path(str(tmp_path)).endswith(".perlentaucher_wishlist.sqlite3")
+    monkeypatch.delenv("WISHLIST_BACKEND")
+    assert wc.default_wishlist_path(str(tmp_path)).endswith(".perlentaucher_wishlist.json")
+
+
+@pytest.mark.parametrize("name", ["wl.json", "wl.sqlite3"])
+def test_concurrent_adds_do_not_clobber(tmp_path, name):
+    p = str(tmp_path / name)
+
+    def writer(n):
+        for i in range(10):
+            add_item(p, f"T{n}-{i}", None, "movie")
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(list_items(p)) == 40
+
+
+@pytest.mark.parametrize("name", ["wl.json", "wl.sqlite3"])
+def test_process_removes_items_one_by_one_and_keeps_new(tmp_path, name):
+    p = str(tmp_path / name)
+    first = add_item(p, "Eins", None, "movie")
+    add_item(p, "Zwei", None, "movie")
+    args = type("A", (), {})()
+    args.download_dir = str(tmp_path / "dl")
+    args.no_state = True
+    args.serien_download = "erste"
+    seen = []
+
+    def fake_movie(result, title, *a, **k):
+        # Nach dem ersten Eintrag ist dieser schon entfernt; ein paralleles Hinzufügen bleibt erhalten
+        seen.append([i.title for i in list_items(p)])
+        if title == "Eins":
+            add_item(p, "Neu", None, "movie")
+        return (title == "Eins", "success" if title == "Eins" else "not_found")
+
+    with patch.object(wc, "_metadata_for_item", return_value={}), patch.object(
+        wc, "_search_item", return_value={"title": "x"}
+    ), patch.object(wc, "_process_movie_with_result", side_effect=fake_movie):
+        processed, successes = process_wishlist_items(p, args)
+    assert (processed, successes) == (2, 1)
+    assert seen[1] == ["Zwei", "Neu"]
+    assert [i.title for i in list_items(p)] == ["Zwei", "Neu"]
+    assert wc.get_item(p, first.id) is None
@@ -1,8 +1,12 @@
 """
 Tests für Wishlist-Web-UI (FastAPI), ohne laufenden Server.
 """
+import json
 import sys
+import threading
+import time
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -116,7 +120,7 @@ def test_api_post_item_probe_mocked(tmp_path, monkeypatch):
     app = create_app(wl, _factory(tmp_path), token=None)
     client = TestClient(app)
     r = client.post(
-        "/api/items",
+        "/api/items?wait=1",
         json={"title": "  Neu  ", "year": 2021, "kind": "movie", "note": ""},
     )
     assert r.status_code == 200
@@ -138,7 +142,7 @@ def test_api_post_item_probe_raises_item_still_saved(tmp_path, monkeypatch):
     monkeypatch.setattr(ww, "probe_wishlist_item", _boom)
     app = create_app(wl, _factory(tmp_path), token=None)
     client = TestClient(app)
-    r = client.post("/api/items", json={"title": "X", "year": None, "kind": "movie", "note": ""})
+    r = client.post("/api/items?wait=1", json={"title": "X", "year": None, "kind": "movie", "note": ""})
     assert r.status_code == 200
     body = r.json()
     assert body["probe"]["status"] == "probe_error"
@@ -154,17 +158,25 @@ def test_api_check_and_process_mocked(tmp_path, monkeypatch):
 
     wl = str(tmp_path / "wl.json")
     add_item(wl, "X", None, "movie")
-    monkeypatch.setattr(ww, "check_wishlist_availability", lambda *a, **k: ([], 1))
+    check_kwargs = {}
+
+    def fake_check(*a, **k):
+        check_kwargs.update(k)
+        return [], 1
+
+    monkeypatch.setattr(ww, "check_wishlist_availability", fake_check)
     monkeypatch.setattr(ww, "process_wishlist_items", lambda *a, **k: (1, 0))
 
     app = create_app(wl, _factory(tmp_path), token=None)
     client = TestClient(app)
-    chk = client.post("/api/check")
+    chk = client.post("/api/check?wait=1")
     assert chk.status_code == 200
+    # Manuelles „Prüfen“ sucht auch zurückgestellte Einträge
+    assert check_kwargs["force_all"] is True
     assert chk.json()["total"] == 1
     assert chk.json()["available_count"] == 0
 
-    proc = client.post("/api/process")
+    proc = client.post("/api/process?wait=1")
     assert proc.status_code == 200
     assert proc.json() == {"processed": 1, "successes": 0}
 
@@ -182,13 +194,137 @@ def test_api_download_one_mocked(tmp_path, monkeypatch):
     app = create_app(wl, _factory(tmp_path), token=None)
     client = TestClient(app)
     r = client.post(
-        f"/api/items/{it.id}/download",
+        f"/api/items/{it.id}/download?wait=1",
         json={"candidate_index": 0},
     )
     assert r.status_code == 200
     assert r.json() == {"ok": True, "code": "success"}
 
 
+def _wait_job(client, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed", "cancelled") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+def test_api_process_returns_job_and_reports_progress(tmp_path, monkeypatch):
+    from src import wishlist_web as ww
+
+    wl = str(tmp_path / "wl.json")
+    add_item(wl, "X", None, "movie")
+    seen = {}
+
+    def fake_process(path, args, **k):
+        seen["cancel"] = args.cancel_check()
+        args.wishlist_progress(1, 2, "X")
+        return 2, 1
+
+    monkeypatch.setattr(ww, "process_wishlist_items", fake_process)
+    client = TestClient(create_app(wl, _factory(tmp_path), token=None))
+    r = client.post("/api/process")
+    assert r.status_code == 202
+    job = _wait_job(client, r.json()["job_id"])
+    assert job["status"] == "done"
+    assert job["kind"] == "process"
+    assert job["result"] == {"processed": 2, "successes": 1}
+    assert job["progress"] == 1.0
+    assert job["message"] == "1/2: X"
+    assert seen["cancel"] is False
+    assert client.get("/api/jobs").json()["jobs"][0]["id"] == job["id"]
+    assert client.get("/api/jobs/nope").status_code == 404
+
+
+def test_api_post_item_returns_item_and_probe_job(tmp_path, monkeypatch):
+    from src import wishlist_web as ww
+
+    wl = str(tmp_path / "wl.json")
+    save_wishlist(wl, {"version": 1, "items": []})
+    monkeypatch.setattr(ww, "probe_wishlist_item", lambda *a, **k: {"status": "not_found"})
+    client = TestClient(create_app(wl, _factory(tmp_path), token=None))
+    r = client.post("/api/items", json={"title": "Job", "year": None, "kind": "movie", "note": ""})
+    assert r.status_code == 202
+    body = r.json()
+    assert body["item"]["title"] == "Job"
+    assert _wait_job(client, body["job_id"])["result"] == {"status": "not_found"}
+
+
+def test_api_post_item_queue_full_does_not_save(tmp_path, monkeypatch):
+    from src import wishlist_web as ww
+
+    def full(self, kind, fn, label=""):
+        raise ww.JobQueueFull("Zu viele laufende Jobs (max. 1)")
+
+    wl = str(tmp_path / "wl.json")
+    save_wishlist(wl, {"version": 1, "items": []})
+    monkeypatch.setattr(ww.JobManager, "submit", full)
+    client = TestClient(create_app(wl, _factory(tmp_path), token=None))
+    r = client.post("/api/items", json={"title": "Voll", "year": None, "kind": "movie", "note": ""})
+    assert r.status_code == 429
+    # Erneuter Versuch darf kein Duplikat erzeugen
+    assert client.get("/api/items").json()["items"] == []
+
+
+def test_api_job_cancel_running_and_queued(tmp_path, monkeypatch):
+    from src import wishlist_web as ww
+
+    monkeypatch.setenv("WISHLIST_JOB_WORKERS", "1")
+    wl = str(tmp_path / "wl.json")
+    add_item(wl, "X", None, "movie")
+    started = threading.Event()
+
+    def slow_process(path, args, **k):
+        started.set()
+        while not args.cancel_check():
+            time.sleep(0.01)
+        return 0, 0
+
+    monkeypatch.setattr(ww, "process_wishlist_items", slow_process)
+    client = TestClient(create_app(wl, _factory(tmp_path), token=None))
+    running = client.post("/api/process").json()["job_id"]
+    assert started.wait(5)
+    queued = client.post("/api/process").json()["job_id"]
+    assert client.get(f"/api/jobs/{queued}").json()["status"] == "queued"
+
+    assert client.delete(f"/api/jobs/{queued}").json()["status"] == "cancelled"
+    assert client.delete(f"/api/jobs/{running}").json()["cancel_requested"] is True
+    assert _wait_job(client, running)["status"] == "cancelled"
+
+
+def test_api_job_events_stream_progress(tmp_path, monkeypatch):
+    from src import wishlist_web as ww
+
+    wl = str(tmp_path / "wl.json")
+    add_item(wl, "X", None, "movie")
+    gate = threading.Event()
+
+    def fake_process(path, args, **k):
+        gate.wait(5)
+        for i in range(1, 51):
+            args.bytes_callback(i * 1024, 50 * 1024)
+            args.wishlist_progress(i, 50, f"T{i}")
+        return 50, 50
+
+    monkeypatch.setattr(ww, "process_wishlist_items", fake_process)
+    client = TestClient(create_app(wl, _factory(tmp_path), token=None))
+    job_id = client.post("/api/process").json()["job_id"]
+    threading.Timer(0.2, gate.set).start()
+    events = []
+    with client.stream("GET", f"/api/jobs/{job_id}/events") as r:
+        assert r.headers["content-type"].startswith("text/event-stream")
+        for line in r.iter_lines():
+            if line.startswith("data: "):
+                events.append(json.loads(line[len("data: "):]))
+    assert events[-1]["status"] == "done"
+    assert events[-1]["bytes_done"] == 50 * 1024
+    assert events[-1]["result"] == {"processed": 50, "successes": 50}
+    # 50 Meldungen in schneller Folge werden zusammengefasst
+    assert len(events) < 50
+    assert client.get("/api/jobs/nope/events").status_code == 404
+
+
 def test_index_returns_html(tmp_path):
     wl = str(tmp_path / "wl.json")
     app = create_app(wl, _factory(tmp_path), token=None)
@@ -231,7 +367,7 @@ def test_api_history_empty(tmp_path):
     client = TestClient(app)
     r = client.get("/api/history")
     assert r.status_code == 200
-    assert r.json() == {"entries": [], "total": 0, "limit": 20, "offset": 0}
+    assert r.json() == {"entries": [], "total": 0, "limit": 20, "offset": 0, "next_cursor": None}
 
 
 def test_api_history_clear(tmp_path):
@@ -250,6 +386,74 @@ def test_api_history_clear(tmp_path):
     assert j["total"] == 0
 
 
+def test_api_items_etag_304_and_invalidation(tmp_path):
+    wl = str(tmp_path / "wl.json")
+    add_item(wl, "Erster", None, "movie")
+    client = TestClient(create_app(wl, _factory(tmp_path), token=None))
+    r = client.get("/api/items")
+    etag, last_modified = r.headers["etag"], r.headers["last-modified"]
+    assert r.json()["items"][0]["title"] == "Erster"
+    assert r.headers["cache-control"] == "no-cache"
+
+    assert client.get("/api/items", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/items", headers={"If-Modified-Since": last_modified}).status_code == 304
+    # Lesen aus dem Cache, solange sich die Datei nicht ändert
+    with patch("src.wishlist_web.list_items", side_effect=AssertionError("nicht neu lesen")):
+        assert client.get("/api/items").headers["etag"] == etag
+
+    add_item(wl, "Zweiter", None, "movie")
+    r2 = client.get("/api/items", headers={"If-None-Match": etag})
+    assert r2.status_code == 200
+    assert [i["title"] for i in r2.json()["items"]] == ["Erster", "Zweiter"]
+    assert r2.headers["etag"] != etag
+
+
+def test_api_items_gzip_for_large_payload(tmp_path):
+    wl = str(tmp_path / "wl.json")
+    client = TestClient(create_app(wl, _factory(tmp_path), token=None))
+    small = client.get("/api/items", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    for i in range(40):
+        add_item(wl, f"Titel Nummer {i}", 2000 + i, "movie")
+    big = client.get("/api/items", headers={"Accept-Encoding": "gzip"})
+    assert big.headers["content-encoding"] == "gzip"
+    assert len(big.json()["items"]) == 40
+    plain = client.get("/api/items", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == big.headers["etag"]
+
+
+def test_api_history_conditional_get(tmp_path):
+    from src.wishlist_activity import submit_activity
+
+    wl = str(tmp_path / "wl.json")
+    hist = str(tmp_path / "act.jsonl")
+    client = TestClient(create_app(wl, _factory(tmp_path), token=None, activity_path=hist))
+    submit_activity(hist, "pruefen", "eins", "", "info", "web")
+    r = client.get("/api/history")
+    assert len(r.json()["entries"]) == 1
+    etag = r.headers["etag"]
+    assert client.get("/api/history", headers={"If-None-Match": etag}).status_code == 304
+    # Andere Abfrage, eigener Eintrag
+    assert client.get("/api/history", params={"limit": 5}).json()["limit"] == 5
+    submit_activity(hist, "pruefen", "zwei", "", "info", "web")
+    r2 = client.get("/api/history", headers={"If-None-Match": etag})
+    assert r2.status_code == 200
+    assert [e["label"] for e in r2.json()["entries"]] == ["zwei", "eins"]
+
+
+def test_metrics_endpoint(tmp_path):
+    wl = str(tmp_path / "wl.json")
+    client = TestClient(create_app(wl, _factory(tmp_path), token="geheim"))
+    assert client.get("/metrics").status_code == 401
+    client.get("/api/items?token=geheim")
+    r = client.get("/metrics", headers={"Authorization": "Bearer geheim"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE perlentaucher_http_request_duration_seconds histogram" in r.text
+    assert 'perlentaucher_cache_requests_total{cache="web_read",result="miss"}' in r.text
+
+
 def test_api_history_filter_and_page(tmp_path):
     from src.wishlist_activity import append_activity
 
@@ -277,6 +481,34 @@ def test_api_history_filter_and_page(tmp_path):
     assert r4.json()["entries"][0]["label"] == "Beta"
 
 
+def test_api_history_cursor_pagination(tmp_path):
+    from src.wishlist_activity import append_activity
+
+    wl = str(tmp_path / "wl.json")
+    save_wishlist(wl, {"version": 1, "items": []})
+    hist = str(tmp_path / "act.jsonl")
+    for i in range(5):
+        append_activity(hist, "a", f"E{i}", "", "info", "cli" if i % 2 else "web")
+    app = create_app(wl, _factory(tmp_path), token=None, activity_path=hist)
+    client = TestClient(app)
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        j = client.get("/api/history", params=params).json()
+        assert j["total"] == 5
+        seen += [e["label"] for e in j["entries"]]
+        cursor = j["next_cursor"]
+        if not cursor:
+            break
+    assert seen == ["E4", "E3", "E2", "E1", "E0"]
+    j = client.get("/api/history", params={"source": "cli"}).json()
+    assert [e["label"] for e in j["entries"]] == ["E3", "E1"]
+    assert client.get("/api/history", params={"cursor": "kaputt"}).status_code == 400
+
+
 def test_post_item_writes_activity_log(tmp_path, monkeypatch):
     from src import wishlist_web as ww
 
@@ -286,7 +518,7 @@ def test_post_item_writes_activity_log(tmp_path, monkeypatch):
     monkeypatch.setattr(ww, "probe_wishlist_item", lambda *a, **k: {"status": "not_found"})
     app = create_app(wl, _factory(tmp_path), token=None, activity_path=hist)
     client = TestClient(app)
-    r = client.post("/api/items", json={"title": "LogTest", "year": None, "kind": "movie", "note": ""})
+    r = client.post("/api/items?wait=1", json={"title": "LogTest", "year": None, "kind": "movie", "note": ""})
     assert r.status_code == 200
     entries = client.get("/api/history").json()["entries"]
     assert len(entries) == 1